@@ -14,6 +14,17 @@ class MerakiConfig(PluginConfig):
     default_settings = {
         'meraki_api_key': '',
         'meraki_base_url': 'https://api.meraki.com/api/v1',
+        # Burst capacity of the per-organization rate limiter (defaults to one second of requests)
+        'api_burst_size': None,
+        # HTTP transport: keep-alive connections per host (grown to the worker count) and timeouts in seconds
+        'api_pool_size': 10,
+        'api_connect_timeout': 10,
+        'api_read_timeout': 60,
+        # Prefetch per-network VLANs/SSIDs concurrently with the asyncio client (requires aiohttp)
+        'async_prefetch': False,
+        'async_max_concurrency': 20,
+        # Objects applied per commit in a network's auto sync transaction (0 = commit once per network)
+        'transaction_batch_size': 500,
         'sync_interval': 3600,
         'auto_create_sites': True,
         'auto_create_device_types': True,
@@ -35,6 +46,8 @@ class MerakiConfig(PluginConfig):
         super().ready()
         # Import jobs to register JobRunner classes
         from . import jobs
+        # Connect the settings/rules snapshot invalidation handlers
+        from . import signals
 
 
 config = MerakiConfig
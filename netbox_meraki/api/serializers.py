@@ -21,4 +21,7 @@ class SyncLogSerializer(serializers.ModelSerializer):
             'prefixes_synced',
             'errors',
             'duration_seconds',
+            'api_cache_hits',
+            'api_cache_misses',
+            'skipped_unchanged',
         ]
@@ -33,12 +33,19 @@ class SyncLogViewSet(viewsets.ReadOnlyModelViewSet):
     def progress(self, request, pk=None):
         try:
             sync_log = self.get_object()
+            # Pass ?after=<id> to only fetch entries newer than the last one seen
+            try:
+                after = int(request.query_params.get('after') or 0)
+            except ValueError:
+                after = 0
+            progress_logs = sync_log.get_progress_logs(after=after)
             return Response({
                 'id': sync_log.id,
                 'status': sync_log.status,
                 'current_operation': sync_log.current_operation,
                 'progress_percent': sync_log.progress_percent,
-                'progress_logs': sync_log.progress_logs,
+                'progress_logs': progress_logs,
+                'cursor': progress_logs[-1].get('id', after) if progress_logs else after,
                 'cancel_requested': sync_log.cancel_requested,
                 'organizations_synced': sync_log.organizations_synced,
                 'networks_synced': sync_log.networks_synced,
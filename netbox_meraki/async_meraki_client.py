@@ -0,0 +1,444 @@
+"""
+Asyncio client for the Cisco Meraki Dashboard API
+
+Mirrors the method surface of MerakiAPIClient with coroutines, so many
+per-network requests can be in flight from a single thread. Requests share the
+per-organization rate limit buckets of the synchronous client and raise the
+same requests.exceptions.HTTPError on failure.
+
+Requires the optional aiohttp dependency (pip install netbox-meraki[async]).
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+import requests
+from django.conf import settings
+
+from .meraki_client import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    MerakiAPIClient,
+    TokenBucket,
+    firmware_versions_by_serial,
+    get_rate_bucket,
+    json_loads,
+    uplink_ips_by_serial,
+)
+
+
+logger = logging.getLogger('netbox_meraki')
+
+DEFAULT_MAX_CONCURRENCY = 20
+
+
+def aiohttp_available() -> bool:
+    """Whether the optional aiohttp dependency is installed"""
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class AsyncMerakiAPIClient:
+    """Asyncio client for Cisco Meraki Dashboard API
+    
+    Use as an async context manager so the connection pool is closed:
+    
+        async with AsyncMerakiAPIClient(api_key) as client:
+            vlans = await asyncio.gather(*(client.get_appliance_vlans(n) for n in ids))
+    """
+    
+    MAX_RETRIES = MerakiAPIClient.MAX_RETRIES
+    MAX_RATE_LIMIT_RETRIES = MerakiAPIClient.MAX_RATE_LIMIT_RETRIES
+    RETRY_DELAY = MerakiAPIClient.RETRY_DELAY
+    BACKOFF_CAP = MerakiAPIClient.BACKOFF_CAP
+    
+    # Endpoint parsing and backoff are shared with the synchronous client
+    _load_plugin_settings = staticmethod(MerakiAPIClient._load_plugin_settings)
+    _organization_for_endpoint = MerakiAPIClient._organization_for_endpoint
+    _remember_devices = MerakiAPIClient._remember_devices
+    _build_url = MerakiAPIClient._build_url
+    _backoff_delay = MerakiAPIClient._backoff_delay
+    _retry_after = MerakiAPIClient._retry_after
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 requests_per_second: Optional[float] = None, enable_throttling: Optional[bool] = None,
+                 max_concurrency: Optional[int] = None):
+        """
+        Initialize async Meraki API client
+        
+        Args:
+            api_key: Meraki Dashboard API key
+            base_url: Meraki API base URL
+            requests_per_second: Per-organization request rate (defaults to PluginSettings)
+            enable_throttling: Whether to rate limit requests (defaults to PluginSettings)
+            max_concurrency: Maximum number of requests in flight at once
+        """
+        plugin_config = settings.PLUGINS_CONFIG.get('netbox_meraki', {})
+        
+        self.api_key = api_key or plugin_config.get('meraki_api_key', '')
+        self.base_url = base_url or plugin_config.get('meraki_base_url', 'https://api.meraki.com/api/v1')
+        
+        if not self.api_key:
+            raise ValueError("Meraki API key is required")
+        
+        # Rate limiting settings
+        if requests_per_second is None or enable_throttling is None:
+            plugin_settings = self._load_plugin_settings()
+            if requests_per_second is None:
+                requests_per_second = getattr(plugin_settings, 'api_requests_per_second', 5)
+            if enable_throttling is None:
+                enable_throttling = getattr(plugin_settings, 'enable_api_throttling', True)
+        
+        self.enable_throttling = enable_throttling
+        self.requests_per_second = max(float(requests_per_second or 5), 0.1)
+        self.burst_size = plugin_config.get('api_burst_size') or self.requests_per_second
+        self.max_concurrency = max(int(
+            max_concurrency or plugin_config.get('async_max_concurrency') or DEFAULT_MAX_CONCURRENCY
+        ), 1)
+        self.timeout = (
+            float(plugin_config.get('api_connect_timeout') or DEFAULT_CONNECT_TIMEOUT),
+            float(plugin_config.get('api_read_timeout') or DEFAULT_READ_TIMEOUT),
+        )
+        
+        # Organization lookups used to pick the rate limit bucket for a request
+        self._network_orgs = {}
+        self._device_orgs = {}
+        
+        # Created on first use, inside the running event loop
+        self._session = None
+        self._semaphore = None
+    
+    async def __aenter__(self) -> 'AsyncMerakiAPIClient':
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def close(self):
+        """Close the underlying connection pool"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def _get_session(self):
+        """Create the aiohttp session and concurrency limit on first use"""
+        if self._session is None:
+            try:
+                import aiohttp
+            except ImportError as e:
+                raise ImportError(
+                    "The async Meraki client requires aiohttp (pip install netbox-meraki[async])"
+                ) from e
+            
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                headers={
+                    'X-Cisco-Meraki-API-Key': self.api_key,
+                    'Content-Type': 'application/json',
+                },
+                # Keep one pooled keep-alive connection per concurrent request
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1]),
+            )
+        return self._session
+    
+    def remember_networks(self, networks: Iterable[Dict], org_id: Optional[str] = None):
+        """Record network organizations so requests hit the right rate limit bucket"""
+        for network in networks:
+            if network.get('id'):
+                self._network_orgs[network['id']] = network.get('organizationId') or org_id
+    
+    async def _rate_limit(self, endpoint: str = '') -> Optional[TokenBucket]:
+        """Wait for a token from the organization's shared rate limit bucket"""
+        if not self.enable_throttling:
+            return None
+        
+        bucket = get_rate_bucket(
+            self._organization_for_endpoint(endpoint),
+            self.requests_per_second,
+            self.burst_size,
+        )
+        delay = bucket.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return bucket
+    
+    @staticmethod
+    def _http_error(url: str, status: int, reason: str, headers, body: bytes) -> requests.exceptions.HTTPError:
+        """Build the same HTTPError the synchronous client raises"""
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.url = url
+        response.headers.update(headers)
+        response._content = body
+        return requests.exceptions.HTTPError(f"{status} Error: {reason} for url: {url}", response=response)
+    
+    async def _send(self, method: str, endpoint: str, **kwargs):
+        """
+        Send a request to Meraki Dashboard with rate limiting and retries
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint or absolute URL
+            **kwargs: Additional request arguments
+        
+        Returns:
+            Tuple of (decoded JSON body, URL of the next page or None)
+        """
+        import aiohttp
+        
+        session = self._get_session()
+        url = self._build_url(endpoint)
+        
+        error_attempts = 0
+        rate_limit_attempts = 0
+        
+        while True:
+            bucket = await self._rate_limit(endpoint)
+            
+            try:
+                async with self._semaphore:
+                    async with session.request(method, url, **kwargs) as response:
+                        status = response.status
+                        body = await response.read()
+                        headers = response.headers
+                        next_link = response.links.get('next')
+                        reason = response.reason or ''
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error_attempts += 1
+                if error_attempts >= self.MAX_RETRIES:
+                    logger.error(f"Meraki API request failed after {self.MAX_RETRIES} attempts: {e}")
+                    raise
+                delay = self._backoff_delay(error_attempts)
+                logger.warning(
+                    f"Meraki API request failed (attempt {error_attempts}/{self.MAX_RETRIES}): {e}. "
+                    f"Retrying in {delay:.1f} seconds..."
+                )
+                await asyncio.sleep(delay)
+                continue
+            
+            if status == 429:
+                rate_limit_attempts += 1
+                new_rate = bucket.on_rate_limited() if bucket else None
+                if rate_limit_attempts > self.MAX_RATE_LIMIT_RETRIES:
+                    logger.error(f"Meraki API request to {url} rate limited {rate_limit_attempts} times, giving up")
+                    raise self._http_error(url, status, reason, headers, body)
+                delay = self._retry_after(response) + self._backoff_delay(rate_limit_attempts)
+                logger.warning(
+                    f"Rate limited by Meraki API. Waiting {delay:.1f} seconds..."
+                    + (f" (rate reduced to {new_rate:.2f} req/s)" if new_rate is not None else "")
+                )
+                await asyncio.sleep(delay)
+                continue
+            
+            if status >= 500:
+                error_attempts += 1
+                if error_attempts < self.MAX_RETRIES:
+                    delay = self._backoff_delay(error_attempts)
+                    logger.warning(
+                        f"Meraki API returned {status} (attempt {error_attempts}/{self.MAX_RETRIES}). "
+                        f"Retrying in {delay:.1f} seconds..."
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                logger.error(f"Meraki API request failed after {self.MAX_RETRIES} attempts: HTTP {status}")
+            elif bucket is not None:
+                bucket.on_success()
+            
+            if status >= 400:
+                raise self._http_error(url, status, reason, headers, body)
+            
+            data = json_loads(body) if body else {}
+            return data, str(next_link['url']) if next_link else None
+    
+    async def _request(self, method: str, endpoint: str, **kwargs):
+        """Make API request to Meraki Dashboard and return the response JSON"""
+        data, _ = await self._send(method, endpoint, **kwargs)
+        return data
+    
+    async def _paginate(self, endpoint: str, per_page: int, params: Optional[Dict] = None) -> AsyncIterator[Dict]:
+        """Yield every item of a paginated list endpoint, following Link: rel=next"""
+        request_params = dict(params or {})
+        request_params['perPage'] = per_page
+        
+        data, next_url = await self._send('GET', endpoint, params=request_params)
+        while True:
+            items = data.get('items', []) if isinstance(data, dict) else (data or [])
+            for item in items:
+                yield item
+            if not next_url:
+                return
+            # The next link already carries perPage and the page cursor
+            data, next_url = await self._send('GET', next_url)
+    
+    async def _collect(self, items: AsyncIterator[Dict]) -> List[Dict]:
+        return [item async for item in items]
+    
+    async def _get_or_empty(self, endpoint: str, empty, statuses=(404,)):
+        """GET an endpoint, returning `empty` for the given HTTP error statuses"""
+        try:
+            return await self._request('GET', endpoint)
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in statuses:
+                return empty
+            raise
+    
+    async def get_organizations(self) -> List[Dict]:
+        """Get all organizations"""
+        return await self._request('GET', 'organizations')
+    
+    async def get_organization(self, org_id: str) -> Dict:
+        """Get organization details"""
+        return await self._request('GET', f'organizations/{org_id}')
+    
+    async def get_networks(self, org_id: str) -> List[Dict]:
+        """Get all networks in an organization"""
+        networks = await self._collect(self._paginate(f'organizations/{org_id}/networks', per_page=100000))
+        self.remember_networks(networks, org_id)
+        return networks
+    
+    async def get_network(self, network_id: str) -> Dict:
+        """Get network details"""
+        return await self._request('GET', f'networks/{network_id}')
+    
+    async def get_devices(self, network_id: str) -> List[Dict]:
+        """Get all devices in a network"""
+        return self._remember_devices(await self._request('GET', f'networks/{network_id}/devices'))
+    
+    async def get_organization_devices(self, org_id: str) -> List[Dict]:
+        """Get every device in an organization (across all networks)"""
+        devices = await self._collect(self._paginate(f'organizations/{org_id}/devices', per_page=1000))
+        return self._remember_devices(devices, org_id)
+    
+    async def get_device(self, serial: str) -> Dict:
+        """Get device details"""
+        return await self._request('GET', f'devices/{serial}')
+    
+    async def get_device_statuses(self, org_id: str) -> List[Dict]:
+        """Get device statuses for an organization"""
+        return await self._collect(self._paginate(f'organizations/{org_id}/devices/statuses', per_page=1000))
+    
+    async def get_appliance_vlans(self, network_id: str) -> List[Dict]:
+        """Get VLANs configured on MX appliance"""
+        # VLANs not enabled on this network
+        return await self._get_or_empty(f'networks/{network_id}/appliance/vlans', [])
+    
+    async def get_appliance_ports(self, network_id: str) -> List[Dict]:
+        """Get appliance port configuration"""
+        return await self._get_or_empty(f'networks/{network_id}/appliance/ports', [])
+    
+    async def get_switch_ports(self, serial: str) -> List[Dict]:
+        """Get switch port configuration"""
+        return await self._get_or_empty(f'devices/{serial}/switch/ports', [])
+    
+    async def get_organization_switch_ports_by_switch(self, org_id: str) -> List[Dict]:
+        """Get switch port configuration for every switch in an organization"""
+        try:
+            return await self._collect(self._paginate(f'organizations/{org_id}/switch/ports/bySwitch', per_page=50))
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in [400, 404]:
+                # Organization has no switches
+                return []
+            raise
+    
+    async def get_appliance_subnets(self, network_id: str) -> List[Dict]:
+        """Get subnets/prefixes from appliance VLANs"""
+        vlans = await self.get_appliance_vlans(network_id)
+        return [
+            {
+                'vlan_id': vlan.get('id'),
+                'vlan_name': vlan.get('name'),
+                'subnet': vlan.get('subnet'),
+                'appliance_ip': vlan.get('applianceIp'),
+            }
+            for vlan in vlans
+            if vlan.get('subnet')
+        ]
+    
+    async def get_organization_inventory(self, org_id: str) -> List[Dict]:
+        """Get organization inventory devices"""
+        return await self._collect(self._paginate(f'organizations/{org_id}/inventoryDevices', per_page=1000))
+    
+    async def get_wireless_ssids(self, network_id: str) -> List[Dict]:
+        """Get wireless SSIDs for a network"""
+        # Network doesn't have wireless or isn't configured
+        return await self._get_or_empty(f'networks/{network_id}/wireless/ssids', [], (400, 404))
+    
+    async def get_organization_appliance_uplink_ips(self, org_id: str) -> Dict[str, Dict[str, str]]:
+        """Get the WAN IP of each appliance uplink by serial, e.g. {"Q234-...": {"wan1": "1.2.3.4"}}"""
+        try:
+            return uplink_ips_by_serial(await self._collect(
+                self._paginate(f'organizations/{org_id}/appliance/uplink/statuses', per_page=1000)
+            ))
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in [400, 404]:
+                # Organization has no appliances
+                return {}
+            raise
+    
+    async def get_organization_firmware_versions(self, org_id: str) -> Dict[str, str]:
+        """Get the running firmware version (shortName, e.g. "MX 18.107.4") of each device by serial"""
+        try:
+            return firmware_versions_by_serial(await self._collect(
+                self._paginate(f'organizations/{org_id}/firmware/upgrades/byDevice', per_page=100)
+            ))
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in [400, 404]:
+                # Organization doesn't support the firmware upgrades API
+                return {}
+            raise
+    
+    async def get_network_firmware_upgrades(self, network_id: str) -> Dict:
+        """Get firmware upgrade information for a network"""
+        return await self._get_or_empty(f'networks/{network_id}/firmwareUpgrades', {}, (400, 404))
+
+
+async def _fetch_into(client: AsyncMerakiAPIClient, cache_client: MerakiAPIClient, endpoint: str) -> bool:
+    """Fetch one GET endpoint and store the result (or HTTP error) in the sync client's run cache"""
+    try:
+        cache_client.seed_run_cache(endpoint, value=await client._request('GET', endpoint))
+    except requests.exceptions.HTTPError as e:
+        # Cached like the sync client does, so e.g. a 404 for networks without VLANs is not retried
+        cache_client.seed_run_cache(endpoint, error=e)
+    except Exception as e:
+        logger.debug(f"Async prefetch of {endpoint} failed, it will be fetched on demand: {e}")
+        return False
+    return True
+
+
+async def prefetch_network_data(cache_client: MerakiAPIClient, networks: List[Dict],
+                                org_id: Optional[str] = None, max_concurrency: Optional[int] = None) -> int:
+    """Fetch per-network data for many networks concurrently into a run cache
+    
+    Appliance VLANs are requested for every network and SSIDs for networks
+    with wireless, mirroring what MerakiSyncService reads per network. Results
+    are seeded into `cache_client`'s run cache, so the regular synchronous sync
+    then reads them without another round trip.
+    
+    Returns:
+        Number of endpoints prefetched successfully
+    """
+    endpoints = []
+    for network in networks:
+        network_id = network.get('id')
+        if not network_id:
+            continue
+        endpoints.append(f'networks/{network_id}/appliance/vlans')
+        if 'wireless' in (network.get('productTypes') or []):
+            endpoints.append(f'networks/{network_id}/wireless/ssids')
+    
+    async with AsyncMerakiAPIClient(
+        cache_client.api_key,
+        cache_client.base_url,
+        requests_per_second=cache_client.requests_per_second,
+        enable_throttling=cache_client.enable_throttling,
+        max_concurrency=max_concurrency,
+    ) as client:
+        client.remember_networks(networks, org_id)
+        results = await asyncio.gather(*(_fetch_into(client, cache_client, e) for e in endpoints))
+    
+    return sum(results)
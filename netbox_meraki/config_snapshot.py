@@ -0,0 +1,106 @@
+"""
+Read-only snapshot of plugin settings, site name rules and prefix filter rules
+
+Every network, device, VLAN set and SSID batch used to load PluginSettings
+again, every network re-queried the enabled site name rules and every prefix
+ran up to three prefix filter queries. ConfigSnapshot loads all three once.
+
+Each MerakiSyncService loads a fresh snapshot when it is created (so a worker
+process always picks up changes made elsewhere) and keeps it for the whole run.
+Outside a run, get_config_snapshot() returns the process-wide snapshot, which is
+dropped when one of the models is saved or deleted (see signals.py).
+"""
+import logging
+import threading
+from typing import Optional, Tuple
+
+from .prefix_filter import PrefixFilter
+from .rule_engine import SiteRuleEngine
+
+
+logger = logging.getLogger('netbox_meraki')
+
+
+class ConfigSnapshot:
+    """Plugin settings and enabled rules as loaded at one point in time
+    
+    The snapshot cannot be modified; the PluginSettings instance it holds is
+    shared by every caller and must be treated as read-only.
+    """
+    
+    __slots__ = ('settings', 'site_rules', 'site_engine', 'prefix_filter')
+    
+    def __init__(self, settings, site_rules: Tuple = (), prefix_rules: Tuple = ()):
+        object.__setattr__(self, 'settings', settings)
+        object.__setattr__(self, 'site_rules', tuple(site_rules))
+        # Compiled once; memoizes results per network name
+        object.__setattr__(self, 'site_engine', SiteRuleEngine(self.site_rules))
+        # Compiled into radix tries; one lookup per prefix
+        object.__setattr__(self, 'prefix_filter', PrefixFilter(prefix_rules))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+    
+    @classmethod
+    def load(cls) -> 'ConfigSnapshot':
+        """Load settings and enabled rules (three queries)"""
+        from .models import PluginSettings, SiteNameRule, PrefixFilterRule
+        
+        return cls(
+            PluginSettings.get_settings(),
+            SiteNameRule.objects.filter(enabled=True).order_by('priority'),
+            PrefixFilterRule.objects.filter(enabled=True).order_by('priority'),
+        )
+    
+    def transform_network_name(self, network_name: str) -> Optional[str]:
+        """Apply the enabled site name rules to a network name
+        
+        Returns:
+            Transformed name if a rule matches, original name if process_unmatched_sites is True,
+            or None if no rules match and process_unmatched_sites is False
+        """
+        transformed, rule_name = self.site_engine.match(network_name)
+        if transformed is not None:
+            logger.info(f"Applied rule '{rule_name}': '{network_name}' -> '{transformed}'")
+            return transformed
+        
+        # No rules matched - check if we should process unmatched sites
+        if self.settings.process_unmatched_sites:
+            return network_name
+        logger.info(f"Skipping site '{network_name}' - does not match any name rules and process_unmatched_sites is disabled")
+        return None
+    
+    def should_sync_prefix(self, prefix_str: str) -> bool:
+        """Determine if a prefix should be synced based on the enabled prefix filter rules"""
+        return self.prefix_filter.should_sync_prefix(prefix_str)
+
+
+_snapshot: Optional[ConfigSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def load_config_snapshot() -> ConfigSnapshot:
+    """Load a fresh snapshot and make it the process-wide one"""
+    global _snapshot
+    snapshot = ConfigSnapshot.load()
+    with _snapshot_lock:
+        _snapshot = snapshot
+    return snapshot
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    """Return the process-wide snapshot, loading it if needed"""
+    snapshot = _snapshot
+    if snapshot is None:
+        snapshot = load_config_snapshot()
+    return snapshot
+
+
+def invalidate_config_snapshot():
+    """Drop the process-wide snapshot; the next get_config_snapshot() reloads it"""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
@@ -0,0 +1,259 @@
+"""
+Run-scoped resolution of tags, manufacturers, device types, device roles and
+wireless LANs
+
+Applying a review item used to call get_or_create() for every configured tag
+on every object, and for the manufacturer, device type and device role of
+every device. LookupResolver resolves each of them once per run and then
+serves it from memory. Tags are assigned by inserting through-model
+(TaggedItem) rows in bulk instead of one tags.add() per tag and object.
+Wireless LANs are upserted once per SSID name, however many networks and
+access points broadcast it.
+"""
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+
+from dcim.models import DeviceRole, DeviceType, Manufacturer
+from extras.models import Tag, TaggedItem
+from wireless.models import WirelessLAN
+
+from .transactions import TransactionOverlay
+
+
+logger = logging.getLogger('netbox_meraki')
+
+SLUG_RE = re.compile(r'[^a-z0-9-]+')
+
+TAGGED_ITEM_BATCH_SIZE = 500
+
+# Device role colors by Meraki product type prefix
+ROLE_COLORS = {
+    'MX': 'f44336',  # Red for security appliances
+    'MS': '2196f3',  # Blue for switches
+    'MR': '4caf50',  # Green for wireless APs
+    'MG': 'ff9800',  # Orange for cellular gateways
+    'MV': '9c27b0',  # Purple for cameras
+    'MT': '00bcd4',  # Cyan for sensors
+}
+DEFAULT_ROLE_COLOR = '607d8b'  # Grey for unknown
+
+
+def make_slug(value: str, fallback: str = '') -> str:
+    """Lowercase value with runs of other characters replaced by '-'"""
+    return SLUG_RE.sub('-', (value or '').lower()).strip('-') or fallback
+
+
+class LookupResolver(TransactionOverlay):
+    """Resolves lookup objects at most once per run and batches tag assignment
+    
+    No lock is held while creating an object: two threads may both call
+    get_or_create() for a new name, and the database's unique constraints
+    settle which one creates it.
+    
+    Pending tag rows follow the overlay layers: rows queued inside a
+    transaction or savepoint that rolls back are dropped with it.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tags: Dict[str, Tag] = {}
+        self._manufacturers: Dict[str, Manufacturer] = {}
+        self._device_types: Dict[Tuple[int, str], DeviceType] = {}
+        self._device_roles: Dict[str, DeviceRole] = {}
+        self._wireless_lans: Dict[str, WirelessLAN] = {}
+        # (content type ID, object ID, tag ID) rows assigned in this run
+        self._tagged: Dict[Tuple[int, int, int], bool] = {}
+        # Pending (content type ID, object ID, tag ID) rows per thread, None when not batching
+        self._pending = threading.local()
+    
+    def _saved_rows(self) -> list:
+        """Per-thread stack of the pending rows of the enclosing overlay layers"""
+        saved = getattr(self._pending, 'saved', None)
+        if saved is None:
+            saved = self._pending.saved = []
+        return saved
+    
+    def begin_overlay(self):
+        super().begin_overlay()
+        rows = getattr(self._pending, 'rows', None)
+        self._saved_rows().append(rows)
+        if rows is not None:
+            self._pending.rows = set()
+    
+    def commit_overlay(self):
+        super().commit_overlay()
+        saved = self._saved_rows()
+        outer = saved.pop() if saved else None
+        if outer is not None:
+            outer.update(getattr(self._pending, 'rows', None) or ())
+            self._pending.rows = outer
+    
+    def discard_overlay(self):
+        super().discard_overlay()
+        saved = self._saved_rows()
+        outer = saved.pop() if saved else None
+        if outer is not None:
+            self._pending.rows = outer
+    
+    def tag(self, name: str) -> Tag:
+        tag = self._cache_get('_tags', name)
+        if tag is None:
+            tag, _ = Tag.objects.get_or_create(name=name, defaults={'slug': name.lower().replace(' ', '-')})
+            self._cache_put('_tags', name, tag)
+        return tag
+    
+    def manufacturer(self, name: str) -> Manufacturer:
+        manufacturer = self._cache_get('_manufacturers', name)
+        if manufacturer is None:
+            manufacturer, _ = Manufacturer.objects.get_or_create(
+                name=name,
+                defaults={'slug': 'cisco-meraki'}
+            )
+            self._cache_put('_manufacturers', name, manufacturer)
+        return manufacturer
+    
+    def device_type(self, manufacturer: Manufacturer, model: str, serial: str = '') -> DeviceType:
+        """Device type for a model, with part_number set to the model if blank"""
+        key = (manufacturer.pk, model)
+        device_type = self._cache_get('_device_types', key)
+        if device_type is None:
+            device_type, _ = DeviceType.objects.get_or_create(
+                model=model,
+                manufacturer=manufacturer,
+                defaults={
+                    'slug': make_slug(model, f"device-{serial.lower()}"),
+                    'part_number': model  # Use model as part number
+                }
+            )
+            
+            # Ensure part_number is always set (update existing device types if blank)
+            if not device_type.part_number:
+                device_type.part_number = model
+                device_type.save()
+                logger.info(f"Updated part_number for device type '{model}'")
+            self._cache_put('_device_types', key, device_type)
+        return device_type
+    
+    def device_role(self, name: str, product_type: str = '') -> DeviceRole:
+        """Device role by name, created with a color for the product type"""
+        device_role = self._cache_get('_device_roles', name)
+        if device_role is None:
+            product_prefix = product_type[:2].upper() if product_type and len(product_type) >= 2 else ''
+            role_color = ROLE_COLORS.get(product_prefix, DEFAULT_ROLE_COLOR)
+            logger.info(f"Creating/getting role '{name}' with color '{role_color}' for product prefix '{product_prefix}'")
+            device_role, _ = DeviceRole.objects.get_or_create(
+                name=name,
+                defaults={
+                    'slug': make_slug(name, 'unknown-role'),
+                    'color': role_color
+                }
+            )
+            self._cache_put('_device_roles', name, device_role)
+        return device_role
+    
+    def wireless_lan(self, ssid: str, defaults: Dict) -> Tuple[WirelessLAN, bool]:
+        """Create or update the Wireless LAN for an SSID name, once per run
+        
+        Later networks broadcasting the same SSID name get the Wireless LAN as
+        it was first written. Call it inside a savepoint (see
+        transactions.savepoint()) so the entry is evicted if the savepoint
+        rolls back.
+        
+        Returns:
+            (Wireless LAN, whether it was created in this call)
+        """
+        wlan = self._cache_get('_wireless_lans', ssid)
+        if wlan is not None:
+            return wlan, False
+        wlan, created = WirelessLAN.objects.update_or_create(ssid=ssid, defaults=defaults)
+        self._cache_put('_wireless_lans', ssid, wlan)
+        return wlan, created
+    
+    # Tag assignment
+    
+    @contextmanager
+    def tag_batch(self):
+        """Collect tag assignments made on this thread and insert them on exit"""
+        self._pending.rows = set()
+        try:
+            yield
+        finally:
+            rows, self._pending.rows = self._pending.rows, None
+            self._insert_tagged_items(rows)
+    
+    def flush_tag_batch(self):
+        """Insert the tag assignments collected so far in the current overlay layer"""
+        rows = getattr(self._pending, 'rows', None)
+        if rows:
+            self._pending.rows = set()
+            self._insert_tagged_items(rows)
+    
+    def assign_tags(self, obj, tag_names: Iterable[str]):
+        """Tag an object, adding to any tags it already has
+        
+        Inside tag_batch() the rows are inserted when the batch ends,
+        otherwise right away.
+        """
+        self.assign_tags_to_all([obj], tag_names)
+    
+    def assign_tags_to_all(self, objs: Iterable, tag_names: Iterable[str]):
+        """Tag several objects (of any models) with the same tags"""
+        tag_ids = [self.tag(name).pk for name in tag_names]
+        if not tag_ids:
+            return
+        
+        rows = {
+            (ContentType.objects.get_for_model(obj).pk, obj.pk, tag_id)
+            for obj in objs
+            for tag_id in tag_ids
+        }
+        if not rows:
+            return
+        for row in rows:
+            self._cache_put('_tagged', row, True)
+        pending = getattr(self._pending, 'rows', None)
+        if pending is not None:
+            pending.update(rows)
+        else:
+            self._insert_tagged_items(rows)
+    
+    def has_tags(self, obj, tag_names: Iterable[str]) -> bool:
+        """Whether this run already assigned every one of the tags to the object
+        
+        Answered from memory, without queries; False only means the run has
+        not assigned them, not that the object lacks them.
+        """
+        content_type_id = ContentType.objects.get_for_model(obj).pk
+        for name in tag_names:
+            tag = self._cache_get('_tags', name)
+            if tag is None or not self._cache_get('_tagged', (content_type_id, obj.pk, tag.pk)):
+                return False
+        return True
+    
+    def _insert_tagged_items(self, rows: Iterable[Tuple[int, int, int]]):
+        """Insert TaggedItem rows that do not exist yet"""
+        by_content_type: Dict[int, List[Tuple[int, int]]] = {}
+        for content_type_id, object_id, tag_id in rows:
+            by_content_type.setdefault(content_type_id, []).append((object_id, tag_id))
+        
+        for content_type_id, pairs in by_content_type.items():
+            # TaggedItem has no unique constraint, so existing rows are excluded first
+            existing = set(
+                TaggedItem.objects.filter(
+                    content_type_id=content_type_id,
+                    object_id__in={object_id for object_id, _ in pairs},
+                    tag_id__in={tag_id for _, tag_id in pairs},
+                ).values_list('object_id', 'tag_id')
+            )
+            new_items = [
+                TaggedItem(content_type_id=content_type_id, object_id=object_id, tag_id=tag_id)
+                for object_id, tag_id in pairs
+                if (object_id, tag_id) not in existing
+            ]
+            if new_items:
+                TaggedItem.objects.bulk_create(new_items, batch_size=TAGGED_ITEM_BATCH_SIZE, ignore_conflicts=True)
@@ -0,0 +1,97 @@
+"""
+Django management command to benchmark the compiled site name rule engine
+"""
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from netbox_meraki.rule_engine import SiteRuleEngine
+
+
+class SyntheticRule:
+    """Unsaved stand-in for a SiteNameRule"""
+    
+    def __init__(self, name, regex_pattern, site_name_template):
+        self.name = name
+        self.regex_pattern = regex_pattern
+        self.site_name_template = site_name_template
+
+
+def uncompiled_transform(rules, network_name):
+    """Rule evaluation as SiteNameRule.apply() did it before the engine (baseline)"""
+    for rule in rules:
+        match = re.match(rule.regex_pattern, network_name)
+        if not match:
+            continue
+        result = rule.site_name_template
+        for name, value in match.groupdict().items():
+            if value:
+                result = result.replace(f'{{{name}}}', value)
+        for i, group in enumerate(match.groups()):
+            result = result.replace(f'{{{i}}}', group or '')
+        result = result.replace('{network_name}', network_name).strip()
+        if result != network_name:
+            return result
+    return None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark site name rule evaluation with synthetic rules and network names (no database access)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--networks', type=int, default=10000, help='Number of network names')
+        parser.add_argument('--rules', type=int, default=200, help='Number of site name rules')
+        parser.add_argument('--unmatched', type=float, default=0.1, help='Fraction of names no rule matches')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        rule_count = max(options['rules'], 1)
+        network_count = max(options['networks'], 1)
+        
+        rules = [
+            SyntheticRule(
+                f'rule-{i}',
+                rf'^R{i:03d}-(?P<region>[A-Z]{{2,4}})-(?P<site>[A-Za-z0-9]+)(?:-(\d+))?$',
+                f'{{site}}-{{region}}-{{2}}-{i}',
+            )
+            for i in range(rule_count)
+        ]
+        names = []
+        for n in range(network_count):
+            if rng.random() < options['unmatched']:
+                names.append(f'Lab Network {n}')
+            else:
+                region = rng.choice(['NA', 'EMEA', 'APAC', 'LATM'])
+                names.append(f'R{rng.randrange(rule_count):03d}-{region}-SITE{n}-{n % 7}')
+        
+        self.stdout.write(f'{network_count} networks, {rule_count} rules')
+        
+        start = time.perf_counter()
+        baseline = [uncompiled_transform(rules, name) for name in names]
+        self._report('Uncompiled (baseline)', network_count, time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        engine = SiteRuleEngine(rules)
+        self._report('Compile rules', rule_count, time.perf_counter() - start, unit='rules')
+        
+        start = time.perf_counter()
+        compiled = [engine.match(name)[0] for name in names]
+        self._report('Compiled engine', network_count, time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        for name in names:
+            engine.match(name)
+        self._report('Compiled engine (memoized)', network_count, time.perf_counter() - start)
+        
+        mismatches = sum(1 for a, b in zip(baseline, compiled) if a != b)
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'{mismatches} results differ from the baseline'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Compiled results match the baseline'))
+    
+    def _report(self, label, count, elapsed, unit='networks'):
+        rate = count / elapsed if elapsed else float('inf')
+        self.stdout.write(f'  {label:<28} {elapsed * 1000:9.1f} ms  {rate:12,.0f} {unit}/s')
@@ -1,26 +1,251 @@
 """
 Meraki API Client for interacting with Cisco Meraki Dashboard API
 """
+import json
 import requests
 import logging
+import queue
+import random
+import threading
 import time
-from typing import List, Dict, Optional
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Dict, Optional
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+try:
+    # Optional faster JSON decoder
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 
 logger = logging.getLogger('netbox_meraki')
 
 
+class TokenBucket:
+    """Thread-safe token bucket rate limiter with AIMD rate control
+    
+    Tokens refill continuously at `rate` per second up to `capacity`, so short
+    bursts of up to `capacity` requests go out immediately and the sustained
+    rate never exceeds `rate`.
+    
+    The rate adapts to the quota Meraki actually grants: every successful
+    request raises it by `increase_step` (additive increase) up to `max_rate`,
+    and a 429 response multiplies it by `decrease_factor` (multiplicative
+    decrease). Concurrent 429s within `decrease_cooldown` seconds only count
+    once, so a burst of rejected in-flight requests does not collapse the rate.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_rate: float = 0.5,
+                 increase_step: float = 0.05, decrease_factor: float = 0.5, decrease_cooldown: float = 1.0):
+        self._lock = threading.Lock()
+        self.min_rate = min_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.max_rate = 0.0
+        self.rate = 0.0
+        self.capacity = 0.0
+        self.tokens = 0.0
+        self.configure(rate, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.last_decrease = 0.0
+    
+    def configure(self, rate: float, capacity: Optional[float] = None):
+        """Change the maximum refill rate and burst capacity"""
+        with self._lock:
+            self.max_rate = max(float(rate), 0.1)
+            self.rate = min(self.rate, self.max_rate) if self.rate else self.max_rate
+            self.capacity = max(float(capacity or rate), 1.0)
+            self.tokens = min(self.tokens, self.capacity)
+    
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+    
+    def acquire(self, tokens: float = 1.0):
+        """Block until `tokens` are available, then consume them"""
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Consume `tokens` now and return how long to wait before using them
+        
+        Non-blocking counterpart of acquire() for callers that sleep on their
+        own (e.g. asyncio); the bucket may go negative, which delays later callers.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def on_success(self):
+        """Additive increase after a request was accepted"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self._refill(time.monotonic())
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+    
+    def on_rate_limited(self) -> float:
+        """Multiplicative decrease after a 429; returns the new rate"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now - self.last_decrease >= self.decrease_cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self.last_decrease = now
+                # Drain the bucket so every worker sharing it backs off together
+                self.tokens = 0.0
+            return self.rate
+
+
+# Meraki enforces its request quota per organization, so buckets are shared by
+# every client in the process and keyed by organization ID
+_rate_buckets: Dict[str, TokenBucket] = {}
+_rate_buckets_lock = threading.Lock()
+
+GLOBAL_BUCKET_KEY = '__global__'
+
+
+def get_rate_bucket(key: str, rate: float, capacity: Optional[float] = None) -> TokenBucket:
+    """Get the shared token bucket for an organization, creating it if needed"""
+    with _rate_buckets_lock:
+        bucket = _rate_buckets.get(key)
+        if bucket is None:
+            bucket = _rate_buckets[key] = TokenBucket(rate, capacity)
+        elif bucket.max_rate != max(float(rate), 0.1) or bucket.capacity != max(float(capacity or rate), 1.0):
+            bucket.configure(rate, capacity)
+        return bucket
+
+
+def uplink_ips_by_serial(statuses: Iterator[Dict]) -> Dict[str, Dict[str, str]]:
+    """Map appliance uplink statuses to {serial: {"wan1": ip, ...}}"""
+    uplink_ips = {}
+    for item in statuses:
+        serial = item.get('serial')
+        if not serial:
+            continue
+        ips = {
+            uplink['interface']: uplink['ip']
+            for uplink in item.get('uplinks') or []
+            if uplink.get('interface') and uplink.get('ip')
+        }
+        if ips:
+            uplink_ips[serial] = ips
+    return uplink_ips
+
+
+def firmware_versions_by_serial(upgrades: Iterator[Dict]) -> Dict[str, str]:
+    """Map firmware upgrades by device to the running version of each serial
+    
+    A device runs the target version once its upgrade has completed, otherwise
+    it is still on the version it is being upgraded from.
+    """
+    versions = {}
+    for item in upgrades:
+        serial = item.get('serial')
+        upgrade = item.get('upgrade') or {}
+        if not serial or not upgrade:
+            continue
+        
+        status = (upgrade.get('status') or item.get('deviceStatus') or '').lower()
+        from_version = (upgrade.get('fromVersion') or {}).get('shortName')
+        to_version = (upgrade.get('toVersion') or {}).get('shortName')
+        
+        current = to_version if status == 'completed' else from_version
+        current = current or from_version or to_version
+        if current:
+            versions[serial] = current
+    return versions
+
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 60
+
+# One keep-alive session per API key, shared by every client (and sync worker)
+# in the process so connections to the Dashboard are reused across runs
+_sessions: Dict[str, requests.Session] = {}
+_session_pool_sizes: Dict[str, int] = {}
+_sessions_lock = threading.Lock()
+
+
+def _mount_pool(session: requests.Session, pool_size: int):
+    """Mount an adapter whose per-host pool holds `pool_size` connections"""
+    adapter = HTTPAdapter(pool_connections=DEFAULT_POOL_SIZE, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+
+def get_shared_session(api_key: str, pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Get the process-wide session for an API key, growing its pool if needed"""
+    with _sessions_lock:
+        session = _sessions.get(api_key)
+        if session is None:
+            session = _sessions[api_key] = requests.Session()
+            session.headers.update({
+                'X-Cisco-Meraki-API-Key': api_key,
+                'Content-Type': 'application/json',
+                'Accept-Encoding': 'gzip',
+            })
+            _session_pool_sizes[api_key] = 0
+        if pool_size > _session_pool_sizes[api_key]:
+            # Connections held by the old adapter are closed once it is released
+            _mount_pool(session, pool_size)
+            _session_pool_sizes[api_key] = pool_size
+        return session
+
+
+def decode_response(response: requests.Response, default=None):
+    """Decode a JSON response body, returning `default` ({}) when it is empty"""
+    if not response.content:
+        return {} if default is None else default
+    return json_loads(response.content)
+
+
+class _CachedResponse:
+    """Run cache slot; callers that arrive while the request is in flight wait on `ready`"""
+    
+    __slots__ = ('ready', 'value', 'error')
+    
+    def __init__(self):
+        self.ready = threading.Event()
+        self.value = None
+        self.error = None
+
+
 class MerakiAPIClient:
     """Client for Cisco Meraki Dashboard API"""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+    # Retry budgets: transport/5xx errors and 429 responses are counted separately
+    MAX_RETRIES = 3
+    MAX_RATE_LIMIT_RETRIES = 8
+    RETRY_DELAY = 5  # seconds, base of the exponential backoff
+    BACKOFF_CAP = 60  # seconds
+    
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 requests_per_second: Optional[float] = None, enable_throttling: Optional[bool] = None):
         """
         Initialize Meraki API client
         
         Args:
             api_key: Meraki Dashboard API key
             base_url: Meraki API base URL
+            requests_per_second: Per-organization request rate (defaults to PluginSettings)
+            enable_throttling: Whether to rate limit requests (defaults to PluginSettings)
         """
         plugin_config = settings.PLUGINS_CONFIG.get('netbox_meraki', {})
         
@@ -30,26 +255,225 @@ class MerakiAPIClient:
         if not self.api_key:
             raise ValueError("Meraki API key is required")
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            'X-Cisco-Meraki-API-Key': self.api_key,
-            'Content-Type': 'application/json'
-        })
+        # Pooled keep-alive transport shared across the process, with timeouts
+        # so a hung socket cannot stall a sync
+        self.pool_size = max(int(plugin_config.get('api_pool_size') or DEFAULT_POOL_SIZE), 1)
+        self.timeout = (
+            float(plugin_config.get('api_connect_timeout') or DEFAULT_CONNECT_TIMEOUT),
+            float(plugin_config.get('api_read_timeout') or DEFAULT_READ_TIMEOUT),
+        )
+        self.session = get_shared_session(self.api_key, self.pool_size)
+        self._connection_baseline = {}
         
         # Rate limiting settings
-        self.last_request_time = 0
-        self.min_request_interval = 0.2  # 200ms = 5 requests/second (Meraki limit is 10/sec)
+        if requests_per_second is None or enable_throttling is None:
+            plugin_settings = self._load_plugin_settings()
+            if requests_per_second is None:
+                requests_per_second = getattr(plugin_settings, 'api_requests_per_second', 5)
+            if enable_throttling is None:
+                enable_throttling = getattr(plugin_settings, 'enable_api_throttling', True)
+        
+        self.enable_throttling = enable_throttling
+        self.requests_per_second = max(float(requests_per_second or 5), 0.1)
+        self.burst_size = plugin_config.get('api_burst_size') or self.requests_per_second
+        
+        # Organization lookups used to pick the rate limit bucket for a request
+        self._network_orgs = {}
+        self._device_orgs = {}
+        
+        # Page/byte counters per paginated endpoint
+        self.pagination_stats = {}
+        self._stats_lock = threading.Lock()
+        
+        # Run-scoped GET response cache (None when no run is active)
+        self._response_cache = None
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
     
-    def _rate_limit(self):
-        """Enforce rate limiting between API requests"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
+    @staticmethod
+    def _load_plugin_settings():
+        """Load PluginSettings, tolerating a database that is not ready yet"""
+        try:
+            from .models import PluginSettings
+            return PluginSettings.get_settings()
+        except Exception as e:
+            logger.debug(f"Could not load plugin settings for API throttling: {e}")
+            return None
+    
+    def _organization_for_endpoint(self, endpoint: str) -> str:
+        """Work out which organization's rate limit a request counts against"""
+        path = endpoint
+        if path.startswith(self.base_url):
+            path = path[len(self.base_url):]
+        parts = path.split('?', 1)[0].strip('/').split('/')
+        
+        if len(parts) >= 2:
+            if parts[0] == 'organizations':
+                return parts[1]
+            if parts[0] == 'networks':
+                return self._network_orgs.get(parts[1], GLOBAL_BUCKET_KEY)
+            if parts[0] == 'devices':
+                return self._device_orgs.get(parts[1], GLOBAL_BUCKET_KEY)
         
-        if time_since_last_request < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last_request
-            time.sleep(sleep_time)
+        return GLOBAL_BUCKET_KEY
+    
+    def _remember_networks(self, org_id: str, networks: Iterator[Dict]) -> Iterator[Dict]:
+        """Record the organization of each network as it streams past"""
+        for network in networks:
+            if network.get('id'):
+                self._network_orgs[network['id']] = network.get('organizationId') or org_id
+            yield network
+    
+    def _remember_devices(self, devices: List[Dict], org_id: Optional[str] = None) -> List[Dict]:
+        """Record the organization of each device serial"""
+        for device in devices:
+            serial = device.get('serial')
+            if not serial:
+                continue
+            device_org = org_id or self._network_orgs.get(device.get('networkId'))
+            if device_org:
+                self._device_orgs[serial] = device_org
+        return devices
+    
+    def _rate_limit(self, endpoint: str = '') -> Optional[TokenBucket]:
+        """Wait for a token from the organization's shared rate limit bucket"""
+        if not self.enable_throttling:
+            return None
         
-        self.last_request_time = time.time()
+        bucket = get_rate_bucket(
+            self._organization_for_endpoint(endpoint),
+            self.requests_per_second,
+            self.burst_size,
+        )
+        bucket.acquire()
+        return bucket
+    
+    def ensure_pool_size(self, size: int):
+        """Make sure the connection pool can serve `size` concurrent requests"""
+        if size > self.pool_size:
+            self.pool_size = size
+            self.session = get_shared_session(self.api_key, size)
+    
+    def _pool_counters(self) -> Dict[str, Dict[str, int]]:
+        """Requests and connections opened so far, per host pool of the session"""
+        counters = {}
+        for adapter in set(self.session.adapters.values()):
+            pools = getattr(adapter.poolmanager, 'pools', None)
+            if pools is None:
+                continue
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                counters[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                    'requests': pool.num_requests,
+                    'connections': pool.num_connections,
+                }
+        return counters
+    
+    def reset_connection_stats(self):
+        """Count connection stats from now on (the session outlives a single run)"""
+        self._connection_baseline = self._pool_counters()
+    
+    def get_connection_stats(self) -> Dict[str, int]:
+        """Requests sent, connections opened and connections reused since the last reset"""
+        stats = {'requests': 0, 'connections': 0}
+        for host, counters in self._pool_counters().items():
+            baseline = self._connection_baseline.get(host, {})
+            for key in stats:
+                stats[key] += max(0, counters[key] - baseline.get(key, 0))
+        stats['reused'] = max(0, stats['requests'] - stats['connections'])
+        return stats
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter for the given retry attempt (1-based)"""
+        return random.uniform(0, min(self.BACKOFF_CAP, self.RETRY_DELAY * (2 ** (attempt - 1))))
+    
+    def _retry_after(self, response: requests.Response) -> float:
+        """Seconds the Dashboard asked us to wait before retrying a 429"""
+        try:
+            return max(0.0, float(response.headers.get('Retry-After', self.RETRY_DELAY)))
+        except (TypeError, ValueError):
+            return float(self.RETRY_DELAY)
+    
+    def _build_url(self, endpoint: str) -> str:
+        """Resolve an endpoint path (or an absolute pagination link) to a URL"""
+        if endpoint.startswith('http://') or endpoint.startswith('https://'):
+            return endpoint
+        return f"{self.base_url}/{endpoint.lstrip('/')}"
+    
+    def _send(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Send a request to Meraki Dashboard with rate limiting and retries
+        
+        Args:
+            method: HTTP method
+            endpoint: API endpoint or absolute URL
+            **kwargs: Additional request arguments
+            
+        Returns:
+            Raw response object
+        """
+        url = self._build_url(endpoint)
+        kwargs.setdefault('timeout', self.timeout)
+        
+        # 429s and transport/server errors have separate retry budgets: being
+        # throttled is expected under load and is handled by slowing down
+        error_attempts = 0
+        rate_limit_attempts = 0
+        
+        while True:
+            # Apply rate limiting
+            bucket = self._rate_limit(endpoint)
+            
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                error_attempts += 1
+                if error_attempts >= self.MAX_RETRIES:
+                    logger.error(f"Meraki API request failed after {self.MAX_RETRIES} attempts: {e}")
+                    raise
+                delay = self._backoff_delay(error_attempts)
+                logger.warning(
+                    f"Meraki API request failed (attempt {error_attempts}/{self.MAX_RETRIES}): {e}. "
+                    f"Retrying in {delay:.1f} seconds..."
+                )
+                time.sleep(delay)
+                continue
+            
+            # Handle rate limiting (429 Too Many Requests)
+            if response.status_code == 429:
+                rate_limit_attempts += 1
+                new_rate = bucket.on_rate_limited() if bucket else None
+                if rate_limit_attempts > self.MAX_RATE_LIMIT_RETRIES:
+                    logger.error(f"Meraki API request to {url} rate limited {rate_limit_attempts} times, giving up")
+                    response.raise_for_status()
+                delay = self._retry_after(response) + self._backoff_delay(rate_limit_attempts)
+                logger.warning(
+                    f"Rate limited by Meraki API. Waiting {delay:.1f} seconds..."
+                    + (f" (rate reduced to {new_rate:.2f} req/s)" if new_rate is not None else "")
+                )
+                time.sleep(delay)
+                continue
+            
+            # Retry server errors, but not client errors like 404
+            if response.status_code >= 500:
+                error_attempts += 1
+                if error_attempts < self.MAX_RETRIES:
+                    delay = self._backoff_delay(error_attempts)
+                    logger.warning(
+                        f"Meraki API returned {response.status_code} (attempt {error_attempts}/{self.MAX_RETRIES}). "
+                        f"Retrying in {delay:.1f} seconds..."
+                    )
+                    time.sleep(delay)
+                    continue
+                logger.error(f"Meraki API request failed after {self.MAX_RETRIES} attempts: HTTP {response.status_code}")
+            elif bucket is not None:
+                bucket.on_success()
+            
+            response.raise_for_status()
+            return response
     
     def _request(self, method: str, endpoint: str, **kwargs) -> Dict:
         """
@@ -63,37 +487,208 @@ class MerakiAPIClient:
         Returns:
             Response JSON data
         """
-        # Apply rate limiting
-        self._rate_limit()
+        if method.upper() == 'GET' and self._response_cache is not None:
+            return self._cached_get(endpoint, **kwargs)
+        
+        response = self._send(method, endpoint, **kwargs)
+        return decode_response(response)
+    
+    def start_run_cache(self):
+        """Start caching GET responses for the duration of a sync run"""
+        with self._cache_lock:
+            self._response_cache = {}
+            self.cache_hits = 0
+            self.cache_misses = 0
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counts of the current (or last) run cache"""
+        with self._cache_lock:
+            return {'hits': self.cache_hits, 'misses': self.cache_misses}
+    
+    def end_run_cache(self) -> Dict[str, int]:
+        """Drop the run cache and return its hit/miss counts"""
+        with self._cache_lock:
+            self._response_cache = None
+            return {'hits': self.cache_hits, 'misses': self.cache_misses}
+    
+    @contextmanager
+    def run_cache(self):
+        """Cache identical GET requests until the block exits"""
+        self.start_run_cache()
+        try:
+            yield self
+        finally:
+            self.end_run_cache()
+    
+    def seed_run_cache(self, endpoint: str, value=None, params: Optional[Dict] = None,
+                       error: Optional[Exception] = None):
+        """Store a GET result fetched elsewhere (e.g. by the async client) in the run cache
+        
+        The fetch counts as a cache miss, like a request sent by the client
+        itself, so later reads of the entry are not the only thing counted.
+        Ignored when no run is active or the request is already cached.
+        """
+        key = (self._build_url(endpoint), tuple(sorted((params or {}).items())))
+        with self._cache_lock:
+            if self._response_cache is None or key in self._response_cache:
+                return
+            entry = self._response_cache[key] = _CachedResponse()
+            self.cache_misses += 1
+        entry.value = value
+        entry.error = error
+        entry.ready.set()
+    
+    def _cached_get(self, endpoint: str, **kwargs):
+        """
+        Serve a GET from the run cache, coalescing concurrent identical requests
         
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        Only the first caller for a given endpoint/params performs the request;
+        callers arriving while it is in flight wait for its result. HTTP errors
+        (e.g. 404 for networks without VLANs) are cached too, other failures are
+        not so a later caller can retry. Cached responses are shared between
+        callers and must be treated as read-only.
+        """
+        params = kwargs.get('params') or {}
+        key = (self._build_url(endpoint), tuple(sorted(params.items())))
+        
+        with self._cache_lock:
+            cache = self._response_cache
+            if cache is None:
+                entry, owner = None, True
+            else:
+                entry = cache.get(key)
+                owner = entry is None
+                if owner:
+                    entry = cache[key] = _CachedResponse()
+                    self.cache_misses += 1
+                else:
+                    self.cache_hits += 1
         
-        max_retries = 3
-        retry_delay = 5  # seconds
+        if entry is None:
+            # The run ended while we were waiting for the lock
+            response = self._send('GET', endpoint, **kwargs)
+            return decode_response(response)
         
-        for attempt in range(max_retries):
+        if owner:
             try:
-                response = self.session.request(method, url, **kwargs)
-                
-                # Handle rate limiting (429 Too Many Requests)
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', retry_delay))
-                    logger.warning(f"Rate limited by Meraki API. Waiting {retry_after} seconds...")
-                    time.sleep(retry_after)
+                response = self._send('GET', endpoint, **kwargs)
+                entry.value = decode_response(response)
+            except Exception as e:
+                entry.error = e
+                if not isinstance(e, requests.exceptions.HTTPError):
+                    with self._cache_lock:
+                        if cache.get(key) is entry:
+                            del cache[key]
+            finally:
+                entry.ready.set()
+        else:
+            entry.ready.wait()
+        
+        if entry.error is not None:
+            raise entry.error
+        return entry.value
+    
+    def _record_page(self, stat_key: str, response: requests.Response, item_count: int):
+        """Record page and byte counts for a paginated endpoint"""
+        with self._stats_lock:
+            stats = self.pagination_stats.setdefault(stat_key, {'pages': 0, 'items': 0, 'bytes': 0})
+            stats['pages'] += 1
+            stats['items'] += item_count
+            stats['bytes'] += len(response.content or b'')
+    
+    def _iter_pages(self, endpoint: str, per_page: int, params: Optional[Dict] = None,
+                    stat_key: Optional[str] = None, on_page: Optional[Callable] = None) -> Iterator[List[Dict]]:
+        """
+        Yield each page of a list endpoint, following the Link: rel=next header
+        
+        Args:
+            endpoint: API endpoint of the first page
+            per_page: Page size (use the endpoint maximum to minimise round trips)
+            params: Additional query parameters for the first page
+            stat_key: Key under which page counts are recorded (defaults to endpoint)
+            on_page: Called with each page and whether more pages follow, as
+                soon as the page is fetched
+        """
+        stat_key = stat_key or endpoint
+        next_url = endpoint
+        next_params = dict(params or {}, perPage=per_page)
+        
+        while next_url:
+            response = self._send('GET', next_url, params=next_params)
+            page = decode_response(response, [])
+            
+            # Some endpoints wrap results, e.g. {"items": [...], "meta": {...}}
+            if isinstance(page, dict):
+                page = page.get('items', [])
+            
+            self._record_page(stat_key, response, len(page))
+            
+            # The next link already carries perPage and the startingAfter cursor
+            next_url = response.links.get('next', {}).get('url')
+            next_params = None
+            if on_page is not None:
+                on_page(page, bool(next_url))
+            yield page
+    
+    def _paginate(self, endpoint: str, per_page: int, params: Optional[Dict] = None,
+                  stat_key: Optional[str] = None, prefetch: bool = False,
+                  on_page: Optional[Callable] = None) -> Iterator[Dict]:
+        """
+        Lazily yield every item of a paginated list endpoint
+        
+        With prefetch enabled the next page is fetched in a background thread
+        while the caller is still processing the current one.
+        """
+        pages = self._iter_pages(endpoint, per_page, params, stat_key, on_page)
+        if prefetch:
+            pages = self._prefetch_pages(pages)
+        
+        for page in pages:
+            yield from page
+    
+    def _prefetch_pages(self, pages: Iterator[List[Dict]]) -> Iterator[List[Dict]]:
+        """Run a page iterator one page ahead of its consumer in a worker thread"""
+        buffer = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        done = object()
+        
+        def offer(item) -> bool:
+            # Give up once the consumer has gone away so the thread can exit
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
                     continue
-                
-                response.raise_for_status()
-                return response.json() if response.content else {}
-                
-            except requests.exceptions.RequestException as e:
-                if attempt < max_retries - 1:
-                    logger.warning(f"Meraki API request failed (attempt {attempt + 1}/{max_retries}): {e}")
-                    time.sleep(retry_delay)
-                else:
-                    logger.error(f"Meraki API request failed after {max_retries} attempts: {e}")
-                    raise
+            return False
+        
+        def producer():
+            try:
+                for page in pages:
+                    if not offer(page):
+                        return
+                offer(done)
+            except Exception as e:
+                offer(e)
         
-        return {}
+        worker = threading.Thread(target=producer, name='meraki-page-prefetch', daemon=True)
+        worker.start()
+        
+        try:
+            while True:
+                page = buffer.get()
+                if page is done:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            stop.set()
+    
+    def get_pagination_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get page, item and byte counts recorded per paginated endpoint"""
+        with self._stats_lock:
+            return {key: dict(value) for key, value in self.pagination_stats.items()}
     
     def get_organizations(self) -> List[Dict]:
         """Get all organizations"""
@@ -103,9 +698,24 @@ class MerakiAPIClient:
         """Get organization details"""
         return self._request('GET', f'organizations/{org_id}')
     
+    def iter_networks(self, org_id: str, prefetch: bool = False, on_page: Optional[Callable] = None) -> Iterator[Dict]:
+        """Lazily iterate all networks in an organization
+        
+        Args:
+            on_page: Called with each page of networks and whether more pages
+                follow, before its networks are yielded (e.g. to count them)
+        """
+        return self._remember_networks(org_id, self._paginate(
+            f'organizations/{org_id}/networks',
+            per_page=100000,
+            stat_key='organizations/{organizationId}/networks',
+            prefetch=prefetch,
+            on_page=on_page,
+        ))
+    
     def get_networks(self, org_id: str) -> List[Dict]:
         """Get all networks in an organization"""
-        return self._request('GET', f'organizations/{org_id}/networks')
+        return list(self.iter_networks(org_id))
     
     def get_network(self, network_id: str) -> Dict:
         """Get network details"""
@@ -113,15 +723,40 @@ class MerakiAPIClient:
     
     def get_devices(self, network_id: str) -> List[Dict]:
         """Get all devices in a network"""
-        return self._request('GET', f'networks/{network_id}/devices')
+        return self._remember_devices(self._request('GET', f'networks/{network_id}/devices'))
+    
+    def iter_organization_devices(self, org_id: str, prefetch: bool = False) -> Iterator[Dict]:
+        """Lazily iterate every device in an organization (across all networks)"""
+        for device in self._paginate(
+            f'organizations/{org_id}/devices',
+            per_page=1000,
+            stat_key='organizations/{organizationId}/devices',
+            prefetch=prefetch,
+        ):
+            if device.get('serial'):
+                self._device_orgs[device['serial']] = org_id
+            yield device
+    
+    def get_organization_devices(self, org_id: str) -> List[Dict]:
+        """Get every device in an organization (across all networks)"""
+        return list(self.iter_organization_devices(org_id))
     
     def get_device(self, serial: str) -> Dict:
         """Get device details"""
         return self._request('GET', f'devices/{serial}')
     
+    def iter_device_statuses(self, org_id: str, prefetch: bool = False) -> Iterator[Dict]:
+        """Lazily iterate device statuses for an organization"""
+        return self._paginate(
+            f'organizations/{org_id}/devices/statuses',
+            per_page=1000,
+            stat_key='organizations/{organizationId}/devices/statuses',
+            prefetch=prefetch,
+        )
+    
     def get_device_statuses(self, org_id: str) -> List[Dict]:
         """Get device statuses for an organization"""
-        return self._request('GET', f'organizations/{org_id}/devices/statuses')
+        return list(self.iter_device_statuses(org_id))
     
     def get_appliance_vlans(self, network_id: str) -> List[Dict]:
         """Get VLANs configured on MX appliance"""
@@ -151,6 +786,29 @@ class MerakiAPIClient:
                 return []
             raise
     
+    def iter_organization_switch_ports_by_switch(self, org_id: str, prefetch: bool = False) -> Iterator[Dict]:
+        """Lazily iterate switch port configuration for every switch in an organization
+        
+        Each item is a switch ({"serial": ..., "network": {...}, "ports": [...]})
+        with the same port fields as get_switch_ports.
+        """
+        return self._paginate(
+            f'organizations/{org_id}/switch/ports/bySwitch',
+            per_page=50,
+            stat_key='organizations/{organizationId}/switch/ports/bySwitch',
+            prefetch=prefetch,
+        )
+    
+    def get_organization_switch_ports_by_switch(self, org_id: str) -> List[Dict]:
+        """Get switch port configuration for every switch in an organization"""
+        try:
+            return list(self.iter_organization_switch_ports_by_switch(org_id))
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in [400, 404]:
+                # Organization has no switches
+                return []
+            raise
+    
     def get_appliance_subnets(self, network_id: str) -> List[Dict]:
         """Get subnets/prefixes from appliance VLANs"""
         vlans = self.get_appliance_vlans(network_id)
@@ -167,9 +825,18 @@ class MerakiAPIClient:
         
         return subnets
     
+    def iter_organization_inventory(self, org_id: str, prefetch: bool = False) -> Iterator[Dict]:
+        """Lazily iterate organization inventory devices"""
+        return self._paginate(
+            f'organizations/{org_id}/inventoryDevices',
+            per_page=1000,
+            stat_key='organizations/{organizationId}/inventoryDevices',
+            prefetch=prefetch,
+        )
+    
     def get_organization_inventory(self, org_id: str) -> List[Dict]:
         """Get organization inventory devices"""
-        return self._request('GET', f'organizations/{org_id}/inventoryDevices')
+        return list(self.iter_organization_inventory(org_id))
     
     def get_wireless_ssids(self, network_id: str) -> List[Dict]:
         """Get wireless SSIDs for a network"""
@@ -181,6 +848,52 @@ class MerakiAPIClient:
                 return []
             raise
     
+    def iter_organization_appliance_uplink_statuses(self, org_id: str, prefetch: bool = False) -> Iterator[Dict]:
+        """Lazily iterate uplink status for every MX appliance in an organization
+        
+        Example item: {"serial": "Q234-ABCD-5678", "networkId": "N_24329156",
+        "uplinks": [{"interface": "wan1", "status": "active", "ip": "1.2.3.4", ...}]}
+        """
+        return self._paginate(
+            f'organizations/{org_id}/appliance/uplink/statuses',
+            per_page=1000,
+            stat_key='organizations/{organizationId}/appliance/uplink/statuses',
+            prefetch=prefetch,
+        )
+    
+    def get_organization_appliance_uplink_ips(self, org_id: str) -> Dict[str, Dict[str, str]]:
+        """Get the WAN IP of each appliance uplink by serial, e.g. {"Q234-...": {"wan1": "1.2.3.4"}}"""
+        try:
+            return uplink_ips_by_serial(self.iter_organization_appliance_uplink_statuses(org_id))
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in [400, 404]:
+                # Organization has no appliances
+                return {}
+            raise
+    
+    def iter_organization_firmware_upgrades_by_device(self, org_id: str, prefetch: bool = False) -> Iterator[Dict]:
+        """Lazily iterate firmware upgrade status for every device in an organization
+        
+        Example item: {"serial": "Q234-ABCD-5678", "upgrade": {"status": "Completed",
+        "fromVersion": {"shortName": "MR 28.7"}, "toVersion": {"shortName": "MR 29.5"}}}
+        """
+        return self._paginate(
+            f'organizations/{org_id}/firmware/upgrades/byDevice',
+            per_page=100,
+            stat_key='organizations/{organizationId}/firmware/upgrades/byDevice',
+            prefetch=prefetch,
+        )
+    
+    def get_organization_firmware_versions(self, org_id: str) -> Dict[str, str]:
+        """Get the running firmware version (shortName, e.g. "MX 18.107.4") of each device by serial"""
+        try:
+            return firmware_versions_by_serial(self.iter_organization_firmware_upgrades_by_device(org_id))
+        except requests.exceptions.HTTPError as e:
+            if e.response.status_code in [400, 404]:
+                # Organization doesn't support the firmware upgrades API
+                return {}
+            raise
+    
     def get_network_firmware_upgrades(self, network_id: str) -> Dict:
         """Get firmware upgrade information for a network
         
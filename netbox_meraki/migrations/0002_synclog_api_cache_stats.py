@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_meraki', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='synclog',
+            name='api_cache_hits',
+            field=models.IntegerField(default=0, help_text='Meraki API requests served from the run cache'),
+        ),
+        migrations.AddField(
+            model_name='synclog',
+            name='api_cache_misses',
+            field=models.IntegerField(default=0, help_text='Meraki API requests sent to the Dashboard'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_meraki', '0002_synclog_api_cache_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='synclog',
+            name='skipped_unchanged',
+            field=models.IntegerField(default=0, help_text='Objects skipped because they already match Meraki'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_meraki', '0003_synclog_skipped_unchanged'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncProgressEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('timestamp', models.DateTimeField()),
+                ('level', models.CharField(default='info', max_length=10)),
+                ('message', models.TextField()),
+                ('sync_log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_entries', to='netbox_meraki.synclog')),
+            ],
+            options={
+                'verbose_name': 'Sync Progress Entry',
+                'verbose_name_plural': 'Sync Progress Entries',
+                'ordering': ['pk'],
+            },
+        ),
+    ]
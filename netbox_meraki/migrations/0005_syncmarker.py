@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('netbox_meraki', '0004_syncprogressentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncMarker',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('generation', models.PositiveBigIntegerField(help_text='ID of the sync log of the last run that saw this object')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Sync Marker',
+                'verbose_name_plural': 'Sync Markers',
+                'indexes': [models.Index(fields=['content_type', 'generation'], name='netbox_meraki_marker_gen_idx')],
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id'), name='netbox_meraki_syncmarker_unique_object')],
+            },
+        ),
+    ]
@@ -1,11 +1,72 @@
-from django.db import models
+from django.db import DatabaseError, connection, models, transaction
 from django.urls import reverse
 from django.core.exceptions import ValidationError
 import re
 import logging
+import queue
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Serializes progress writes when networks are synced by a worker pool
+_progress_lock = threading.RLock()
+
+# Buffered progress log entries are written every PROGRESS_FLUSH_SIZE entries
+# or after PROGRESS_FLUSH_INTERVAL seconds, whichever comes first
+PROGRESS_FLUSH_SIZE = 50
+PROGRESS_FLUSH_INTERVAL = 1.0
+
+
+# The progress writer closes its database connection after this many idle seconds
+PROGRESS_WRITER_IDLE_TIMEOUT = 30.0
+
+
+class _ProgressWriter:
+    """Long-lived thread that inserts progress entries on its own database connection
+    
+    Used while the syncing thread is inside a transaction, so the entries show
+    up in the live view right away and survive a rollback. Entries are
+    queued, so a flush does not wait for the write; a failed write is logged
+    and dropped, it never fails the sync.
+    """
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def put(self, entries: list):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='meraki-progress-writer', daemon=True)
+                self._thread.start()
+        self._queue.put(entries)
+    
+    def wait(self):
+        """Block until every queued entry has been written (or failed)"""
+        self._queue.join()
+    
+    def _run(self):
+        while True:
+            try:
+                entries = self._queue.get(timeout=PROGRESS_WRITER_IDLE_TIMEOUT)
+            except queue.Empty:
+                # Idle: release the connection, the next write reconnects
+                connection.close()
+                continue
+            try:
+                SyncProgressEntry.objects.bulk_create(entries)
+            except DatabaseError as e:
+                logger.warning(f"Could not write {len(entries)} progress log entries: {e}")
+                # Start over with a fresh connection
+                connection.close()
+            finally:
+                self._queue.task_done()
+
+
+_progress_writer = _ProgressWriter()
+
 
 class PluginSettings(models.Model):
     
@@ -327,28 +388,15 @@ class SiteNameRule(models.Model):
     
     def apply(self, network_name: str) -> str:
         """Apply this rule to a network name"""
+        from .rule_engine import CompiledSiteRule
+        
         if not self.enabled:
             return network_name
         
         try:
-            match = re.match(self.regex_pattern, network_name)
-            if match:
-                # Start with the template
-                result = self.site_name_template
-                
-                # Replace named groups first (e.g., {site}, {location})
-                for name, value in match.groupdict().items():
-                    if value:
-                        result = result.replace(f'{{{name}}}', value)
-                
-                # Replace numbered groups {0}, {1}, etc.
-                for i, group in enumerate(match.groups()):
-                    result = result.replace(f'{{{i}}}', group or '')
-                
-                # Replace special placeholders
-                result = result.replace('{network_name}', network_name)
-                
-                return result.strip()
+            result = CompiledSiteRule.from_rule(self).apply(network_name)
+            if result is not None:
+                return result
         except Exception as e:
             logger.error(f"Error applying site name rule {self.name}: {e}")
         
@@ -362,23 +410,9 @@ class SiteNameRule(models.Model):
             Transformed name if a rule matches, original name if process_unmatched_sites is True,
             or None if no rules match and process_unmatched_sites is False
         """
-        from .models import PluginSettings
-        
-        rules = cls.objects.filter(enabled=True).order_by('priority')
+        from .config_snapshot import get_config_snapshot
         
-        for rule in rules:
-            transformed = rule.apply(network_name)
-            if transformed != network_name:
-                logger.info(f"Applied rule '{rule.name}': '{network_name}' -> '{transformed}'")
-                return transformed
-        
-        # No rules matched - check if we should process unmatched sites
-        settings = PluginSettings.get_settings()
-        if settings.process_unmatched_sites:
-            return network_name
-        else:
-            logger.info(f"Skipping site '{network_name}' - does not match any name rules and process_unmatched_sites is disabled")
-            return None
+        return get_config_snapshot().transform_network_name(network_name)
 
 
 class PrefixFilterRule(models.Model):
@@ -534,28 +568,9 @@ class PrefixFilterRule(models.Model):
     @classmethod
     def should_sync_prefix(cls, prefix_str: str) -> bool:
         """Determine if a prefix should be synced based on all enabled rules"""
-        rules = cls.objects.filter(enabled=True).order_by('priority')
-        
-        if not rules.exists():
-            return True  # No rules = sync all prefixes
-        
-        # Check exclude rules first
-        for rule in rules.filter(filter_type='exclude'):
-            if rule.matches(prefix_str):
-                logger.info(f"Prefix {prefix_str} excluded by rule '{rule.name}'")
-                return False
-        
-        # Check include_only rules
-        include_rules = rules.filter(filter_type='include_only')
-        if include_rules.exists():
-            for rule in include_rules:
-                if rule.matches(prefix_str):
-                    return True
-            # No include_only rules matched
-            logger.info(f"Prefix {prefix_str} does not match any include_only rules")
-            return False
+        from .config_snapshot import get_config_snapshot
         
-        return True  # Passed all checks
+        return get_config_snapshot().should_sync_prefix(prefix_str)
 
 
 class SyncLog(models.Model):
@@ -587,6 +602,9 @@ class SyncLog(models.Model):
     updated_prefixes = models.IntegerField(default=0)
     errors = models.JSONField(default=list, blank=True)
     duration_seconds = models.FloatField(null=True, blank=True)
+    api_cache_hits = models.IntegerField(default=0, help_text='Meraki API requests served from the run cache')
+    api_cache_misses = models.IntegerField(default=0, help_text='Meraki API requests sent to the Dashboard')
+    skipped_unchanged = models.IntegerField(default=0, help_text='Objects skipped because they already match Meraki')
     
     
     progress_logs = models.JSONField(default=list, blank=True, help_text='Live progress log entries')
@@ -618,23 +636,77 @@ class SyncLog(models.Model):
         return reverse('plugins:netbox_meraki:synclog', args=[self.pk])
     
     def add_progress_log(self, message: str, level: str = 'info'):
-        """Add a progress log entry with timestamp"""
+        """Add a progress log entry with timestamp
+        
+        Entries are appended to SyncProgressEntry rows in batches; call
+        flush_progress_logs() when the sync finishes to write the remainder.
+        """
         from django.utils import timezone
-        entry = {
-            'timestamp': timezone.now().isoformat(),
-            'level': level,
-            'message': message
-        }
-        if not self.progress_logs:
-            self.progress_logs = []
-        self.progress_logs.append(entry)
-        self.save(update_fields=['progress_logs'])
+        entry = SyncProgressEntry(sync_log=self, timestamp=timezone.now(), level=level, message=message)
+        with _progress_lock:
+            buffer = self.__dict__.setdefault('_progress_buffer', [])
+            buffer.append(entry)
+            last_flush = self.__dict__.setdefault('_progress_flushed_at', time.monotonic())
+            if len(buffer) >= PROGRESS_FLUSH_SIZE or time.monotonic() - last_flush >= PROGRESS_FLUSH_INTERVAL:
+                self.flush_progress_logs()
+    
+    def flush_progress_logs(self):
+        """Write buffered progress log entries
+        
+        Inside a transaction (a network being synced in auto mode) the entries
+        are handed to the progress writer thread instead, which commits them
+        on its own connection and keeps them if the transaction rolls back.
+        """
+        with _progress_lock:
+            buffer = self.__dict__.get('_progress_buffer')
+            if buffer:
+                entries = list(buffer)
+                buffer.clear()
+                if transaction.get_connection().in_atomic_block:
+                    _progress_writer.put(entries)
+                else:
+                    # Entries queued from a transaction go first, to keep IDs in order
+                    _progress_writer.wait()
+                    SyncProgressEntry.objects.bulk_create(entries)
+            self._progress_flushed_at = time.monotonic()
+    
+    def get_progress_logs(self, after: int = None, limit: int = None) -> list:
+        """Progress log entries as dicts, oldest first
+        
+        Args:
+            after: Only return entries with an ID greater than this cursor
+            limit: Only return the most recent `limit` entries
+        """
+        entries = self.progress_entries.all()
+        if after:
+            entries = entries.filter(pk__gt=after)
+        if limit:
+            entries = reversed(entries.order_by('-pk')[:limit])
+        logs = [entry.to_dict() for entry in entries]
+        if logs or not self.progress_logs or self.progress_entries.exists():
+            return logs
+        
+        # Syncs recorded before progress entries existed kept their log on the
+        # SyncLog; the position in it (from 1) stands in for the entry ID
+        legacy_logs = [dict(log, id=index) for index, log in enumerate(self.progress_logs, 1)]
+        if after:
+            legacy_logs = legacy_logs[after:]
+        return legacy_logs[-limit:] if limit else legacy_logs
+    
+    @property
+    def progress_cursor(self) -> int:
+        """ID of the newest progress log entry, for clients polling with ?after="""
+        last = self.progress_entries.order_by('-pk').values_list('pk', flat=True).first()
+        if last is None and self.progress_logs:
+            return len(self.progress_logs)
+        return last or 0
     
     def update_progress(self, operation: str, percent: int):
         """Update current operation and progress percentage"""
-        self.current_operation = operation
-        self.progress_percent = min(100, max(0, percent))
-        self.save(update_fields=['current_operation', 'progress_percent'])
+        with _progress_lock:
+            self.current_operation = operation
+            self.progress_percent = min(100, max(0, percent))
+            self.save(update_fields=['current_operation', 'progress_percent'])
     
     def request_cancel(self):
         """Request cancellation of this sync"""
@@ -649,6 +721,70 @@ class SyncLog(models.Model):
         return self.cancel_requested
 
 
+class SyncProgressEntry(models.Model):
+    """Append-only progress log entry of a sync"""
+    
+    sync_log = models.ForeignKey(
+        SyncLog,
+        on_delete=models.CASCADE,
+        related_name='progress_entries'
+    )
+    timestamp = models.DateTimeField()
+    level = models.CharField(max_length=10, default='info')
+    message = models.TextField()
+    
+    class Meta:
+        ordering = ['pk']
+        verbose_name = 'Sync Progress Entry'
+        verbose_name_plural = 'Sync Progress Entries'
+    
+    def __str__(self):
+        return f"[{self.level}] {self.message}"
+    
+    def to_dict(self) -> dict:
+        return {
+            'id': self.pk,
+            'timestamp': self.timestamp.isoformat(),
+            'level': self.level,
+            'message': self.message,
+        }
+
+
+class SyncMarker(models.Model):
+    """Last sync run that saw a NetBox object, used to sweep orphaned objects
+    
+    Objects synced (or found unchanged) in an auto sync are stamped with the
+    ID of the run's SyncLog; Meraki-tagged objects in the synced sites that do
+    not carry the current generation are deleted when the run finishes.
+    """
+    
+    content_type = models.ForeignKey(
+        'contenttypes.ContentType',
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveBigIntegerField()
+    generation = models.PositiveBigIntegerField(
+        help_text='ID of the sync log of the last run that saw this object'
+    )
+    
+    class Meta:
+        verbose_name = 'Sync Marker'
+        verbose_name_plural = 'Sync Markers'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['content_type', 'object_id'],
+                name='netbox_meraki_syncmarker_unique_object'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['content_type', 'generation'], name='netbox_meraki_marker_gen_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id} @ {self.generation}"
+
+
 class SyncReview(models.Model):
     """Review session for sync operations"""
     
@@ -704,23 +840,33 @@ class SyncReview(models.Model):
         # 8. SSIDs (need devices)
         item_order = ['site', 'device_type', 'vlan', 'prefix', 'device', 'interface', 'ip_address', 'ssid']
         
-        # Apply items in dependency order
-        for item_type in item_order:
-            approved_items = self.items.filter(status='approved', item_type=item_type).order_by('id')
-            
-            for item in approved_items:
-                try:
-                    service.apply_review_item(item)
-                    item.status = 'applied'
-                    item.save()
-                except Exception as e:
-                    item.status = 'failed'
-                    item.error_message = str(e)
-                    item.save()
-                    # Log but continue with other items
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"Failed to apply {item_type} {item.object_name}: {e}")
+        # Apply items in dependency order, recording status changes in bulk
+        # and inserting tag assignments once at the end
+        with service.lookups.tag_batch():
+            for item_type in item_order:
+                approved_items = self.items.filter(status='approved', item_type=item_type).order_by('id')
+                
+                applied_ids = []
+                failed_items = []
+                for item in approved_items:
+                    try:
+                        # A failed item's writes, cached lookups and tag rows are rolled back
+                        with service.savepoint():
+                            service.apply_review_item(item)
+                        applied_ids.append(item.pk)
+                    except Exception as e:
+                        item.status = 'failed'
+                        item.error_message = str(e)
+                        failed_items.append(item)
+                        # Log but continue with other items
+                        import logging
+                        logger = logging.getLogger(__name__)
+                        logger.error(f"Failed to apply {item_type} {item.object_name}: {e}")
+                
+                if applied_ids:
+                    self.items.filter(pk__in=applied_ids).update(status='applied')
+                if failed_items:
+                    ReviewItem.objects.bulk_update(failed_items, ['status', 'error_message'])
         
         self.status = 'applied'
         self.save()
@@ -0,0 +1,249 @@
+"""
+Batched switch port interface sync
+
+_create_switch_port_interfaces() ran update_or_create() for every port,
+then looked up its VLAN and saved the interface again: 150+ queries for a
+48-port switch. SwitchPortSync loads the device's interfaces in one
+query, diffs them against the Meraki port list and writes only the
+difference with bulk_create()/bulk_update(). Untagged and tagged VLANs are
+resolved from a VID map loaded once per site, and tagged VLAN membership is
+diffed against the existing through-model rows.
+
+Trunk allow-lists are VLANRangeSets. Each distinct allow-list is resolved to
+the site's VLAN IDs once, however many ports share it.
+"""
+import logging
+from functools import reduce
+from operator import or_
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from django.db.models import Q
+from django.utils import timezone
+
+from dcim.models import Device, Interface, Site
+from ipam.models import VLAN
+
+from .vlan_ranges import VLANRangeSet
+
+
+logger = logging.getLogger('netbox_meraki')
+
+INTERFACE_BATCH_SIZE = 500
+
+# Interface fields written from a port (untagged VLAN is handled separately)
+PORT_FIELDS = ('type', 'description', 'enabled', 'mode')
+
+
+class PortSpec:
+    """Desired state of one switch port interface
+    
+    Args:
+        name: Interface name
+        untagged_vid: VID to set as the untagged VLAN (None leaves it as is)
+        tagged_vids: VLANRangeSet of tagged VLANs (None leaves them as they are)
+    """
+    
+    __slots__ = ('name', 'type', 'description', 'enabled', 'mode', 'untagged_vid', 'tagged_vids')
+    
+    def __init__(self, name: str, type: str, description: str, enabled: bool, mode: Optional[str],
+                 untagged_vid: Optional[int] = None, tagged_vids: Optional[VLANRangeSet] = None):
+        self.name = name
+        self.type = type
+        self.description = description
+        self.enabled = enabled
+        self.mode = mode
+        self.untagged_vid = untagged_vid
+        self.tagged_vids = tagged_vids
+
+
+def site_vlans_by_vid(site: Site) -> Dict[int, VLAN]:
+    """VLANs of a site by VID, with one query
+    
+    Resolves like the per-port lookups did: VLANs assigned to the site first
+    (the first in model order, as .first() picked), then VLANs in the site's
+    "<site> VLANs" group for VIDs the site has none of.
+    """
+    group_name = f"{site.name} VLANs"
+    vlans = {}
+    group_vlans = {}
+    for vlan in VLAN.objects.filter(Q(site=site) | Q(group__name=group_name)):
+        if vlan.site_id == site.pk:
+            vlans.setdefault(vlan.vid, vlan)
+        else:
+            group_vlans.setdefault(vlan.vid, vlan)
+    for vid, vlan in group_vlans.items():
+        vlans.setdefault(vid, vlan)
+    return vlans
+
+
+class SiteVLANs:
+    """A site's VLANs by VID, with allow-lists resolved once each
+    
+    Args:
+        vlans_by_vid: The site's VLANs by VID (see site_vlans_by_vid())
+    """
+    
+    def __init__(self, vlans_by_vid: Dict[int, VLAN]):
+        self.by_vid = vlans_by_vid
+        self._vids = VLANRangeSet.from_vids(vlans_by_vid)
+        self._resolved: Dict[VLANRangeSet, FrozenSet[int]] = {}
+    
+    @classmethod
+    def load(cls, site: Site) -> 'SiteVLANs':
+        return cls(site_vlans_by_vid(site))
+    
+    def get(self, vid: Optional[int]) -> Optional[VLAN]:
+        return self.by_vid.get(vid) if vid else None
+    
+    def vlan_ids(self, vids: VLANRangeSet) -> FrozenSet[int]:
+        """IDs of the site's VLANs whose VID is in the set"""
+        vlan_ids = self._resolved.get(vids)
+        if vlan_ids is None:
+            # Intersect with the VIDs that exist instead of walking up to 4094 VIDs
+            vlan_ids = frozenset(self.by_vid[vid].pk for vid in vids & self._vids)
+            self._resolved[vids] = vlan_ids
+        return vlan_ids
+
+
+class SwitchPortSync:
+    """Diff a device's interfaces against its switch ports and apply the result in bulk
+    
+    Args:
+        device: Switch the ports belong to
+        site_vlans: VLANs of the switch's site
+    """
+    
+    def __init__(self, device: Device, site_vlans: SiteVLANs):
+        self.device = device
+        self.site_vlans = site_vlans
+        self.created: List[Interface] = []
+        self.updated: List[Interface] = []
+        self.unchanged = 0
+        self.vlan_rows_added = 0
+        self.vlan_rows_removed = 0
+    
+    def apply(self, specs: Iterable[PortSpec]) -> Dict[str, Interface]:
+        """Create and update the device's interfaces to match the specs
+        
+        If two ports have the same name, the last one wins (as the per-port
+        update_or_create() did).
+        
+        Returns:
+            Interfaces by name, for every spec
+        """
+        specs_by_name = {spec.name: spec for spec in specs}
+        existing = {
+            interface.name: interface
+            for interface in Interface.objects.filter(device=self.device, name__in=specs_by_name)
+        }
+        now = timezone.now()
+        
+        interfaces = {}
+        tagged_vlan_ids: Dict[str, FrozenSet[int]] = {}
+        for name, spec in specs_by_name.items():
+            untagged_vlan = self.site_vlans.get(spec.untagged_vid)
+            interface = existing.get(name)
+            if interface is None:
+                interface = Interface(
+                    device=self.device,
+                    name=name,
+                    type=spec.type,
+                    description=spec.description,
+                    enabled=spec.enabled,
+                    mode=spec.mode,
+                    untagged_vlan=untagged_vlan,
+                )
+                self.created.append(interface)
+            elif self._update(interface, spec, untagged_vlan):
+                interface.last_updated = now
+                self.updated.append(interface)
+            else:
+                self.unchanged += 1
+            interfaces[name] = interface
+            
+            if spec.tagged_vids is not None:
+                vlan_ids = self.site_vlans.vlan_ids(spec.tagged_vids)
+                # Nothing is assigned when none of the VLANs exist at the site
+                if vlan_ids:
+                    tagged_vlan_ids[name] = vlan_ids
+        
+        if self.created:
+            # bulk_create() skips the signal that maintains the device's interface
+            # count; callers refresh it when anything was created
+            Interface.objects.bulk_create(self.created, batch_size=INTERFACE_BATCH_SIZE)
+        if self.updated:
+            Interface.objects.bulk_update(
+                self.updated,
+                fields=[*PORT_FIELDS, 'untagged_vlan', 'last_updated'],
+                batch_size=INTERFACE_BATCH_SIZE,
+            )
+        # Only tagged interfaces may have tagged VLANs (Interface.save() clears
+        # them otherwise, bulk_update() does not)
+        untagged_ids = [interface.pk for interface in existing.values() if interface.mode != 'tagged']
+        if untagged_ids:
+            through = Interface.tagged_vlans.through
+            removed, _ = through.objects.filter(interface_id__in=untagged_ids).delete()
+            self.vlan_rows_removed += removed
+        if tagged_vlan_ids:
+            self._set_tagged_vlans(
+                {interfaces[name].pk: vlan_ids for name, vlan_ids in tagged_vlan_ids.items()},
+                existing_ids={interface.pk for interface in existing.values()},
+            )
+        
+        logger.debug(
+            f"Switch ports on {self.device.name}: {len(self.created)} created, {len(self.updated)} updated, "
+            f"{self.unchanged} unchanged"
+        )
+        return interfaces
+    
+    @staticmethod
+    def _update(interface: Interface, spec: PortSpec, untagged_vlan: Optional[VLAN]) -> bool:
+        """Set changed fields on an existing interface, returning whether any changed"""
+        changed = False
+        for field in PORT_FIELDS:
+            value = getattr(spec, field)
+            # A blank mode is stored as NULL
+            if field == 'mode' and (getattr(interface, field) or None) == (value or None):
+                continue
+            if getattr(interface, field) != value:
+                setattr(interface, field, value)
+                changed = True
+        if untagged_vlan is not None and interface.untagged_vlan_id != untagged_vlan.pk:
+            interface.untagged_vlan = untagged_vlan
+            changed = True
+        return changed
+    
+    def _set_tagged_vlans(self, desired: Dict[int, FrozenSet[int]], existing_ids: Set[int]):
+        """Make the tagged VLANs of each interface exactly the given VLAN IDs
+        
+        Only interfaces whose membership changed get rows inserted or deleted.
+        Interfaces created in this run have no rows, so only existing ones
+        are queried.
+        """
+        through = Interface.tagged_vlans.through
+        current: Dict[int, Set[int]] = {interface_id: set() for interface_id in desired}
+        queried = [interface_id for interface_id in desired if interface_id in existing_ids]
+        if queried:
+            rows = through.objects.filter(interface_id__in=queried).values_list('interface_id', 'vlan_id')
+            for interface_id, vlan_id in rows:
+                current[interface_id].add(vlan_id)
+        
+        new_rows = []
+        stale = []
+        for interface_id, vlan_ids in desired.items():
+            if current[interface_id] == vlan_ids:
+                continue
+            new_rows.extend(
+                through(interface_id=interface_id, vlan_id=vlan_id)
+                for vlan_id in vlan_ids - current[interface_id]
+            )
+            removed = current[interface_id] - vlan_ids
+            if removed:
+                stale.append(Q(interface_id=interface_id, vlan_id__in=removed))
+        
+        if stale:
+            removed, _ = through.objects.filter(reduce(or_, stale)).delete()
+            self.vlan_rows_removed += removed
+        if new_rows:
+            through.objects.bulk_create(new_rows, batch_size=INTERFACE_BATCH_SIZE)
+            self.vlan_rows_added += len(new_rows)
@@ -0,0 +1,181 @@
+"""
+Compiled prefix filter rules
+
+PrefixFilterRule.matches() parsed the candidate and the rule's prefix pattern
+with ip_network() for every rule and every prefix. PrefixFilter compiles the
+enabled rules into one binary radix trie per IP version, keyed on the bits of
+each rule's prefix pattern. Every node carries the prefix lengths its exclude
+and include_only rules accept as a bitmask, so deciding a prefix is a single
+walk down the candidate's network bits, however many rules there are.
+"""
+import logging
+from ipaddress import ip_network
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger('netbox_meraki')
+
+MAX_PREFIX_LENGTH = {4: 32, 6: 128}
+
+
+def allowed_lengths(rule) -> Tuple[int, int]:
+    """Inclusive prefix length range a rule accepts, as PrefixFilterRule.matches() checks it"""
+    min_length = rule.min_prefix_length
+    max_length = rule.max_prefix_length
+    length_filter = rule.prefix_length_filter
+    
+    # An unset (or zero) length never constrains, as in matches()
+    if length_filter == 'exact' and min_length:
+        return min_length, min_length
+    if length_filter == 'greater' and min_length:
+        return min_length + 1, 128
+    if length_filter == 'less' and min_length:
+        return 0, min_length - 1
+    if length_filter == 'range':
+        return min_length or 0, max_length or 128
+    return 0, 128
+
+
+def length_mask(low: int, high: int) -> int:
+    """Bitmask with bit n set for every prefix length n in [low, high]"""
+    if low > high:
+        return 0
+    return ((1 << (high - low + 1)) - 1) << low
+
+
+class _Node:
+    """Trie node; a rule pattern of length d is attached at depth d"""
+    
+    __slots__ = ('children', 'exclude_mask', 'include_mask', 'rules')
+    
+    def __init__(self):
+        self.children = [None, None]
+        self.exclude_mask = 0
+        self.include_mask = 0
+        # (priority order, rule name, filter type, length mask), for log messages
+        self.rules = []
+
+
+class PrefixFilter:
+    """Enabled prefix filter rules compiled into radix tries
+    
+    Args:
+        rules: PrefixFilterRule objects, already in priority order
+    """
+    
+    def __init__(self, rules: Iterable = ()):
+        self._roots = {4: _Node(), 6: _Node()}
+        self.rule_count = 0
+        self.has_include_rules = False
+        
+        for order, rule in enumerate(rules):
+            # A rule with an invalid pattern never matches, but still counts
+            # as a rule (an include_only one still restricts the sync)
+            self.rule_count += 1
+            if rule.filter_type == 'include_only':
+                self.has_include_rules = True
+            elif rule.filter_type != 'exclude':
+                continue
+            try:
+                self._insert(order, rule)
+            except ValueError as e:
+                logger.error(f"Error compiling prefix filter rule {rule.name}: {e}")
+    
+    def __len__(self) -> int:
+        return self.rule_count
+    
+    def _insert(self, order: int, rule):
+        mask = length_mask(*allowed_lengths(rule))
+        
+        if rule.prefix_pattern:
+            pattern = ip_network(rule.prefix_pattern, strict=False)
+            targets = [(pattern.version, int(pattern.network_address), pattern.prefixlen)]
+        else:
+            # A blank pattern matches every prefix of either version
+            targets = [(4, 0, 0), (6, 0, 0)]
+        
+        for version, address, prefixlen in targets:
+            max_bits = MAX_PREFIX_LENGTH[version]
+            node = self._roots[version]
+            for depth in range(prefixlen):
+                bit = (address >> (max_bits - 1 - depth)) & 1
+                if node.children[bit] is None:
+                    node.children[bit] = _Node()
+                node = node.children[bit]
+            if rule.filter_type == 'exclude':
+                node.exclude_mask |= mask
+            else:
+                node.include_mask |= mask
+            node.rules.append((order, rule.name, rule.filter_type, mask))
+    
+    def _walk(self, network) -> Tuple[int, int, List[_Node]]:
+        """OR the masks of every pattern containing the network; also return the nodes passed"""
+        max_bits = MAX_PREFIX_LENGTH[network.version]
+        address = int(network.network_address)
+        node = self._roots[network.version]
+        exclude_mask = include_mask = 0
+        nodes = []
+        depth = 0
+        while node is not None:
+            exclude_mask |= node.exclude_mask
+            include_mask |= node.include_mask
+            nodes.append(node)
+            # Patterns longer than the candidate cannot contain it
+            if depth == network.prefixlen:
+                break
+            node = node.children[(address >> (max_bits - 1 - depth)) & 1]
+            depth += 1
+        return exclude_mask, include_mask, nodes
+    
+    def should_sync_prefix(self, prefix_str: str) -> bool:
+        """Determine if a prefix should be synced based on the compiled rules"""
+        if not self.rule_count:
+            return True  # No rules = sync all prefixes
+        
+        try:
+            network = ip_network(prefix_str, strict=False)
+        except ValueError as e:
+            logger.error(f"Error checking prefix filter rules for {prefix_str}: {e}")
+            network = None
+        
+        if network is not None:
+            exclude_mask, include_mask, nodes = self._walk(network)
+            bit = 1 << network.prefixlen
+            
+            # Check exclude rules first
+            if exclude_mask & bit:
+                logger.info(f"Prefix {prefix_str} excluded by rule '{self._first_rule(nodes, 'exclude', bit)}'")
+                return False
+            if include_mask & bit:
+                return True
+        
+        # Check include_only rules
+        if self.has_include_rules:
+            # No include_only rules matched
+            logger.info(f"Prefix {prefix_str} does not match any include_only rules")
+            return False
+        
+        return True  # Passed all checks
+    
+    def should_sync_prefixes(self, prefixes: Iterable[str]) -> Dict[str, bool]:
+        """Evaluate a batch of prefixes
+        
+        Returns:
+            Dict of prefix string to whether it should be synced
+        """
+        results = {}
+        for prefix_str in prefixes:
+            if prefix_str not in results:
+                results[prefix_str] = self.should_sync_prefix(prefix_str)
+        return results
+    
+    @staticmethod
+    def _first_rule(nodes: List[_Node], filter_type: str, bit: int) -> Optional[str]:
+        """Name of the highest-priority matching rule of a type"""
+        matched = [
+            (order, name)
+            for node in nodes
+            for order, name, rule_type, mask in node.rules
+            if rule_type == filter_type and mask & bit
+        ]
+        return min(matched)[1] if matched else None
@@ -0,0 +1,70 @@
+"""
+Compact records for Meraki API data held in memory during a sync
+
+The sync keeps device and device status data for a whole organization while
+its networks are processed. Plain response dicts carry every field the API
+returns; these records keep only the fields the sync reads, in __slots__
+objects. They support the read/write dict operations the sync uses
+(get, [], in) so they can stand in for the response dicts.
+"""
+from typing import Dict, Iterator, Tuple
+
+
+class Record:
+    """Base for __slots__ records projected from Meraki API dicts
+    
+    Subclasses list the API keys they keep in __slots__. A key absent from the
+    API response is left unset, so `in` and get() behave as they do on a dict.
+    """
+    
+    __slots__ = ()
+    
+    @classmethod
+    def from_api(cls, data: Dict) -> 'Record':
+        """Project an API response dict onto the record's fields"""
+        record = cls()
+        for key in cls.__slots__:
+            if key in data:
+                setattr(record, key, data[key])
+        return record
+    
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key: str, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}") from None
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__ and hasattr(self, key)
+    
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+    
+    def items(self) -> Iterator[Tuple[str, object]]:
+        for key in self.__slots__:
+            if hasattr(self, key):
+                yield key, getattr(self, key)
+    
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+
+class DeviceRecord(Record):
+    """Device from organizations/{orgId}/devices, with status/firmware merged in by the sync"""
+    
+    __slots__ = (
+        'serial', 'name', 'model', 'mac', 'lanIp', 'wan1Ip', 'wan2Ip', 'networkId',
+        'productType', 'address', 'notes', 'tags', 'firmware', 'status', 'publicIp',
+    )
+
+
+class DeviceStatusRecord(Record):
+    """Device status from organizations/{orgId}/devices/statuses"""
+    
+    __slots__ = ('serial', 'status', 'publicIp', 'firmware')
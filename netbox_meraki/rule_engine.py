@@ -0,0 +1,125 @@
+"""
+Compiled site name rules
+
+SiteNameRule.apply() matched the uncompiled pattern and filled the template
+with one str.replace() per group for every rule and every network.
+SiteRuleEngine compiles each enabled rule once (regex plus a template parsed
+into literal and placeholder parts), evaluates them in priority order and
+memoizes the result per network name.
+"""
+import logging
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger('netbox_meraki')
+
+# Template placeholders: {name}, {0}, {network_name}
+PLACEHOLDER_RE = re.compile(r'\{([^{}]*)\}')
+
+
+class CompiledSiteRule:
+    """A SiteNameRule with its regex compiled and its template parsed
+    
+    Placeholders resolve as SiteNameRule.apply() always did: a named group
+    with a non-empty value, then a numbered group ({0} is the first group,
+    empty when it did not participate), then {network_name}. Placeholders that
+    resolve to nothing are kept as written.
+    """
+    
+    __slots__ = ('name', 'pattern', 'parts')
+    
+    def __init__(self, name: str, regex_pattern: str, site_name_template: str):
+        self.name = name
+        self.pattern = re.compile(regex_pattern)
+        # Literal text and placeholder keys alternate: [text, key, text, key, ..., text]
+        self.parts = tuple(PLACEHOLDER_RE.split(site_name_template))
+    
+    @classmethod
+    def from_rule(cls, rule) -> 'CompiledSiteRule':
+        return cls(rule.name, rule.regex_pattern, rule.site_name_template)
+    
+    def _resolve(self, key: str, match: re.Match, network_name: str) -> str:
+        value = match.groupdict().get(key)
+        if value:
+            return value
+        if key.isdigit() and int(key) < len(match.groups()):
+            return match.group(int(key) + 1) or ''
+        if key == 'network_name':
+            return network_name
+        return f'{{{key}}}'
+    
+    def apply(self, network_name: str) -> Optional[str]:
+        """Site name for a network, or None if the pattern does not match"""
+        match = self.pattern.match(network_name)
+        if not match:
+            return None
+        
+        parts = self.parts
+        result = [parts[0]]
+        for i in range(1, len(parts), 2):
+            result.append(self._resolve(parts[i], match, network_name))
+            result.append(parts[i + 1])
+        return ''.join(result).strip()
+
+
+class SiteRuleEngine:
+    """Enabled site name rules compiled in priority order, with a memo table
+    
+    Args:
+        rules: SiteNameRule objects (or anything with name, regex_pattern and
+            site_name_template), already in priority order
+    """
+    
+    def __init__(self, rules: Iterable = ()):
+        self.rules: List[CompiledSiteRule] = []
+        for rule in rules:
+            try:
+                self.rules.append(CompiledSiteRule.from_rule(rule))
+            except re.error as e:
+                logger.error(f"Error compiling site name rule {rule.name}: {e}")
+        
+        # network name -> (site name, rule name); (None, None) when no rule applies
+        self._memo: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._lock = threading.Lock()
+        self.memo_hits = 0
+        self.memo_misses = 0
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    def _evaluate(self, network_name: str) -> Tuple[Optional[str], Optional[str]]:
+        for rule in self.rules:
+            try:
+                transformed = rule.apply(network_name)
+            except Exception as e:
+                logger.error(f"Error applying site name rule {rule.name}: {e}")
+                continue
+            # A rule only applies if it changes the name
+            if transformed is not None and transformed != network_name:
+                return transformed, rule.name
+        return None, None
+    
+    def match(self, network_name: str) -> Tuple[Optional[str], Optional[str]]:
+        """Transformed site name and the rule that produced it
+        
+        Returns:
+            (site name, rule name), or (None, None) if no rule changes the name
+        """
+        result = self._memo.get(network_name)
+        if result is not None:
+            self.memo_hits += 1
+            return result
+        
+        result = self._evaluate(network_name)
+        with self._lock:
+            self._memo[network_name] = result
+            self.memo_misses += 1
+        return result
+    
+    def clear_memo(self):
+        with self._lock:
+            self._memo.clear()
+            self.memo_hits = 0
+            self.memo_misses = 0
@@ -0,0 +1,19 @@
+"""
+Signal handlers for the Meraki plugin
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .config_snapshot import invalidate_config_snapshot
+from .models import PluginSettings, SiteNameRule, PrefixFilterRule
+
+
+@receiver(post_save, sender=PluginSettings)
+@receiver(post_delete, sender=PluginSettings)
+@receiver(post_save, sender=SiteNameRule)
+@receiver(post_delete, sender=SiteNameRule)
+@receiver(post_save, sender=PrefixFilterRule)
+@receiver(post_delete, sender=PrefixFilterRule)
+def invalidate_config_snapshot_on_change(sender, **kwargs):
+    """Drop the cached settings/rules snapshot when settings or rules change"""
+    invalidate_config_snapshot()
@@ -0,0 +1,210 @@
+"""
+In-memory index of existing NetBox objects for a sync run
+
+Staging and applying each Meraki object used to look up its NetBox
+counterpart with its own query (site by name, device by serial, VLAN by
+group and VID, ...). NetBoxStateIndex loads those objects once at the start of
+a run, keyed by their natural keys, and is kept current as the sync writes.
+Until load() is called every lookup falls through to a database query, so
+code paths outside a sync run (e.g. applying review items from the UI) behave
+as before.
+
+Objects added while a network transaction is open are only visible to the
+thread that added them until the transaction commits (see transactions.py).
+"""
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+from dcim.models import Site, Device, Interface
+from ipam.models import VLAN, VLANGroup, Prefix
+
+from .transactions import TransactionOverlay
+
+
+logger = logging.getLogger('netbox_meraki')
+
+
+class NetBoxStateIndex(TransactionOverlay):
+    """Natural-key indexes of Sites, Devices, VLAN groups, VLANs, Prefixes and Interfaces"""
+    
+    def __init__(self):
+        self.loaded = False
+        self._lock = threading.RLock()
+        self.sites: Dict[str, Site] = {}
+        self.devices: Dict[str, Device] = {}
+        self.devices_by_name: Dict[Tuple[int, str], Device] = {}
+        self.vlan_groups: Dict[str, VLANGroup] = {}
+        self.vlans: Dict[Tuple[int, int], VLAN] = {}
+        self.prefixes: Dict[str, Prefix] = {}
+        self.interfaces: Dict[Tuple[int, str], Interface] = {}
+        # Devices whose interfaces are in self.interfaces (device ID -> True)
+        self._interface_devices: Dict[int, bool] = {}
+    
+    def load(self, manufacturer_name: Optional[str] = None) -> Dict[str, int]:
+        """Load existing objects with one query per model (plus one per prefetched tag relation)
+        
+        Args:
+            manufacturer_name: Only interfaces of this manufacturer's devices are
+                preloaded; interfaces of other devices are loaded per device on demand
+        
+        Returns:
+            Number of objects indexed per model
+        """
+        with self._lock:
+            self.sites = {site.name: site for site in Site.objects.prefetch_related('tags')}
+            
+            self.devices = {}
+            self.devices_by_name = {}
+            for device in Device.objects.select_related('device_type__manufacturer', 'role', 'site').prefetch_related('tags'):
+                self._index_device(device)
+            
+            self.vlan_groups = {group.name: group for group in VLANGroup.objects.all()}
+            
+            # Querysets are in model order, keep the first match like .first() did
+            self.vlans = {}
+            for vlan in VLAN.objects.filter(group__isnull=False).select_related('site').prefetch_related('tags'):
+                self.vlans.setdefault((vlan.group_id, vlan.vid), vlan)
+            
+            self.prefixes = {}
+            for prefix in Prefix.objects.prefetch_related('tags'):
+                self.prefixes.setdefault(str(prefix.prefix), prefix)
+            
+            self.interfaces = {}
+            self._interface_devices = {}
+            if manufacturer_name:
+                device_ids = {
+                    device.id for device in self.devices.values()
+                    if device.device_type.manufacturer.name == manufacturer_name
+                }
+                for interface in Interface.objects.filter(device_id__in=device_ids):
+                    self.interfaces[(interface.device_id, interface.name)] = interface
+                self._interface_devices = dict.fromkeys(device_ids, True)
+            
+            self.loaded = True
+            return {
+                'sites': len(self.sites),
+                'devices': len(self.devices),
+                'vlan_groups': len(self.vlan_groups),
+                'vlans': len(self.vlans),
+                'prefixes': len(self.prefixes),
+                'interfaces': len(self.interfaces),
+            }
+    
+    # Sites
+    
+    def get_site(self, name: str) -> Optional[Site]:
+        if not self.loaded:
+            return Site.objects.filter(name=name).first()
+        return self._cache_get('sites', name)
+    
+    def add_site(self, site: Site):
+        if self.loaded:
+            self._cache_put('sites', site.name, site)
+    
+    # Devices
+    
+    def _index_device(self, device: Device):
+        """Index a device while loading (the first device with a name wins, like .first())"""
+        if device.serial:
+            self.devices[device.serial] = device
+        if device.site_id and device.name:
+            self.devices_by_name.setdefault((device.site_id, device.name), device)
+    
+    def get_device(self, serial: str) -> Optional[Device]:
+        if not self.loaded:
+            return Device.objects.filter(serial=serial).first()
+        return self._cache_get('devices', serial)
+    
+    def get_device_by_name(self, name: str, site: Site, exclude_serial: Optional[str] = None) -> Optional[Device]:
+        """Find another device with this name at the site (name conflicts)"""
+        if not self.loaded:
+            devices = Device.objects.filter(name=name, site=site)
+            if exclude_serial is not None:
+                devices = devices.exclude(serial=exclude_serial)
+            return devices.first()
+        
+        device = self._cache_get('devices_by_name', (site.id, name))
+        # Entries go stale when a device is renamed or moved
+        if device is None or device.name != name or device.site_id != site.id:
+            return None
+        if exclude_serial is not None and device.serial == exclude_serial:
+            return None
+        return device
+    
+    def add_device(self, device: Device, created: bool = False):
+        """Index a saved device
+        
+        Callers save copies rather than changing indexed instances, which are
+        shared by all threads; the copy replaces the indexed one, and the name
+        it had before a rename or move is freed.
+        """
+        if self.loaded:
+            if device.serial:
+                previous = self._cache_get('devices', device.serial)
+                if previous is not None and (previous.site_id, previous.name) != (device.site_id, device.name):
+                    old_key = (previous.site_id, previous.name)
+                    if self._cache_get('devices_by_name', old_key) is previous:
+                        self._cache_put('devices_by_name', old_key, None)
+                self._cache_put('devices', device.serial, device)
+            self._cache_put('devices_by_name', (device.site_id, device.name), device)
+            if created:
+                # A new device has no interfaces yet, nothing to load
+                self._cache_put('_interface_devices', device.id, True)
+    
+    # VLANs
+    
+    def get_vlan_group(self, name: str) -> Optional[VLANGroup]:
+        if not self.loaded:
+            return VLANGroup.objects.filter(name=name).first()
+        return self._cache_get('vlan_groups', name)
+    
+    def add_vlan_group(self, group: VLANGroup):
+        if self.loaded:
+            self._cache_put('vlan_groups', group.name, group)
+    
+    def get_vlan(self, group: VLANGroup, vid: int) -> Optional[VLAN]:
+        if not self.loaded:
+            return VLAN.objects.filter(vid=vid, group=group).first()
+        return self._cache_get('vlans', (group.id, vid))
+    
+    def add_vlan(self, vlan: VLAN):
+        if self.loaded and vlan.group_id:
+            self._cache_put('vlans', (vlan.group_id, vlan.vid), vlan)
+    
+    # Prefixes
+    
+    def get_prefix(self, prefix: str) -> Optional[Prefix]:
+        if not self.loaded:
+            return Prefix.objects.filter(prefix=prefix).first()
+        return self._cache_get('prefixes', prefix)
+    
+    def add_prefix(self, prefix: Prefix):
+        if self.loaded:
+            self._cache_put('prefixes', str(prefix.prefix), prefix)
+    
+    # Interfaces
+    
+    def get_interface(self, device: Device, name: str) -> Optional[Interface]:
+        if not self.loaded:
+            return Interface.objects.filter(device=device, name=name).first()
+        
+        if not self._cache_get('_interface_devices', device.id):
+            for interface in Interface.objects.filter(device=device):
+                self._cache_put('interfaces', (interface.device_id, interface.name), interface)
+            self._cache_put('_interface_devices', device.id, True)
+        return self._cache_get('interfaces', (device.id, name))
+    
+    def add_interface(self, interface: Interface):
+        if self.loaded:
+            self._cache_put('interfaces', (interface.device_id, interface.name), interface)
+    
+    def get_or_create_interface(self, device: Device, name: str, defaults: Optional[Dict] = None) -> Tuple[Interface, bool]:
+        """Interface.objects.get_or_create() served from the index"""
+        interface = self.get_interface(device, name)
+        if interface is not None:
+            return interface, False
+        
+        interface, created = Interface.objects.get_or_create(device=device, name=name, defaults=defaults or {})
+        self.add_interface(interface)
+        return interface, created
@@ -1,28 +1,100 @@
+import asyncio
+import copy
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from ipaddress import ip_network
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Exists, OuterRef, Subquery
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 
-from dcim.models import Site, Device, DeviceType, DeviceRole, Manufacturer, Interface
+from dcim.models import Site, Device, Interface
 from ipam.models import VLAN, VLANGroup, Prefix, IPAddress
 from wireless.models import WirelessLAN, WirelessLANGroup
 from extras.models import Tag, CustomField
 
+from .async_meraki_client import aiohttp_available, prefetch_network_data
+from .config_snapshot import load_config_snapshot
+from .lookups import LookupResolver, make_slug
 from .meraki_client import MerakiAPIClient
-from .models import SyncLog, PluginSettings, SiteNameRule, PrefixFilterRule, SyncReview, ReviewItem
+from .records import DeviceRecord, DeviceStatusRecord
+from .port_sync import PortSpec, SiteVLANs, SwitchPortSync
+from .state_index import NetBoxStateIndex
+from .models import SyncLog, PluginSettings, SyncReview, ReviewItem, SyncMarker
+from .transactions import DEFAULT_TRANSACTION_BATCH_SIZE, NetworkTransaction, PendingKeys, savepoint
+from .vlan_ranges import VLANRangeSet
 
 
 logger = logging.getLogger('netbox_meraki')
 
+# Review items are buffered per network and inserted in batches of this size
+REVIEW_ITEM_BATCH_SIZE = 500
+
+# Sync markers are written in batches of this size; orphaned objects are
+# deleted in chunks of CLEANUP_BATCH_SIZE so no delete holds locks for long
+SYNC_MARKER_BATCH_SIZE = 1000
+CLEANUP_BATCH_SIZE = 500
+
+# Models stamped with sync markers, by synced object type
+MARKED_MODELS = {
+    'sites': Site,
+    'devices': Device,
+    'vlans': VLAN,
+    'prefixes': Prefix,
+}
+
+# NetBox interface names for MX uplinks; staging identifiers and descriptions
+# derive from them ('{serial}-wan', 'Meraki MX WAN Interface'), so wan1 keeps
+# the names used before WAN2 was synced
+WAN_INTERFACE_NAMES = {
+    'wan1': 'WAN',
+    'wan2': 'WAN2',
+}
+
+
+class NetworkCount:
+    """Number of networks to sync in an organization, counted as their pages stream in
+    
+    Exact once the last page has been fetched; until then it is the count so
+    far and prints with a '+'.
+    
+    Args:
+        network_ids: Only count these networks (None = all)
+    """
+    
+    def __init__(self, network_ids: Optional[List[str]] = None):
+        self.network_ids = set(network_ids) if network_ids else None
+        self.received = 0
+        self.complete = False
+    
+    def page(self, networks: List[Dict], has_more: bool):
+        """on_page callback for MerakiAPIClient.iter_networks()"""
+        if self.network_ids is not None:
+            networks = [n for n in networks if n.get('id') in self.network_ids]
+        self.received += len(networks)
+        self.complete = not has_more
+    
+    def __str__(self) -> str:
+        return str(self.received) if self.complete else f"{self.received}+"
+
 
 class MerakiSyncService:
     
     def __init__(self, api_key: Optional[str] = None, sync_mode: Optional[str] = None):
-        self.client = MerakiAPIClient(api_key=api_key)
+        # Settings, site name rules and prefix filters, loaded once for this run
+        self.config = load_config_snapshot()
+        self.client = MerakiAPIClient(
+            api_key=api_key,
+            requests_per_second=self.config.settings.api_requests_per_second,
+            enable_throttling=self.config.settings.enable_api_throttling,
+        )
         self.sync_log = None
         self.sync_mode = sync_mode
         self.review = None
@@ -39,14 +111,44 @@ class MerakiSyncService:
             'deleted_vlans': 0,
             'deleted_prefixes': 0,
             'updated_prefixes': 0,
+            # Objects that already matched Meraki and were neither staged nor saved
+            'unchanged_sites': 0,
+            'unchanged_devices': 0,
+            'unchanged_vlans': 0,
+            'unchanged_prefixes': 0,
         }
         self.errors = []
-        self.synced_object_ids = {
-            'sites': set(),
-            'devices': set(),
-            'vlans': set(),
-            'prefixes': set(),
-        }
+        # (object type, ID) of synced objects not yet stamped with a sync marker
+        self._pending_markers = PendingKeys()
+        # Sites of networks that failed and were (partly) rolled back; not swept
+        self._failed_site_ids = set()
+        # Guards stats/errors/pending markers when networks sync in parallel
+        self._lock = threading.RLock()
+        self._cancel_event = threading.Event()
+        self.max_workers = 1
+        # Switch port configs for the organization being synced, keyed by serial
+        # (None = not prefetched, fall back to per-switch lookups)
+        self._switch_ports_by_serial = None
+        # Firmware shortName per device serial, resolved once per organization for the run
+        self._firmware_by_serial = {}
+        self._firmware_cache = {}
+        # MX uplink IPs for the organization being synced, keyed by serial
+        # (None = not prefetched, fall back to wan1Ip/wan2Ip on the device record)
+        self._uplinks_by_serial = None
+        # Fetch per-network VLANs/SSIDs concurrently with the asyncio client before syncing
+        plugin_config = settings.PLUGINS_CONFIG.get('netbox_meraki', {})
+        self.async_prefetch = bool(plugin_config.get('async_prefetch', False))
+        self.async_max_concurrency = plugin_config.get('async_max_concurrency')
+        # Objects applied per commit inside a network's transaction (0 = one commit per network)
+        self.transaction_batch_size = plugin_config.get('transaction_batch_size', DEFAULT_TRANSACTION_BATCH_SIZE)
+        # Existing NetBox objects by natural key, loaded at the start of sync_all
+        self.state = NetBoxStateIndex()
+        # Tags, manufacturers, device types and roles resolved during the run
+        self.lookups = LookupResolver()
+        # Per-thread buffer of review items staged for the network being synced
+        self._staging = threading.local()
+        # Per-thread NetworkTransaction of the network being synced (auto mode)
+        self._tx = threading.local()
         self._ensure_custom_fields()
     
     def _ensure_custom_fields(self):
@@ -93,6 +195,133 @@ class MerakiSyncService:
         elif device_ct not in mac_field.object_types.all():
             mac_field.object_types.add(device_ct)
     
+    def _increment_stat(self, key: str, amount: int = 1):
+        """Thread-safe increment of a sync statistic"""
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+    
+    def _record_error(self, error_msg: str):
+        """Thread-safe append to the sync error list"""
+        with self._lock:
+            self.errors.append(error_msg)
+    
+    def _track_synced(self, object_type: str, object_id: int):
+        """Thread-safe record of an object synced in this run (protects it from cleanup)
+        
+        Only auto syncs clean up, so only they stamp sync markers. Markers
+        queued inside a network transaction or savepoint are dropped if it
+        rolls back, and are only written outside transactions.
+        """
+        if self.sync_mode != 'auto' or self.sync_log is None:
+            return
+        self._pending_markers.add((object_type, object_id))
+        if object_type == 'sites' and getattr(self._tx, 'current', None) is not None:
+            self._tx.site_ids.add(object_id)
+        if len(self._pending_markers) >= SYNC_MARKER_BATCH_SIZE and not connection.in_atomic_block:
+            self._flush_sync_markers()
+    
+    def _flush_sync_markers(self):
+        """Stamp all pending objects with sync markers"""
+        self._write_sync_markers(self._pending_markers.take())
+    
+    def _write_sync_markers(self, pending):
+        """Stamp objects with this run's generation (the sync log ID)"""
+        if not pending:
+            return
+        
+        markers = [
+            SyncMarker(
+                content_type=ContentType.objects.get_for_model(MARKED_MODELS[object_type]),
+                object_id=object_id,
+                generation=self.sync_log.pk,
+            )
+            for object_type, object_id in pending
+        ]
+        SyncMarker.objects.bulk_create(
+            markers,
+            batch_size=SYNC_MARKER_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['content_type', 'object_id'],
+            update_fields=['generation'],
+        )
+    
+    def _skip_unchanged(self, object_type: str, obj):
+        """Count an object that already matches Meraki and protect it from cleanup"""
+        self._increment_stat(f'unchanged_{object_type}')
+        self._track_synced(object_type, obj.id)
+    
+    def _has_tags(self, obj, item_type: str, plugin_settings: PluginSettings) -> bool:
+        """Whether the object already carries every tag configured for its type
+        
+        Objects written earlier in the run (which have no prefetched tags) are
+        answered from the tag rows the lookup resolver assigned; objects from
+        the state index have their tags prefetched.
+        """
+        tag_names = plugin_settings.get_tags_for_object_type(item_type)
+        if not tag_names:
+            return True
+        if self.lookups.has_tags(obj, tag_names):
+            return True
+        return set(tag_names) <= {tag.name for tag in obj.tags.all()}
+    
+    def _is_unchanged(self, item_type: str, obj, data: Dict, plugin_settings: PluginSettings) -> bool:
+        """Compare proposed data with an existing object field by field
+        
+        Checks exactly the fields apply_review_item would write, so an unchanged
+        object can skip staging and saving without changing the result.
+        """
+        if item_type == 'site':
+            if (obj.slug, obj.description, obj.comments) != (
+                data['slug'], data.get('description', ''), data.get('comments', '')
+            ):
+                return False
+        
+        elif item_type == 'device':
+            custom_fields = data.get('custom_field_data') or {}
+            if (
+                obj.name != data['name']
+                or obj.site is None or obj.site.name != data['site']
+                or obj.device_type.model != data['model']
+                or obj.device_type.manufacturer.name != data.get('manufacturer', 'Cisco Meraki')
+                or obj.role.name != data['role']
+                or obj.status != data.get('status', 'active')
+                or obj.comments != data.get('comments', '')
+                or any(obj.custom_field_data.get(key) != value for key, value in custom_fields.items())
+            ):
+                return False
+        
+        elif item_type == 'vlan':
+            if (
+                obj.name != data['name']
+                or obj.site is None or obj.site.name != data['site']
+                or obj.status != 'active'
+                or obj.description != data.get('description', '')
+            ):
+                return False
+        
+        elif item_type == 'prefix':
+            site = self.state.get_site(data['site'])
+            if site is None or obj.status != 'active' or obj.description != data.get('description', ''):
+                return False
+            if hasattr(obj, 'scope_id'):
+                if obj.scope_id != site.id or obj.scope_type_id != ContentType.objects.get_for_model(Site).id:
+                    return False
+            elif obj.site_id != site.id:
+                return False
+            
+            vlan = None
+            if data.get('vlan') and 'VLAN' in data['vlan']:
+                vlan_group = self.state.get_vlan_group(f"{site.name} VLANs")
+                if vlan_group:
+                    vlan = self.state.get_vlan(vlan_group, int(data['vlan'].split()[-1]))
+            if obj.vlan_id != (vlan.id if vlan else None):
+                return False
+        
+        else:
+            return False
+        
+        return self._has_tags(obj, item_type, plugin_settings)
+    
     def _cleanup_old_review_items(self):
         """Clean up old review items and completed reviews before starting new sync"""
         from datetime import timedelta
@@ -153,9 +382,17 @@ class MerakiSyncService:
         
         self._cleanup_old_review_items()
         
+        plugin_settings = self.config.settings
+        
         # Set default sync mode if not provided
         if not self.sync_mode:
-            self.sync_mode = PluginSettings.get_settings().sync_mode
+            self.sync_mode = plugin_settings.sync_mode
+        
+        # Networks are synced by a worker pool when multithreading is enabled
+        if plugin_settings.enable_multithreading:
+            self.max_workers = max(1, plugin_settings.max_worker_threads or 1)
+        else:
+            self.max_workers = 1
         
         # Determine status based on sync mode
         if self.sync_mode == 'dry_run':
@@ -178,6 +415,12 @@ class MerakiSyncService:
             status='pending' if self.sync_mode in ['review', 'dry_run'] else 'approved'
         )
         
+        # Identical Meraki GETs within this run are served from memory
+        self.client.start_run_cache()
+        # One pooled connection per worker plus the page prefetch thread
+        self.client.ensure_pool_size(self.max_workers + 1)
+        self.client.reset_connection_stats()
+        
         try:
             logger.info("Starting Meraki synchronization")
             self.sync_log.add_progress_log("Starting Meraki synchronization", "info")
@@ -189,6 +432,13 @@ class MerakiSyncService:
                 defaults={'description': 'Synced from Cisco Meraki Dashboard'}
             )
             
+            # Index existing NetBox objects once instead of querying per Meraki object
+            self.sync_log.add_progress_log("Loading existing NetBox objects", "info")
+            state_counts = self.state.load(
+                manufacturer_name=settings.PLUGINS_CONFIG.get('netbox_meraki', {}).get('default_manufacturer', 'Cisco Meraki')
+            )
+            logger.info("Indexed existing NetBox objects: " + ", ".join(f"{count} {name}" for name, count in state_counts.items()))
+            
             # Get all organizations or filter to specific one
             self.sync_log.add_progress_log("Fetching organizations from Meraki Dashboard", "info")
             if organization_id:
@@ -285,12 +535,24 @@ class MerakiSyncService:
             self.sync_log.deleted_vlans = self.stats.get('deleted_vlans', 0)
             self.sync_log.deleted_prefixes = self.stats.get('deleted_prefixes', 0)
             self.sync_log.updated_prefixes = self.stats.get('updated_prefixes', 0)
+            self.sync_log.skipped_unchanged = sum(
+                self.stats.get(f'unchanged_{object_type}', 0)
+                for object_type in ('sites', 'devices', 'vlans', 'prefixes')
+            )
             self.sync_log.errors = self.errors
             self.sync_log.duration_seconds = duration
+            self._record_cache_stats()
             
             # Log sites stat for debugging (field may not exist in DB yet)
             if self.stats.get('sites', 0) > 0:
                 logger.info(f"Synced {self.stats['sites']} sites")
+            if self.sync_log.skipped_unchanged:
+                message = "Skipped unchanged objects: " + ", ".join(
+                    f"{self.stats.get(f'unchanged_{object_type}', 0)} {object_type}"
+                    for object_type in ('sites', 'devices', 'vlans', 'prefixes')
+                )
+                logger.info(message)
+                self.sync_log.add_progress_log(message, "info")
             
             self.sync_log.save()
             
@@ -299,6 +561,8 @@ class MerakiSyncService:
                 self.review.items_total = self.review.items.count()
                 self.review.save()
             
+            self._log_api_stats()
+            
             logger.info(f"Synchronization completed in {duration:.2f} seconds ({self.sync_mode} mode)")
             
         except Exception as e:
@@ -306,11 +570,54 @@ class MerakiSyncService:
             self.sync_log.status = 'failed'
             self.sync_log.message = f"Synchronization failed: {str(e)}"
             self.sync_log.errors = self.errors + [str(e)]
+            self._record_cache_stats()
             self.sync_log.save()
             raise
+        finally:
+            self.client.end_run_cache()
+            self.state = NetBoxStateIndex()
+            self.lookups = LookupResolver()
+            self._pending_markers = PendingKeys()
+            self._failed_site_ids = set()
+            self.sync_log.flush_progress_logs()
         
         return self.sync_log
     
+    def _record_cache_stats(self):
+        """Copy the run's API response cache hit/miss counts to the SyncLog
+        
+        The cache itself is dropped in sync_all()'s finally block.
+        """
+        cache_stats = self.client.get_cache_stats()
+        self.sync_log.api_cache_hits = cache_stats['hits']
+        self.sync_log.api_cache_misses = cache_stats['misses']
+        
+        total = cache_stats['hits'] + cache_stats['misses']
+        if total:
+            logger.info(
+                f"API response cache: {cache_stats['hits']} hit(s), {cache_stats['misses']} miss(es) "
+                f"({cache_stats['hits'] / total:.0%} served from cache)"
+            )
+    
+    def _log_api_stats(self):
+        """Log page and byte counts for each paginated Meraki endpoint, and connection reuse"""
+        for endpoint, stats in sorted(self.client.get_pagination_stats().items()):
+            message = (
+                f"API {endpoint}: {stats['pages']} page(s), {stats['items']} item(s), "
+                f"{stats['bytes'] / 1024:.1f} KiB"
+            )
+            logger.info(message)
+            self.sync_log.add_progress_log(message, "info")
+        
+        connection_stats = self.client.get_connection_stats()
+        if connection_stats['requests']:
+            message = (
+                f"API connections: {connection_stats['requests']} request(s) over "
+                f"{connection_stats['connections']} connection(s), {connection_stats['reused']} reused"
+            )
+            logger.info(message)
+            self.sync_log.add_progress_log(message, "info")
+    
     def _sync_organization(self, org: Dict, meraki_tag: Tag, network_ids: Optional[List[str]] = None):
         """Sync a single organization
         
@@ -327,30 +634,124 @@ class MerakiSyncService:
         # Fetch device statuses for the entire organization (includes firmware)
         try:
             self.sync_log.add_progress_log(f"Fetching device statuses from organization: {org_name}", "info")
-            device_statuses = self.client.get_device_statuses(org_id)
-            # Create lookup dictionary by serial number
-            device_status_map = {status['serial']: status for status in device_statuses}
-            logger.info(f"Fetched status for {len(device_statuses)} devices in {org_name}")
+            # Create lookup dictionary by serial number, keeping only the fields
+            # the sync reads while the pages stream in
+            device_status_map = {
+                status['serial']: DeviceStatusRecord.from_api(status)
+                for status in self.client.iter_device_statuses(org_id)
+                if status.get('serial')
+            }
+            logger.info(f"Fetched status for {len(device_status_map)} devices in {org_name}")
         except Exception as e:
             logger.warning(f"Could not fetch device statuses for {org_name}: {e}")
             device_status_map = {}
         
-        # Get networks for this organization
+        # Fetch every device in the organization once and partition by network,
+        # instead of listing devices separately for each network
+        devices_by_network = None
+        try:
+            self.sync_log.add_progress_log(f"Fetching devices from organization: {org_name}", "info")
+            devices_by_network = {}
+            device_count = 0
+            for device in self.client.iter_organization_devices(org_id):
+                network_id = device.get('networkId')
+                if network_id:
+                    devices_by_network.setdefault(network_id, []).append(DeviceRecord.from_api(device))
+                    device_count += 1
+            logger.info(f"Fetched {device_count} devices across {len(devices_by_network)} networks in {org_name}")
+        except Exception as e:
+            logger.warning(f"Could not fetch organization devices for {org_name}, falling back to per-network lookups: {e}")
+            devices_by_network = None
+        
+        # Resolve detailed firmware versions for the whole organization in one pass
+        self._firmware_by_serial = self._get_firmware_versions(org_id, org_name)
+        
+        # Fetch MX uplink IPs for the whole organization in one pass
+        try:
+            self._uplinks_by_serial = self.client.get_organization_appliance_uplink_ips(org_id)
+            logger.info(f"Fetched uplink status for {len(self._uplinks_by_serial)} appliances in {org_name}")
+        except Exception as e:
+            logger.warning(f"Could not fetch appliance uplink statuses for {org_name}: {e}")
+            self._uplinks_by_serial = None
+        
+        # Switch ports are only written in auto mode - prefetch them for the whole
+        # organization instead of one request per MS switch
+        self._switch_ports_by_serial = None
+        if self.sync_mode == 'auto':
+            try:
+                self.sync_log.add_progress_log(f"Fetching switch ports from organization: {org_name}", "info")
+                self._switch_ports_by_serial = {
+                    switch['serial']: switch.get('ports') or []
+                    for switch in self.client.get_organization_switch_ports_by_switch(org_id)
+                    if switch.get('serial')
+                }
+                logger.info(f"Fetched switch ports for {len(self._switch_ports_by_serial)} switches in {org_name}")
+            except Exception as e:
+                logger.warning(f"Could not fetch organization switch ports for {org_name}, falling back to per-switch lookups: {e}")
+                self._switch_ports_by_serial = None
+        
+        # Stream networks for this organization - the next page is fetched
+        # in the background while networks from the current page are synced
         self.sync_log.add_progress_log(f"Fetching networks from organization: {org_name}", "info")
-        networks = self.client.get_networks(org_id)
+        network_count = NetworkCount(network_ids)
+        networks = self.client.iter_networks(org_id, prefetch=True, on_page=network_count.page)
         
         # Filter networks if specific IDs provided
         if network_ids:
-            networks = [n for n in networks if n['id'] in network_ids]
-            logger.info(f"Filtering to {len(networks)} selected networks in {org_name}")
-            self.sync_log.add_progress_log(f"Syncing {len(networks)} selected networks in {org_name}", "info")
+            networks = (n for n in networks if n['id'] in network_ids)
+            self.sync_log.add_progress_log(f"Syncing selected networks in {org_name}", "info")
+        
+        if self.async_prefetch:
+            networks = list(networks)
+            self._prefetch_network_data(org_id, org_name, networks, devices_by_network)
+        
+        if self.max_workers > 1:
+            net_count = self._sync_networks_parallel(
+                networks, org_name, meraki_tag, device_status_map, devices_by_network, network_count
+            )
         else:
-            logger.info(f"Found {len(networks)} networks in {org_name}")
-            self.sync_log.add_progress_log(f"Found {len(networks)} networks in {org_name}", "info")
+            net_count = self._sync_networks_sequential(
+                networks, org_name, meraki_tag, device_status_map, devices_by_network, network_count
+            )
         
-        total_networks = len(networks)
+        logger.info(f"Processed {net_count} networks in {org_name}")
+        self.sync_log.add_progress_log(f"Processed {net_count} networks in {org_name}", "info")
+    
+    def _prefetch_network_data(self, org_id: str, org_name: str, networks: List[Dict],
+                               devices_by_network: Optional[Dict] = None):
+        """Fetch per-network API data concurrently into the run cache
         
+        Networks are then synced as usual, but their VLAN and SSID requests are
+        served from the cache instead of going out one at a time.
+        """
+        if not aiohttp_available():
+            logger.warning("async_prefetch is enabled but aiohttp is not installed, skipping prefetch")
+            return
+        
+        # Networks without devices are skipped by the sync, don't fetch them
+        if devices_by_network is not None:
+            networks = [n for n in networks if n.get('id') in devices_by_network]
+        if not networks:
+            return
+        
+        self.sync_log.add_progress_log(
+            f"Prefetching data for {len(networks)} networks in {org_name}", "info"
+        )
+        try:
+            fetched = asyncio.run(prefetch_network_data(
+                self.client, networks, org_id, self.async_max_concurrency
+            ))
+            logger.info(f"Prefetched {fetched} network endpoints in {org_name}")
+        except Exception as e:
+            logger.warning(f"Async prefetch failed for {org_name}, fetching on demand: {e}")
+    
+    def _sync_networks_sequential(self, networks: Iterator[Dict], org_name: str, meraki_tag: Tag,
+                                  device_status_map: Dict, devices_by_network: Optional[Dict] = None,
+                                  network_count: Optional[NetworkCount] = None) -> int:
+        """Sync networks one at a time, returning the number processed"""
+        net_count = 0
         for net_idx, network in enumerate(networks):
+            net_count = net_idx + 1
             # Check for cancellation before processing each network
             if self.sync_log.check_cancel_requested():
                 self.sync_log.add_progress_log("Sync cancelled by user", "warning")
@@ -358,20 +759,138 @@ class MerakiSyncService:
                 self.sync_log.message = "Sync cancelled by user"
                 self.sync_log.save()
                 logger.warning("Sync cancelled by user")
-                return
+                self._cancel_event.set()
+                return net_count
             
             try:
                 # Enhanced progress with network counts
+                total_networks = network_count if network_count is not None else '?'
                 net_progress_msg = f"Syncing network {net_idx + 1}/{total_networks} in {org_name}: {network.get('name', '')}"
                 self.sync_log.add_progress_log(net_progress_msg, "info")
-                self._sync_network(network, org_name, meraki_tag, device_status_map)
-                self.stats['networks'] += 1
+                with self._network_scope():
+                    self._sync_network(
+                        network, org_name, meraki_tag, device_status_map,
+                        self._network_devices(network, devices_by_network)
+                    )
+                self._increment_stat('networks')
             except Exception as e:
                 error_msg = f"Error syncing network {network.get('name')}: {str(e)}"
                 logger.error(error_msg)
-                self.errors.append(error_msg)
+                self._record_error(error_msg)
+        
+        return net_count
     
-    def _sync_network(self, network: Dict, org_name: str, meraki_tag: Tag, device_status_map: Dict = None):
+    def _sync_networks_parallel(self, networks: Iterator[Dict], org_name: str, meraki_tag: Tag,
+                                device_status_map: Dict, devices_by_network: Optional[Dict] = None,
+                                network_count: Optional[NetworkCount] = None) -> int:
+        """Sync networks concurrently on a worker pool, returning the number processed
+        
+        At most max_workers * 2 networks are submitted ahead of the results
+        being collected, so networks keep streaming in and a cancel request
+        (checked before every submit) stops the sync without running every
+        queued network first. Results are collected in submission order so
+        progress is reported in the same order every run.
+        """
+        logger.info(f"Syncing networks in {org_name} with {self.max_workers} worker threads")
+        self.sync_log.add_progress_log(
+            f"Syncing networks in {org_name} with {self.max_workers} worker threads", "info"
+        )
+        
+        networks = iter(networks)
+        window = self.max_workers * 2
+        pending = deque()
+        net_count = 0
+        net_idx = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='meraki-sync') as executor:
+            def submit_next() -> bool:
+                """Submit the next network, returning False once there is none or the sync was cancelled"""
+                if self._cancel_event.is_set():
+                    return False
+                if self.sync_log.check_cancel_requested():
+                    self.sync_log.add_progress_log("Sync cancelled by user", "warning")
+                    self.sync_log.status = 'failed'
+                    self.sync_log.message = "Sync cancelled by user"
+                    self.sync_log.save()
+                    logger.warning("Sync cancelled by user")
+                    self._cancel_event.set()
+                    for _, queued in pending:
+                        queued.cancel()
+                    return False
+                network = next(networks, None)
+                if network is None:
+                    return False
+                pending.append((network, executor.submit(
+                    self._sync_network_worker, network, org_name, meraki_tag, device_status_map,
+                    self._network_devices(network, devices_by_network)
+                )))
+                return True
+            
+            while len(pending) < window and submit_next():
+                pass
+            
+            while pending:
+                network, future = pending.popleft()
+                net_idx += 1
+                if not future.cancelled():
+                    try:
+                        if future.result():
+                            self._increment_stat('networks')
+                        net_count += 1
+                        total_networks = network_count if network_count is not None else '?'
+                        self.sync_log.add_progress_log(
+                            f"Synced network {net_idx}/{total_networks} in {org_name}: {network.get('name', '')}",
+                            "info"
+                        )
+                    except Exception as e:
+                        error_msg = f"Error syncing network {network.get('name')}: {str(e)}"
+                        logger.error(error_msg)
+                        self._record_error(error_msg)
+                
+                # Refill the window as results come in
+                while len(pending) < window and submit_next():
+                    pass
+        
+        return net_count
+    
+    def _sync_network_worker(self, network: Dict, org_name: str, meraki_tag: Tag, device_status_map: Dict,
+                             devices: Optional[List[Dict]] = None) -> bool:
+        """Sync one network on a worker thread
+        
+        Each worker thread gets its own Django database connection, which is
+        closed when the network finishes so connections are not leaked when the
+        pool shuts down.
+        """
+        if self._cancel_event.is_set():
+            return False
+        
+        try:
+            with self._network_scope():
+                self._sync_network(network, org_name, meraki_tag, device_status_map, devices)
+            return True
+        finally:
+            connection.close()
+
+    def _get_firmware_versions(self, org_id: str, org_name: str) -> Dict[str, str]:
+        """Get firmware versions by serial for an organization, cached for the run"""
+        if org_id not in self._firmware_cache:
+            try:
+                self.sync_log.add_progress_log(f"Fetching firmware versions from organization: {org_name}", "info")
+                self._firmware_cache[org_id] = self.client.get_organization_firmware_versions(org_id)
+                logger.info(f"Fetched firmware versions for {len(self._firmware_cache[org_id])} devices in {org_name}")
+            except Exception as e:
+                logger.debug(f"Could not fetch detailed firmware info for {org_name}: {e}")
+                self._firmware_cache[org_id] = {}
+        return self._firmware_cache[org_id]
+    
+    @staticmethod
+    def _network_devices(network: Dict, devices_by_network: Optional[Dict]) -> Optional[List[Dict]]:
+        """Get a network's devices from the organization-wide partition (None = not prefetched)"""
+        if devices_by_network is None:
+            return None
+        return devices_by_network.get(network['id'], [])
+    
+    def _sync_network(self, network: Dict, org_name: str, meraki_tag: Tag, device_status_map: Dict = None,
+                      devices: Optional[List[Dict]] = None):
         """Sync a single network as a Site
         
         Args:
@@ -379,6 +898,7 @@ class MerakiSyncService:
             org_name: Organization name
             meraki_tag: Tag to apply to synced objects
             device_status_map: Dictionary of device statuses by serial number (includes firmware)
+            devices: Devices in this network, prefetched organization-wide (None = fetch per network)
         """
         if device_status_map is None:
             device_status_map = {}
@@ -389,25 +909,9 @@ class MerakiSyncService:
         logger.info(f"Syncing network: {network_name}")
         
         # Get devices in this network first to check if we should create the site
-        self.sync_log.add_progress_log(f"Fetching devices from network: {network_name}", "info")
-        devices = self.client.get_devices(network_id)
-        
-        # Get firmware info from network API
-        firmware_info_map = {}
-        try:
-            firmware_data = self.client.get_network_firmware_upgrades(network_id)
-            if firmware_data and 'products' in firmware_data:
-                # Map product types to their current firmware versions
-                for product_type, product_data in firmware_data.get('products', {}).items():
-                    current_version = product_data.get('currentVersion', {})
-                    if current_version:
-                        # Store shortName which has the full version like "MX 18.107.4"
-                        short_name = current_version.get('shortName', '')
-                        if short_name:
-                            firmware_info_map[product_type] = short_name
-                logger.debug(f"Fetched detailed firmware info for {len(firmware_info_map)} product types in {network_name}")
-        except Exception as e:
-            logger.debug(f"Could not fetch detailed firmware info for {network_name}: {e}")
+        if devices is None:
+            self.sync_log.add_progress_log(f"Fetching devices from network: {network_name}", "info")
+            devices = self.client.get_devices(network_id)
         
         # Merge firmware info from device status and API
         firmware_count = 0
@@ -425,17 +929,20 @@ class MerakiSyncService:
                 if 'publicIp' in status_info:
                     device['publicIp'] = status_info['publicIp']
             
-            # Check firmware version from network API first
-            if product_type and product_type in firmware_info_map:
-                device['firmware'] = firmware_info_map[product_type]
+            # Check firmware version from the organization firmware lookup first
+            if serial and serial in self._firmware_by_serial:
+                device['firmware'] = self._firmware_by_serial[serial]
                 firmware_count += 1
-                logger.debug(f"Set firmware for {serial} from firmware upgrades API: {firmware_info_map[product_type]}")
-            elif serial and serial in device_status_map:
+                logger.debug(f"Set firmware for {serial} from firmware upgrades API: {device['firmware']}")
+            elif serial and device_status_map.get(serial, {}).get('firmware'):
                 # Fallback to device status API for firmware
-                status_info = device_status_map[serial]
-                if 'firmware' in status_info and status_info['firmware']:
-                    device['firmware'] = status_info['firmware']
-                    firmware_count += 1
+                device['firmware'] = device_status_map[serial]['firmware']
+                firmware_count += 1
+            elif device.get('firmware'):
+                # Devices without an upgrade record keep the firmware reported by
+                # the device listing (organization or network devices)
+                firmware_count += 1
+                logger.debug(f"Using listed firmware for {serial}: {device['firmware']}")
         
         if firmware_count > 0:
             logger.info(f"Merged firmware info for {firmware_count}/{len(devices)} devices in {network_name}")
@@ -449,10 +956,10 @@ class MerakiSyncService:
             return
         
         # Get plugin settings for transformations
-        plugin_settings = PluginSettings.get_settings()
+        plugin_settings = self.config.settings
         
         # Apply site name transformation rules first
-        site_name = SiteNameRule.transform_network_name(network_name)
+        site_name = self.config.transform_network_name(network_name)
         
         # If site_name is None, it means the site should be skipped (doesn't match rules and process_unmatched_sites is False)
         if site_name is None:
@@ -466,13 +973,10 @@ class MerakiSyncService:
         site_name = plugin_settings.transform_name(site_name, plugin_settings.site_name_transform)
         
         # Generate slug from site name
-        import re
-        slug = re.sub(r'[^a-z0-9-]+', '-', site_name.lower()).strip('-')
-        if not slug:
-            slug = f"site-{network_id.lower()}"
+        slug = make_slug(site_name, f"site-{network_id.lower()}")
         
         # Check if site exists
-        existing_site = Site.objects.filter(name=site_name).first()
+        existing_site = self.state.get_site(site_name)
         action_type = 'update' if existing_site else 'create'
         current_data = None
         
@@ -492,33 +996,32 @@ class MerakiSyncService:
             'timezone': network.get('timeZone', 'N/A'),
         }
         
-        # All sync modes: Create review item (staging table) first
-        review_item = self._create_review_item(
-            item_type='site',
-            action_type=action_type,
-            object_name=site_name,
-            object_identifier=network_id,
-            proposed_data=proposed_site_data,
-            current_data=current_data
-        )
-        logger.info(f"Created staging entry for site: {site_name} ({action_type})")
-        self.sync_log.add_progress_log(f"Staging site: {site_name} (Network: {network_name})", "info")
+        # Nothing to stage or write if the site already matches
+        if existing_site and self._is_unchanged('site', existing_site, proposed_site_data, plugin_settings):
+            logger.debug(f"Site {site_name} is unchanged")
+            self._skip_unchanged('sites', existing_site)
+            review_item = None
+        else:
+            # All sync modes: Create review item (staging table) first
+            review_item = self._create_review_item(
+                item_type='site',
+                action_type=action_type,
+                object_name=site_name,
+                object_identifier=network_id,
+                proposed_data=proposed_site_data,
+                current_data=current_data
+            )
+            logger.info(f"Created staging entry for site: {site_name} ({action_type})")
+            self.sync_log.add_progress_log(f"Staging site: {site_name} (Network: {network_name})", "info")
         
         
         if self.sync_mode == 'auto' and review_item:
             try:
-                review_item.status = 'approved'
-                review_item.save()
-                self.apply_review_item(review_item)
-                review_item.status = 'applied'
-                review_item.save()
-                site = Site.objects.get(name=site_name)
-                self.stats['sites'] += 1
+                self._apply_staged_item(review_item)
+                site = self.state.get_site(site_name) or Site.objects.get(name=site_name)
+                self._increment_stat('sites')
                 self.sync_log.add_progress_log(f"✓ Created/Updated site: {site_name}", "success")
             except Exception as e:
-                review_item.status = 'failed'
-                review_item.error_message = str(e)
-                review_item.save()
                 error_msg = f"Failed to apply site {site_name}: {e}"
                 logger.error(error_msg)
                 self.sync_log.add_progress_log(f"✗ {error_msg}", "error")
@@ -537,7 +1040,7 @@ class MerakiSyncService:
         except Exception as e:
             error_msg = f"Error syncing VLANs for network {network_name}: {str(e)}"
             logger.error(error_msg)
-            self.errors.append(error_msg)
+            self._record_error(error_msg)
         
         # 2. Sync prefixes for this network SECOND (after VLANs)
         try:
@@ -545,20 +1048,52 @@ class MerakiSyncService:
         except Exception as e:
             error_msg = f"Error syncing prefixes for network {network_name}: {str(e)}"
             logger.error(error_msg)
-            self.errors.append(error_msg)
+            self._record_error(error_msg)
         
         # 3. Process devices LAST (after VLANs and prefixes)
+        wan_batch = []
+        ssid_batch = []
         for device in devices:
             try:
-                self._sync_device(device, site, meraki_tag)
-                self.stats['devices'] += 1
+                self._sync_device(device, site, meraki_tag, wan_batch, ssid_batch)
+                self._increment_stat('devices')
             except Exception as e:
                 error_msg = f"Error syncing device {device.get('name', device.get('serial'))}: {str(e)}"
                 logger.error(error_msg)
-                self.errors.append(error_msg)
+                self._record_error(error_msg)
+        
+        # 4. Create WAN interfaces and IPs for all MX appliances in the network at once
+        if wan_batch:
+            self._create_wan_interfaces_and_ips(wan_batch)
+        
+        # 5. Sync SSIDs for all wireless APs in the network at once
+        if ssid_batch:
+            self._sync_ssids(ssid_batch)
+    
+    def _get_wan_ips(self, device: Dict) -> Dict[str, str]:
+        """Get an MX device's WAN IPs by uplink (e.g. {'wan1': '1.2.3.4', 'wan2': '5.6.7.8'})"""
+        if self._uplinks_by_serial is not None and device.get('serial') in self._uplinks_by_serial:
+            return self._uplinks_by_serial[device['serial']]
+        
+        wan_ips = {}
+        for uplink in WAN_INTERFACE_NAMES:
+            if device.get(f'{uplink}Ip'):
+                wan_ips[uplink] = device[f'{uplink}Ip']
+        return wan_ips
     
-    def _sync_device(self, device: Dict, site: Site, meraki_tag: Tag):
-        """Sync a single device"""
+    def _sync_device(self, device: Dict, site: Site, meraki_tag: Tag, wan_batch: Optional[List] = None,
+                     ssid_batch: Optional[List] = None):
+        """Sync a single device
+        
+        Args:
+            device: Device data from Meraki API
+            site: Site object (auto mode) or site name (review/dry-run mode)
+            meraki_tag: Tag to apply to synced objects
+            wan_batch: Optional list collecting (device, wan_ips) pairs so WAN interfaces
+                can be created for the whole network at once (None = create immediately)
+            ssid_batch: Optional list collecting (device, meraki_device) pairs of wireless
+                APs so SSIDs are synced for the whole network at once (None = sync immediately)
+        """
         serial = device['serial']
         name = device.get('name') or serial  # Use serial if name is None or empty
         model = device.get('model', 'Unknown')
@@ -575,7 +1110,7 @@ class MerakiSyncService:
         logger.debug(f"Syncing device: {name} ({serial}) - Model: {model}, Product Type: {product_type}")
         
         # Get plugin settings
-        plugin_settings = PluginSettings.get_settings()
+        plugin_settings = self.config.settings
         
         # Apply device name transformation
         name = plugin_settings.transform_name(name, plugin_settings.device_name_transform)
@@ -588,13 +1123,11 @@ class MerakiSyncService:
         # Get site name - handle both Site object and string
         site_name = site.name if hasattr(site, 'name') else site
         
-        # For MX devices, capture WAN IP
-        wan_ip = None
-        raw_wan_ip = None
+        # For MX devices, capture WAN IPs for every uplink
+        wan_ips = {}
         if product_type.startswith('MX'):
-            raw_wan_ip = device.get('wan1Ip') or device.get('wan2Ip')
-            if raw_wan_ip:
-                wan_ip = raw_wan_ip
+            wan_ips = self._get_wan_ips(device)
+        wan_ip = next(iter(wan_ips.values()), None)
         
         # Prepare proposed data (don't create device types/roles yet in review mode)
         firmware_version = device.get('firmware', 'Unknown')
@@ -644,7 +1177,7 @@ class MerakiSyncService:
         }
         
         # Check if device exists
-        existing_device = Device.objects.filter(serial=serial).first()
+        existing_device = self.state.get_device(serial)
         action_type = 'update' if existing_device else 'create'
         current_data = None
         
@@ -658,41 +1191,52 @@ class MerakiSyncService:
                 'status': existing_device.status,
             }
         
-        # All sync modes: Create review item (staging table) first
-        review_item = self._create_review_item(
-            item_type='device',
-            action_type=action_type,
-            object_name=name,
-            object_identifier=serial,
-            proposed_data=proposed_data,
-            current_data=current_data
-        )
-        logger.info(f"Created staging entry for device: {name} ({action_type})")
-        site_name = site.name if isinstance(site, Site) else site
-        self.sync_log.add_progress_log(f"Staging device: {name} [{model}] at {site_name}", "info")
+        # Nothing to stage or write for the device itself if it already matches;
+        # its interfaces, IPs and SSIDs below are still reconciled in auto mode
+        unchanged = bool(existing_device) and self._is_unchanged('device', existing_device, proposed_data, plugin_settings)
+        if unchanged:
+            logger.debug(f"Device {name} ({serial}) is unchanged")
+            self._skip_unchanged('devices', existing_device)
+            review_item = None
+        else:
+            # All sync modes: Create review item (staging table) first
+            review_item = self._create_review_item(
+                item_type='device',
+                action_type=action_type,
+                object_name=name,
+                object_identifier=serial,
+                proposed_data=proposed_data,
+                current_data=current_data
+            )
+            logger.info(f"Created staging entry for device: {name} ({action_type})")
+            site_name = site.name if isinstance(site, Site) else site
+            self.sync_log.add_progress_log(f"Staging device: {name} [{model}] at {site_name}", "info")
         
         
-        if self.sync_mode == 'auto' and review_item:
+        if self.sync_mode == 'auto' and (review_item or unchanged):
             try:
-                review_item.status = 'approved'
-                review_item.save()
-                self.apply_review_item(review_item)
-                review_item.status = 'applied'
-                review_item.save()
-                self.sync_log.add_progress_log(f"✓ Created/Updated device: {name} (Serial: {serial})", "success")
+                if review_item:
+                    self._apply_staged_item(review_item)
+                    self.sync_log.add_progress_log(f"✓ Created/Updated device: {name} (Serial: {serial})", "success")
                 
                 # Get the device object for additional operations
-                device_obj = Device.objects.get(serial=serial)
+                device_obj = self.state.get_device(serial) or Device.objects.get(serial=serial)
                 
-                # For MX devices with WAN IP, create WAN interface and IP address
-                if raw_wan_ip:
-                    self._create_wan_interface_and_ip(serial, name, str(wan_ip), str(raw_wan_ip))
+                # For MX devices with WAN IPs, create WAN interfaces and IP addresses
+                if wan_ips:
+                    if wan_batch is not None:
+                        wan_batch.append((device_obj, wan_ips))
+                    else:
+                        self._create_wan_interfaces_and_ips([(device_obj, wan_ips)])
                 
                 # For MR (wireless) devices, sync SSIDs
                 if product_type.startswith('MR'):
                     try:
-                        self._sync_device_ssids(device_obj, device)
-                        logger.info(f"✓ Synced SSIDs for {name}")
+                        if ssid_batch is not None:
+                            ssid_batch.append((device_obj, device))
+                        else:
+                            self._sync_ssids([(device_obj, device)])
+                            logger.info(f"✓ Synced SSIDs for {name}")
                     except Exception as e:
                         logger.warning(f"Could not sync SSIDs for {name}: {e}")
                 
@@ -714,9 +1258,6 @@ class MerakiSyncService:
                     except Exception as e:
                         logger.warning(f"Could not create switch port interfaces for {name}: {e}")
             except Exception as e:
-                review_item.status = 'failed'
-                review_item.error_message = str(e)
-                review_item.save()
                 error_msg = f"Failed to apply device {name}: {e}"
                 logger.error(error_msg)
                 self.sync_log.add_progress_log(f"✗ {error_msg}", "error")
@@ -725,306 +1266,452 @@ class MerakiSyncService:
             return
         
         
-        if raw_wan_ip:
+        for uplink, uplink_ip in wan_ips.items():
+            interface_name = WAN_INTERFACE_NAMES[uplink]
+            
             # Stage WAN interface
             interface_data = {
                 'device': name,
                 'device_serial': serial,
-                'name': 'WAN',
+                'name': interface_name,
                 'type': 'other',
-                'description': 'Meraki MX WAN Interface',
+                'description': f'Meraki MX {interface_name} Interface',
                 'enabled': True,
             }
             interface_item = self._create_review_item(
                 item_type='interface',
                 action_type='create',
-                object_name=f"{name} - WAN",
-                object_identifier=f"{serial}-wan",
+                object_name=f"{name} - {interface_name}",
+                object_identifier=f"{serial}-{interface_name.lower()}",
                 proposed_data=interface_data,
                 current_data=None
             )
-            logger.info(f"Created staging entry for WAN interface on {name}")
+            logger.info(f"Created staging entry for {interface_name} interface on {name}")
             
             # Stage WAN IP address
             ip_data = {
-                'address': f"{wan_ip}/32",
+                'address': f"{uplink_ip}/32",
                 'device': name,
                 'device_serial': serial,
-                'interface': 'WAN',
+                'interface': interface_name,
                 'description': 'Meraki MX WAN IP',
                 'status': 'active',
             }
             ip_item = self._create_review_item(
                 item_type='ip_address',
                 action_type='create',
-                object_name=f"{wan_ip} on {name}",
-                object_identifier=f"{serial}-wan-ip",
+                object_name=f"{uplink_ip} on {name}",
+                object_identifier=f"{serial}-{interface_name.lower()}-ip",
                 proposed_data=ip_data,
                 current_data=None
             )
-            logger.info(f"Created staging entry for WAN IP {wan_ip} on {name}")
+            logger.info(f"Created staging entry for WAN IP {uplink_ip} on {name}")
         
         
         return
     
-    def _sync_device_ssids(self, device: Device, meraki_device: Dict):
-        """Create Wireless LAN objects for SSIDs on wireless access points"""
-        try:
+    def _sync_ssids(self, ssid_batch: List):
+        """Create Wireless LANs for the SSIDs of a batch of wireless APs and add them to each AP's radio0
+        
+        Args:
+            ssid_batch: List of (device, meraki_device) pairs for MR devices
+        
+        SSIDs are fetched and resolved once per network (Wireless LANs once per
+        run by SSID name). radio0 interfaces are loaded with one query and the
+        missing ones bulk created, and missing interface-to-Wireless LAN rows
+        are bulk inserted.
+        """
+        devices_by_network: Dict[str, List[Device]] = {}
+        for device, meraki_device in ssid_batch:
             # Get the network ID from device
             network_id = meraki_device.get('networkId')
-            if not network_id:
-                return
-            
-            # Get plugin settings for transformations
-            plugin_settings = PluginSettings.get_settings()
-            
-            # Fetch SSIDs for this network
+            if network_id:
+                devices_by_network.setdefault(network_id, []).append(device)
+        
+        for network_id, devices in devices_by_network.items():
             try:
-                ssids = self.client.get_wireless_ssids(network_id)
-                if ssids:
-                    for ssid_data in ssids:
-                        if not ssid_data.get('enabled', False):
-                            continue
-                        
-                        ssid_name = ssid_data.get('name', f"SSID {ssid_data.get('number', '')}")
-                        ssid_number = ssid_data.get('number')
-                        auth_mode = ssid_data.get('authMode', 'open')
-                        encryption = ssid_data.get('encryptionMode', 'open')
-                        
-                        # Apply SSID name transformation
-                        ssid_name = plugin_settings.transform_name(
-                            ssid_name,
-                            plugin_settings.ssid_name_transform
-                        )
-                        
-                        # Create or update Wireless LAN (without group - SSIDs are organization-wide)
-                        wlan, created = WirelessLAN.objects.update_or_create(
-                            ssid=ssid_name,
-                            defaults={
-                                'description': f"Meraki SSID #{ssid_number} - Auth: {auth_mode}, Encryption: {encryption}",
-                                'status': 'active',
-                            }
-                        )
-                        
-                        if created:
-                            logger.info(f"✓ Created Wireless LAN '{ssid_name}'")
-                        
-                        # Associate the wireless LAN with this interface
-                        # Find or create a wireless interface on the AP
-                        wireless_interface, _ = Interface.objects.get_or_create(
-                            device=device,
-                            name='radio0',
-                            defaults={
-                                'type': 'ieee802.11ax',
-                                'description': 'Wireless radio interface',
-                                'enabled': True,
-                            }
-                        )
-                        
-                        # Set the wireless LAN on the interface
-                        if wireless_interface.wireless_lans.filter(id=wlan.id).exists():
-                            logger.debug(f"SSID '{ssid_name}' already associated with {device.name}")
-                        else:
-                            wireless_interface.wireless_lans.add(wlan)
-                            logger.info(f"✓ Added Wireless LAN '{ssid_name}' to AP {device.name}")
-                        
-                        self.stats['ssids'] += 1
-                        
+                # Wireless LANs resolved here are evicted again if adding them fails
+                with self.savepoint():
+                    wlans = self._get_network_wireless_lans(network_id)
+                    if wlans:
+                        self._add_wireless_lans(devices, wlans)
+                        logger.info(f"✓ Synced {len(wlans)} SSIDs for {len(devices)} AP(s) in network {network_id}")
             except Exception as e:
-                logger.debug(f"Could not fetch SSIDs for AP {device.name}: {e}")
+                logger.warning(f"Error syncing SSIDs for {len(devices)} AP(s) in network {network_id}: {e}")
+    
+    def _get_network_wireless_lans(self, network_id: str) -> List[WirelessLAN]:
+        """Create or update a Wireless LAN for each enabled SSID of a network"""
+        # Get plugin settings for transformations
+        plugin_settings = self.config.settings
+        
+        # Fetch SSIDs for this network
+        try:
+            ssids = self.client.get_wireless_ssids(network_id)
         except Exception as e:
-            logger.warning(f"Error syncing SSIDs for device {device.name}: {e}")
+            logger.debug(f"Could not fetch SSIDs for network {network_id}: {e}")
+            return []
+        
+        wlans = {}
+        for ssid_data in ssids or []:
+            if not ssid_data.get('enabled', False):
+                continue
+            
+            ssid_name = ssid_data.get('name', f"SSID {ssid_data.get('number', '')}")
+            ssid_number = ssid_data.get('number')
+            auth_mode = ssid_data.get('authMode', 'open')
+            encryption = ssid_data.get('encryptionMode', 'open')
+            
+            # Apply SSID name transformation
+            ssid_name = plugin_settings.transform_name(
+                ssid_name,
+                plugin_settings.ssid_name_transform
+            )
+            
+            # Create or update Wireless LAN (without group - SSIDs are organization-wide)
+            wlan, created = self.lookups.wireless_lan(
+                ssid_name,
+                defaults={
+                    'description': f"Meraki SSID #{ssid_number} - Auth: {auth_mode}, Encryption: {encryption}",
+                    'status': 'active',
+                }
+            )
+            
+            if created:
+                logger.info(f"✓ Created Wireless LAN '{ssid_name}'")
+            
+            if wlan.pk not in wlans:
+                wlans[wlan.pk] = wlan
+                self._increment_stat('ssids')
+        
+        return list(wlans.values())
+    
+    def _add_wireless_lans(self, devices: List[Device], wlans: List[WirelessLAN]):
+        """Add Wireless LANs to the radio0 interface of each AP, creating missing interfaces"""
+        devices_by_id = {device.id: device for device in devices}
+        interfaces = {
+            interface.device_id: interface
+            for interface in Interface.objects.filter(device_id__in=devices_by_id.keys(), name='radio0')
+        }
+        
+        # Find or create a wireless interface on each AP
+        new_interfaces = [
+            Interface(
+                device=device,
+                name='radio0',
+                type='ieee802.11ax',
+                description='Wireless radio interface',
+                enabled=True,
+            )
+            for device_id, device in devices_by_id.items()
+            if device_id not in interfaces
+        ]
+        if new_interfaces:
+            Interface.objects.bulk_create(new_interfaces)
+            for interface in new_interfaces:
+                interfaces[interface.device_id] = interface
+                self.state.add_interface(interface)
+            self._refresh_interface_counts({interface.device_id for interface in new_interfaces})
+        
+        # Associate the wireless LANs with the interfaces
+        through = Interface.wireless_lans.through
+        interface_ids = [interface.id for interface in interfaces.values()]
+        wlan_ids = [wlan.id for wlan in wlans]
+        existing = set(
+            through.objects.filter(
+                interface_id__in=interface_ids,
+                wirelesslan_id__in=wlan_ids,
+            ).values_list('interface_id', 'wirelesslan_id')
+        )
+        new_rows = [
+            through(interface_id=interface_id, wirelesslan_id=wlan_id)
+            for interface_id in interface_ids
+            for wlan_id in wlan_ids
+            if (interface_id, wlan_id) not in existing
+        ]
+        if new_rows:
+            through.objects.bulk_create(new_rows)
+            logger.info(f"✓ Added {len(new_rows)} Wireless LAN assignments to {len(interface_ids)} AP(s)")
+        else:
+            logger.debug(f"SSIDs already associated with {len(interface_ids)} AP(s)")
     
     def _create_mx_svi_interfaces(self, device: Device, network_id: str):
         """Create SVI (VLAN) interfaces on MX device"""
         try:
-            # Get VLANs for this network
-            vlans = self.client.get_appliance_vlans(network_id)
-            if not vlans:
-                return
-            
-            for vlan_data in vlans:
-                vlan_id = vlan_data.get('id')
-                vlan_name = vlan_data.get('name', f"VLAN {vlan_id}")
-                vlan_subnet = vlan_data.get('subnet')
-                appliance_ip = vlan_data.get('applianceIp')
-                
-                if not vlan_id:
-                    continue
-                
-                # Create or get the VLAN interface (SVI)
-                interface_name = f"vlan{vlan_id}"
-                interface, created = Interface.objects.get_or_create(
-                    device=device,
-                    name=interface_name,
-                    defaults={
-                        'type': 'virtual',
-                        'description': f"{vlan_name} - {vlan_subnet if vlan_subnet else 'N/A'}",
-                        'enabled': True,
-                    }
-                )
-                
-                if created:
-                    logger.info(f"✓ Created SVI interface {interface_name} on {device.name}")
+            with self.savepoint():
+                # Get VLANs for this network
+                vlans = self.client.get_appliance_vlans(network_id)
+                if not vlans:
+                    return
                 
-                # If there's an appliance IP, assign it to the interface
-                if appliance_ip:
-                    # Determine IP with CIDR if subnet is available
-                    if vlan_subnet and '/' in vlan_subnet:
-                        # Extract prefix length from subnet
-                        prefix_length = vlan_subnet.split('/')[1]
-                        ip_address_str = f"{appliance_ip}/{prefix_length}"
-                    else:
-                        ip_address_str = f"{appliance_ip}/24"  # Default to /24
+                for vlan_data in vlans:
+                    vlan_id = vlan_data.get('id')
+                    vlan_name = vlan_data.get('name', f"VLAN {vlan_id}")
+                    vlan_subnet = vlan_data.get('subnet')
+                    appliance_ip = vlan_data.get('applianceIp')
                     
-                    # Check if IP already exists
-                    existing_ip = IPAddress.objects.filter(address=ip_address_str).first()
+                    if not vlan_id:
+                        continue
                     
-                    if existing_ip:
-                        # IP exists - check if it's assigned to a different device's interface
-                        if existing_ip.assigned_object and existing_ip.assigned_object.device != device:
-                            # IP belongs to another device (e.g., HA pair), skip assignment
-                            logger.debug(f"IP {appliance_ip} already assigned to {existing_ip.assigned_object.device.name}, skipping for {device.name}")
-                        elif not existing_ip.assigned_object:
-                            # IP exists but not assigned, assign it to this interface
-                            existing_ip.assigned_object = interface
-                            existing_ip.description = f'{vlan_name} SVI on {device.name}'
-                            existing_ip.save()
-                            logger.info(f"✓ Assigned existing IP {appliance_ip} to {interface_name} on {device.name}")
+                    # Create or get the VLAN interface (SVI)
+                    interface_name = f"vlan{vlan_id}"
+                    interface, created = self.state.get_or_create_interface(
+                        device,
+                        interface_name,
+                        defaults={
+                            'type': 'virtual',
+                            'description': f"{vlan_name} - {vlan_subnet if vlan_subnet else 'N/A'}",
+                            'enabled': True,
+                        }
+                    )
+                    
+                    if created:
+                        logger.info(f"✓ Created SVI interface {interface_name} on {device.name}")
+                    
+                    # If there's an appliance IP, assign it to the interface
+                    if appliance_ip:
+                        # Determine IP with CIDR if subnet is available
+                        if vlan_subnet and '/' in vlan_subnet:
+                            # Extract prefix length from subnet
+                            prefix_length = vlan_subnet.split('/')[1]
+                            ip_address_str = f"{appliance_ip}/{prefix_length}"
                         else:
-                            # Already assigned to this device's interface
-                            logger.debug(f"IP {appliance_ip} already assigned to {interface_name} on {device.name}")
-                    else:
-                        # Create new IP and assign to interface
-                        ip_address = IPAddress.objects.create(
-                            address=ip_address_str,
-                            description=f'{vlan_name} SVI on {device.name}',
-                            status='active',
-                            assigned_object=interface
-                        )
-                        logger.info(f"✓ Assigned IP {appliance_ip} to {interface_name} on {device.name}")
+                            ip_address_str = f"{appliance_ip}/24"  # Default to /24
+                        
+                        # Check if IP already exists
+                        existing_ip = IPAddress.objects.filter(address=ip_address_str).first()
                         
+                        if existing_ip:
+                            # IP exists - check if it's assigned to a different device's interface
+                            if existing_ip.assigned_object and existing_ip.assigned_object.device != device:
+                                # IP belongs to another device (e.g., HA pair), skip assignment
+                                logger.debug(f"IP {appliance_ip} already assigned to {existing_ip.assigned_object.device.name}, skipping for {device.name}")
+                            elif not existing_ip.assigned_object:
+                                # IP exists but not assigned, assign it to this interface
+                                existing_ip.assigned_object = interface
+                                existing_ip.description = f'{vlan_name} SVI on {device.name}'
+                                existing_ip.save()
+                                logger.info(f"✓ Assigned existing IP {appliance_ip} to {interface_name} on {device.name}")
+                            else:
+                                # Already assigned to this device's interface
+                                logger.debug(f"IP {appliance_ip} already assigned to {interface_name} on {device.name}")
+                        else:
+                            # Create new IP and assign to interface
+                            ip_address = IPAddress.objects.create(
+                                address=ip_address_str,
+                                description=f'{vlan_name} SVI on {device.name}',
+                                status='active',
+                                assigned_object=interface
+                            )
+                            logger.info(f"✓ Assigned IP {appliance_ip} to {interface_name} on {device.name}")
+                            
         except Exception as e:
             logger.error(f"Error creating SVI interfaces for {device.name}: {e}")
     
-    def _create_wan_interface_and_ip(self, device_serial: str, device_name: str, wan_ip: str, raw_wan_ip: str):
-        """Create WAN interface and assign IP address for MX devices in auto mode"""
+    def _create_wan_interfaces_and_ips(self, wan_batch: List):
+        """Create WAN interfaces and assign WAN IPs for a batch of MX devices in auto mode
+        
+        Args:
+            wan_batch: List of (device, wan_ips) pairs where wan_ips maps an uplink
+                ('wan1', 'wan2') to its IP address
+        
+        Existing interfaces and IPs are loaded with one query each and only the
+        missing ones are bulk created.
+        """
         try:
-            device = Device.objects.get(serial=device_serial)
-            
-            # Create or get WAN interface
-            interface, created = Interface.objects.get_or_create(
-                device=device,
-                name='WAN',
-                defaults={
-                    'type': 'other',
-                    'description': 'Meraki MX WAN Interface',
-                    'enabled': True,
+            with self.savepoint():
+                devices = {device.id: device for device, _ in wan_batch}
+                wanted = {
+                    (device.id, WAN_INTERFACE_NAMES[uplink]): (uplink, ip)
+                    for device, wan_ips in wan_batch
+                    for uplink, ip in wan_ips.items()
+                    if uplink in WAN_INTERFACE_NAMES
                 }
-            )
-            
-            if created:
-                logger.info(f"✓ Created WAN interface on {device_name}")
-            else:
-                logger.info(f"✓ WAN interface already exists on {device_name}")
-            
-            # Create or update IP address
-            ip_address_str = f"{raw_wan_ip}/32" if '/' not in raw_wan_ip else raw_wan_ip
-            ip_address, ip_created = IPAddress.objects.get_or_create(
-                address=ip_address_str,
-                defaults={
-                    'description': 'Meraki MX WAN IP',
-                    'status': 'active',
+                if not wanted:
+                    return
+                
+                # Create missing WAN interfaces
+                interfaces = {
+                    (interface.device_id, interface.name): interface
+                    for interface in Interface.objects.filter(
+                        device_id__in=devices.keys(),
+                        name__in=set(WAN_INTERFACE_NAMES.values())
+                    )
                 }
-            )
-            
-            # Assign IP to interface
-            if not ip_address.assigned_object:
-                ip_address.assigned_object = interface
-                ip_address.save()
-                logger.info(f"✓ Assigned WAN IP {raw_wan_ip} to interface WAN on {device_name}")
-            else:
-                logger.info(f"✓ WAN IP {raw_wan_ip} already assigned on {device_name}")
+                new_interfaces = [
+                    Interface(
+                        device=devices[device_id],
+                        name=interface_name,
+                        type='other',
+                        description=f'Meraki MX {interface_name} Interface',
+                        enabled=True,
+                    )
+                    for (device_id, interface_name), (uplink, _) in wanted.items()
+                    if (device_id, interface_name) not in interfaces
+                ]
+                if new_interfaces:
+                    Interface.objects.bulk_create(new_interfaces)
+                    for interface in new_interfaces:
+                        interfaces[(interface.device_id, interface.name)] = interface
+                        self.state.add_interface(interface)
+                        logger.info(f"✓ Created {interface.name} interface on {devices[interface.device_id].name}")
+                    self._refresh_interface_counts({interface.device_id for interface in new_interfaces})
                 
-        except Device.DoesNotExist:
-            logger.error(f"Device with serial {device_serial} not found for WAN interface creation")
+                # Create or assign WAN IP addresses
+                interface_ct = ContentType.objects.get_for_model(Interface)
+                addresses = {
+                    key: ip if '/' in ip else f"{ip}/32"
+                    for key, (_, ip) in wanted.items()
+                }
+                existing_ips = {
+                    str(ip_address.address): ip_address
+                    for ip_address in IPAddress.objects.filter(address__in=set(addresses.values()))
+                }
+                
+                new_ips = []
+                assigned_ips = []
+                for key, address in addresses.items():
+                    interface = interfaces[key]
+                    device_name = devices[key[0]].name
+                    ip_address = existing_ips.get(address)
+                    
+                    if ip_address is None:
+                        ip_address = IPAddress(
+                            address=address,
+                            description='Meraki MX WAN IP',
+                            status='active',
+                            assigned_object_type=interface_ct,
+                            assigned_object_id=interface.id,
+                        )
+                        new_ips.append(ip_address)
+                        existing_ips[address] = ip_address
+                        logger.info(f"✓ Assigned WAN IP {address} to interface {interface.name} on {device_name}")
+                    elif not ip_address.assigned_object_id:
+                        ip_address.assigned_object_type = interface_ct
+                        ip_address.assigned_object_id = interface.id
+                        assigned_ips.append(ip_address)
+                        logger.info(f"✓ Assigned WAN IP {address} to interface {interface.name} on {device_name}")
+                    else:
+                        logger.info(f"✓ WAN IP {address} already assigned on {device_name}")
+                
+                if new_ips:
+                    IPAddress.objects.bulk_create(new_ips)
+                if assigned_ips:
+                    IPAddress.objects.bulk_update(assigned_ips, ['assigned_object_type', 'assigned_object_id'])
+                    
         except Exception as e:
-            logger.error(f"Error creating WAN interface/IP for {device_name}: {e}")
+            logger.error(f"Error creating WAN interfaces/IPs for {len(wan_batch)} device(s): {e}")
+    
+    def _refresh_interface_counts(self, device_ids):
+        """Recalculate cached interface counts after interfaces were bulk created"""
+        if not device_ids or not hasattr(Device, 'interface_count'):
+            return
+        
+        interface_counts = Interface.objects.filter(
+            device=OuterRef('pk')
+        ).order_by().values('device').annotate(count=Count('pk')).values('count')
+        Device.objects.filter(pk__in=device_ids).update(interface_count=Subquery(interface_counts))
+    
+    def _get_switch_ports(self, serial: str) -> List[Dict]:
+        """Get port configuration for a switch from the organization prefetch, or the API"""
+        if self._switch_ports_by_serial is not None:
+            return self._switch_ports_by_serial.get(serial, [])
+        return self.client.get_switch_ports(serial)
     
     def _create_switch_port_interfaces(self, device: Device, serial: str):
         """Create switch port interfaces for MS devices with port configuration"""
         try:
-            # Fetch switch ports from Meraki API
-            ports = self.client.get_switch_ports(serial)
-            
-            if not ports:
-                logger.debug(f"No switch ports found for {device.name}")
-                return
-            
-            logger.info(f"Creating {len(ports)} switch port interfaces for {device.name}")
-            
-            for port in ports:
-                port_id = port.get('portId')
-                port_name = port.get('name') or f"Port {port_id}"
-                enabled = port.get('enabled', True)
-                port_type = port.get('type', 'access')  # access or trunk
-                vlan = port.get('vlan')  # For access ports
-                allowed_vlans = port.get('allowedVlans', 'all')  # For trunk ports
-                voice_vlan = port.get('voiceVlan')
-                poe_enabled = port.get('poeEnabled', False)
+            with self.savepoint():
+                # Fetch switch ports from Meraki API
+                ports = self._get_switch_ports(serial)
                 
-                # Determine interface type based on port speed/type
-                interface_type = '1000base-t'  # Default to gigabit
-                if port_name and ('SFP' in port_name.upper() or 'uplink' in port_name.lower()):
-                    interface_type = '10gbase-x-sfpp'
+                if not ports:
+                    logger.debug(f"No switch ports found for {device.name}")
+                    return
                 
-                # Build description
-                description_parts = []
-                if port_type == 'trunk':
-                    description_parts.append(f"Trunk (VLANs: {allowed_vlans})")
-                elif port_type == 'access' and vlan:
-                    description_parts.append(f"Access VLAN {vlan}")
+                logger.info(f"Creating {len(ports)} switch port interfaces for {device.name}")
                 
-                if voice_vlan:
-                    description_parts.append(f"Voice VLAN {voice_vlan}")
-                if poe_enabled:
-                    description_parts.append("PoE Enabled")
+                specs = []
+                for port in ports:
+                    port_id = port.get('portId')
+                    port_name = port.get('name') or f"Port {port_id}"
+                    enabled = port.get('enabled', True)
+                    port_type = port.get('type', 'access')  # access or trunk
+                    vlan = port.get('vlan')  # For access ports
+                    allowed_vlans = port.get('allowedVlans', 'all')  # For trunk ports
+                    voice_vlan = port.get('voiceVlan')
+                    poe_enabled = port.get('poeEnabled', False)
+                    
+                    # Determine interface type based on port speed/type
+                    interface_type = '1000base-t'  # Default to gigabit
+                    if port_name and ('SFP' in port_name.upper() or 'uplink' in port_name.lower()):
+                        interface_type = '10gbase-x-sfpp'
                     
-                description = " | ".join(description_parts) if description_parts else "Switch port"
+                    # Build description
+                    description_parts = []
+                    if port_type == 'trunk':
+                        description_parts.append(f"Trunk (VLANs: {allowed_vlans})")
+                    elif port_type == 'access' and vlan:
+                        description_parts.append(f"Access VLAN {vlan}")
+                    
+                    if voice_vlan:
+                        description_parts.append(f"Voice VLAN {voice_vlan}")
+                    if poe_enabled:
+                        description_parts.append("PoE Enabled")
+                        
+                    description = " | ".join(description_parts) if description_parts else "Switch port"
+                    
+                    # Trunk ports allowing all VLANs are tagged-all; an explicit
+                    # allow-list (e.g. "10-20,30") becomes the tagged VLANs
+                    mode = 'access'
+                    tagged_vids = None
+                    if port_type == 'trunk':
+                        mode = 'tagged-all'
+                        if allowed_vlans and str(allowed_vlans).strip().lower() != 'all':
+                            mode = 'tagged'
+                            tagged_vids = VLANRangeSet.parse(allowed_vlans)
+                    
+                    specs.append(PortSpec(
+                        name=port_id,
+                        type=interface_type,
+                        description=description,
+                        enabled=enabled,
+                        mode=mode,
+                        # For access ports, assign untagged VLAN
+                        untagged_vid=self._vid(vlan) if port_type == 'access' else None,
+                        tagged_vids=tagged_vids,
+                    ))
                 
-                # Create or update interface
-                interface, created = Interface.objects.update_or_create(
-                    device=device,
-                    name=port_id,
-                    defaults={
-                        'type': interface_type,
-                        'description': description,
-                        'enabled': enabled,
-                        'mode': 'tagged-all' if port_type == 'trunk' else 'access',
-                    }
-                )
+                port_sync = SwitchPortSync(device, self._site_vlans(device.site))
+                for interface in port_sync.apply(specs).values():
+                    self.state.add_interface(interface)
+                if port_sync.created:
+                    self._refresh_interface_counts({device.id})
                 
-                # For access ports, assign untagged VLAN
-                if port_type == 'access' and vlan:
-                    try:
-                        vlan_obj = VLAN.objects.filter(vid=vlan, site=device.site).first()
-                        if vlan_obj:
-                            interface.untagged_vlan = vlan_obj
-                            interface.save()
-                            logger.debug(f"Assigned VLAN {vlan} to {port_id} on {device.name}")
-                    except Exception as e:
-                        logger.debug(f"Could not assign VLAN {vlan} to {port_id}: {e}")
+                logger.info(
+                    f"✓ Configured {len(ports)} switch ports for {device.name} "
+                    f"({len(port_sync.created)} created, {len(port_sync.updated)} updated, {port_sync.unchanged} unchanged)"
+                )
                 
-                if created:
-                    logger.debug(f"✓ Created interface {port_id} on {device.name}")
-                else:
-                    logger.debug(f"✓ Updated interface {port_id} on {device.name}")
-            
-            logger.info(f"✓ Configured {len(ports)} switch ports for {device.name}")
-            
         except Exception as e:
             logger.error(f"Error creating switch port interfaces for {device.name}: {e}")
     
+    @staticmethod
+    def _vid(value) -> Optional[int]:
+        """VLAN ID from a Meraki port field, None if it is not a number"""
+        try:
+            return int(value) if value else None
+        except (TypeError, ValueError):
+            return None
+    
+    def _site_vlans(self, site: Site) -> SiteVLANs:
+        """VLANs of a site by VID, loaded once per site for the network being synced"""
+        cache = getattr(self._staging, 'site_vlans', None)
+        if cache is None:
+            return SiteVLANs.load(site)
+        if site.pk not in cache:
+            cache[site.pk] = SiteVLANs.load(site)
+        return cache[site.pk]
+    
     def _sync_device_interface(self, device: Device, meraki_device: Dict):
         """Sync primary interface for a device"""
         lan_ip = meraki_device.get('lanIp')
@@ -1049,9 +1736,9 @@ class MerakiSyncService:
             description += f" (Firmware: {meraki_device.get('firmware')})"
         
         # Create or update management interface
-        interface, created = Interface.objects.get_or_create(
-            device=device,
-            name='Management',
+        interface, created = self.state.get_or_create_interface(
+            device,
+            'Management',
             defaults={
                 'type': interface_type,
                 'mac_address': mac if mac else None,
@@ -1096,134 +1783,6 @@ class MerakiSyncService:
         except Exception as e:
             logger.warning(f"Could not create IP address {lan_ip} for device {device.name}: {e}")
     
-    def _sync_switch_ports(self, device: Device, serial: str, meraki_tag: Tag):
-        """Sync switch ports for MS devices"""
-        try:
-            ports = self.client.get_switch_ports(serial)
-            if not ports:
-                return
-            
-            logger.info(f"Syncing {len(ports)} switch ports for {device.name}")
-            
-            for port_data in ports:
-                try:
-                    port_id = port_data.get('portId', '')
-                    port_name = port_data.get('name', f"Port {port_id}")
-                    enabled = port_data.get('enabled', True)
-                    port_type = port_data.get('type', 'access')
-                    vlan = port_data.get('vlan')
-                    voice_vlan = port_data.get('voiceVlan')
-                    allowed_vlans = port_data.get('allowedVlans', '')
-                    poe_enabled = port_data.get('poeEnabled', False)
-                    link_negotiation = port_data.get('linkNegotiation', '')
-                    
-                    # Determine interface type based on link negotiation
-                    interface_type = '1000base-t'  # Default to gigabit
-                    if 'Auto negotiate' in str(link_negotiation):
-                        interface_type = '1000base-t'
-                    elif '10 Gigabit' in str(link_negotiation):
-                        interface_type = '10gbase-t'
-                    elif '100 Megabit' in str(link_negotiation):
-                        interface_type = '100base-tx'
-                    
-                    # Build description
-                    description_parts = []
-                    if port_type == 'trunk':
-                        description_parts.append(f"Trunk port")
-                        if allowed_vlans:
-                            description_parts.append(f"Allowed VLANs: {allowed_vlans}")
-                    else:
-                        description_parts.append(f"Access port")
-                        if vlan:
-                            description_parts.append(f"VLAN {vlan}")
-                    
-                    if voice_vlan:
-                        description_parts.append(f"Voice VLAN {voice_vlan}")
-                    if poe_enabled:
-                        description_parts.append("PoE Enabled")
-                    
-                    description = " | ".join(description_parts) if description_parts else port_name
-                    
-                    # Determine mode
-                    mode = ''
-                    if port_type == 'trunk':
-                        mode = 'tagged'
-                    elif port_type == 'access':
-                        mode = 'access'
-                    
-                    # Create or update interface
-                    interface, created = Interface.objects.update_or_create(
-                        device=device,
-                        name=port_name,
-                        defaults={
-                            'type': interface_type,
-                            'enabled': enabled,
-                            'mode': mode,
-                            'description': description,
-                        }
-                    )
-                    
-                    if created:
-                        logger.debug(f"Created interface {port_name} on {device.name}")
-                    
-                    # Assign untagged VLAN for access ports
-                    if port_type == 'access' and vlan:
-                        # Find VLAN in the site's VLAN group
-                        vlan_group_name = f"{device.site.name} VLANs"
-                        vlan_obj = VLAN.objects.filter(
-                            vid=vlan,
-                            group__name=vlan_group_name
-                        ).first()
-                        
-                        if vlan_obj:
-                            interface.untagged_vlan = vlan_obj
-                            interface.save()
-                            logger.debug(f"Assigned VLAN {vlan} to interface {port_name}")
-                    
-                    # For trunk ports, assign tagged VLANs
-                    if port_type == 'trunk' and allowed_vlans and allowed_vlans != 'all':
-                        vlan_group_name = f"{device.site.name} VLANs"
-                        # Parse allowed VLANs (can be ranges like "10-20,30,40-50")
-                        vlan_ids = self._parse_vlan_list(allowed_vlans)
-                        
-                        tagged_vlans = VLAN.objects.filter(
-                            vid__in=vlan_ids,
-                            group__name=vlan_group_name
-                        )
-                        
-                        if tagged_vlans.exists():
-                            interface.tagged_vlans.set(tagged_vlans)
-                            logger.debug(f"Assigned tagged VLANs to interface {port_name}: {allowed_vlans}")
-                    
-                    interface.tags.add(meraki_tag)
-                    
-                except Exception as e:
-                    logger.warning(f"Could not sync port {port_data.get('portId')} on {device.name}: {e}")
-                    
-        except Exception as e:
-            logger.debug(f"Could not fetch switch ports for {device.name}: {e}")
-    
-    def _parse_vlan_list(self, vlan_string: str) -> List[int]:
-        """Parse VLAN list string like '10-20,30,40-50' into list of VLAN IDs"""
-        vlan_ids = []
-        if not vlan_string or vlan_string == 'all':
-            return vlan_ids
-        
-        try:
-            for part in vlan_string.split(','):
-                part = part.strip()
-                if '-' in part:
-                    # Range like "10-20"
-                    start, end = part.split('-')
-                    vlan_ids.extend(range(int(start), int(end) + 1))
-                else:
-                    # Single VLAN
-                    vlan_ids.append(int(part))
-        except Exception as e:
-            logger.warning(f"Could not parse VLAN list '{vlan_string}': {e}")
-        
-        return vlan_ids
-    
     def _sync_vlans(self, network_id: str, site_name: str, meraki_tag: Tag):
         """Sync VLANs for a network - now works in all sync modes via staging"""
         try:
@@ -1240,7 +1799,7 @@ class MerakiSyncService:
         self.sync_log.add_progress_log(f"Syncing {len(vlans)} VLANs for {site_name}", "info")
         
         # Get plugin settings for transformations
-        plugin_settings = PluginSettings.get_settings()
+        plugin_settings = self.config.settings
         
         for vlan_data in vlans:
             vlan_id = vlan_data.get('id')
@@ -1252,14 +1811,14 @@ class MerakiSyncService:
             try:
                 # In review/dry-run mode, site might not exist in NetBox yet (only in staging)
                 # So we check but don't skip - just use the site name
-                site_obj = Site.objects.filter(name=site_name).first()
+                site_obj = self.state.get_site(site_name)
                     
                 vlan_group_name = f"{site_name} VLANs"
-                vlan_group = VLANGroup.objects.filter(name=vlan_group_name).first() if site_obj else None
+                vlan_group = self.state.get_vlan_group(vlan_group_name) if site_obj else None
                 
                 existing_vlan = None
                 if vlan_group:
-                    existing_vlan = VLAN.objects.filter(vid=vlan_id, group=vlan_group).first()
+                    existing_vlan = self.state.get_vlan(vlan_group, vlan_id)
                 
                 action_type = 'update' if existing_vlan else 'create'
                 current_data = None
@@ -1281,6 +1840,12 @@ class MerakiSyncService:
                     'status': 'active',
                 }
                 
+                # Nothing to stage or write if the VLAN already matches
+                if existing_vlan and self._is_unchanged('vlan', existing_vlan, proposed_data, plugin_settings):
+                    self._skip_unchanged('vlans', existing_vlan)
+                    self._increment_stat('vlans')
+                    continue
+                
                 # All sync modes: Create review item (staging) first
                 review_item = self._create_review_item(
                     item_type='vlan',
@@ -1294,23 +1859,16 @@ class MerakiSyncService:
                 
                 if self.sync_mode == 'auto' and review_item:
                     try:
-                        review_item.status = 'approved'
-                        review_item.save()
-                        self.apply_review_item(review_item)
-                        review_item.status = 'applied'
-                        review_item.save()
+                        self._apply_staged_item(review_item)
                         self.sync_log.add_progress_log(f"✓ Created/Updated VLAN {vlan_id}: {vlan_name} at {site_name}", "success")
                     except Exception as e:
-                        review_item.status = 'failed'
-                        review_item.error_message = str(e)
-                        review_item.save()
                         error_msg = f"Failed to apply VLAN {vlan_id} at {site_name}: {e}"
                         logger.error(error_msg)
                         self.sync_log.add_progress_log(f"✗ {error_msg}", "error")
-                    self.stats['vlans'] += 1
+                    self._increment_stat('vlans')
                 else:
                     
-                    self.stats['vlans'] += 1
+                    self._increment_stat('vlans')
                 
             except Exception as e:
                 logger.warning(f"Could not sync VLAN {vlan_id}: {e}")
@@ -1330,6 +1888,13 @@ class MerakiSyncService:
         logger.info(f"Syncing {len(subnets)} prefixes for {site_name}")
         self.sync_log.add_progress_log(f"Syncing {len(subnets)} prefixes/subnets for {site_name}", "info")
         
+        plugin_settings = self.config.settings
+        
+        # Evaluate the prefix filter rules for the whole batch up front
+        sync_prefixes = self.config.prefix_filter.should_sync_prefixes(
+            subnet_data['subnet'] for subnet_data in subnets if subnet_data.get('subnet')
+        )
+        
         for subnet_data in subnets:
             subnet = subnet_data.get('subnet')
             vlan_id = subnet_data.get('vlan_id')
@@ -1343,12 +1908,12 @@ class MerakiSyncService:
                 network = ip_network(subnet, strict=False)
                 
                 # Check if prefix should be synced based on filter rules
-                if not PrefixFilterRule.should_sync_prefix(str(network)):
+                if not sync_prefixes[subnet]:
                     logger.info(f"⊗ Skipping prefix {network} - excluded by filter rules")
                     continue
                 
                 # Check if prefix exists
-                existing_prefix = Prefix.objects.filter(prefix=str(network)).first()
+                existing_prefix = self.state.get_prefix(str(network))
                 action_type = 'update' if existing_prefix else 'create'
                 current_data = None
                 
@@ -1369,6 +1934,12 @@ class MerakiSyncService:
                     'description': f"VLAN {vlan_id}: {vlan_name}" if vlan_id else "Meraki Subnet",
                 }
                 
+                # Nothing to stage or write if the prefix already matches
+                if existing_prefix and self._is_unchanged('prefix', existing_prefix, proposed_data, plugin_settings):
+                    self._skip_unchanged('prefixes', existing_prefix)
+                    self._increment_stat('prefixes')
+                    continue
+                
                 # All sync modes: Create review item (staging) first
                 review_item = self._create_review_item(
                     item_type='prefix',
@@ -1382,23 +1953,16 @@ class MerakiSyncService:
                 
                 if self.sync_mode == 'auto' and review_item:
                     try:
-                        review_item.status = 'approved'
-                        review_item.save()
-                        self.apply_review_item(review_item)
-                        review_item.status = 'applied'
-                        review_item.save()
+                        self._apply_staged_item(review_item)
                         self.sync_log.add_progress_log(f"✓ Created/Updated prefix: {network} at {site_name}", "success")
                     except Exception as e:
-                        review_item.status = 'failed'
-                        review_item.error_message = str(e)
-                        review_item.save()
                         error_msg = f"Failed to apply prefix {network} at {site_name}: {e}"
                         logger.error(error_msg)
                         self.sync_log.add_progress_log(f"✗ {error_msg}", "error")
-                    self.stats['prefixes'] += 1
+                    self._increment_stat('prefixes')
                 else:
                     
-                    self.stats['prefixes'] += 1
+                    self._increment_stat('prefixes')
                 
             except Exception as e:
                 logger.warning(f"Could not sync prefix {subnet}: {e}")
@@ -1505,7 +2069,7 @@ class MerakiSyncService:
                 'network': proposed_data.get('network'),
             }
         
-        return ReviewItem.objects.create(
+        item = ReviewItem(
             review=self.review,
             item_type=item_type,
             action_type=action_type,
@@ -1517,6 +2081,125 @@ class MerakiSyncService:
             related_object_info=related_object_info,
             status='pending'
         )
+        
+        buffer = getattr(self._staging, 'items', None)
+        if buffer is None:
+            item.save()
+        else:
+            buffer.append(item)
+        return item
+    
+    @contextmanager
+    def _network_transaction(self):
+        """Run a network's writes in one transaction (auto mode only)
+        
+        The transaction is committed every transaction_batch_size applied
+        objects. Review items are written inside it, so a network that fails
+        rolls back everything since the last commit; its queued tag rows and
+        sync markers are dropped, and its site is left out of the orphan sweep.
+        """
+        if not self._should_execute():
+            yield
+            return
+        
+        network_tx = NetworkTransaction(
+            self.transaction_batch_size,
+            caches=self._overlay_caches(),
+            before_commit=self._flush_staged_review_items,
+        )
+        self._tx.site_ids = set()
+        try:
+            with network_tx as tx:
+                self._tx.current = tx
+                try:
+                    yield
+                finally:
+                    self._tx.current = None
+        except Exception:
+            with self._lock:
+                self._failed_site_ids.update(self._tx.site_ids)
+            raise
+        if tx.commits > 1:
+            logger.debug(f"Network committed in {tx.commits} batches")
+    
+    def _overlay_caches(self) -> tuple:
+        """Caches and queues scoped to network transactions and savepoints"""
+        return (self.state, self.lookups, self._pending_markers)
+    
+    def savepoint(self):
+        """Savepoint for one object or helper; cache entries it adds are dropped if it rolls back
+        
+        Wrap each apply_review_item() call in one so a failed item only rolls
+        back its own writes, cached lookups, tag rows and sync markers.
+        """
+        return savepoint(*self._overlay_caches())
+    
+    @contextmanager
+    def _network_scope(self):
+        """Everything one network is synced in: tag batch, transaction and review item staging
+        
+        The tag batch is outermost so it only inserts rows from committed layers.
+        """
+        with self.lookups.tag_batch(), self._network_transaction(), self._staged_review_items():
+            yield
+    
+    @contextmanager
+    def _staged_review_items(self):
+        """Buffer review items created on this thread and insert them with bulk_create on exit
+        
+        In auto mode items are applied while buffered, so they are inserted with
+        their final status instead of being saved once per status change.
+        Nothing is inserted when the network's transaction is rolling back.
+        """
+        self._staging.items = []
+        # Site VLANs by VID, for switch port VLAN assignment
+        self._staging.site_vlans = {}
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._staging.site_vlans = None
+            items, self._staging.items = self._staging.items, None
+            if items and not (failed and connection.in_atomic_block):
+                ReviewItem.objects.bulk_create(items, batch_size=REVIEW_ITEM_BATCH_SIZE)
+    
+    def _flush_staged_review_items(self):
+        """Write this thread's staged review items and tag assignments so far
+        
+        Called before a mid-network commit so they are committed with the
+        objects they describe.
+        """
+        items = getattr(self._staging, 'items', None)
+        if items:
+            ReviewItem.objects.bulk_create(items, batch_size=REVIEW_ITEM_BATCH_SIZE)
+            self._staging.items = []
+        self.lookups.flush_tag_batch()
+    
+    def _apply_staged_item(self, review_item: ReviewItem):
+        """Apply a review item in auto mode and record the outcome on it
+        
+        Buffered items only get their status set, they are written on flush.
+        The item is applied in a savepoint, so a failure only rolls back its
+        own writes. Re-raises the error after marking the item failed.
+        """
+        try:
+            with self.savepoint():
+                self.apply_review_item(review_item)
+            review_item.status = 'applied'
+        except Exception as e:
+            review_item.status = 'failed'
+            review_item.error_message = str(e)
+            raise
+        finally:
+            if review_item.pk:
+                review_item.save(update_fields=['status', 'error_message'])
+        
+        tx = getattr(self._tx, 'current', None)
+        if tx is not None:
+            tx.object_applied()
     
     def _should_execute(self) -> bool:
         """Check if sync should actually modify database"""
@@ -1529,15 +2212,12 @@ class MerakiSyncService:
         data = item.get_final_data()
         
         # Get plugin settings for tags
-        plugin_settings = PluginSettings.get_settings()
+        plugin_settings = self.config.settings
         
         try:
             if item_type == 'site':
                 # Generate slug for site
-                import re
-                slug = re.sub(r'[^a-z0-9-]+', '-', data['name'].lower()).strip('-')
-                if not slug:
-                    slug = f"site-{data.get('network_id', 'unknown')}"
+                slug = make_slug(data['name'], f"site-{data.get('network_id', 'unknown')}")
                 
                 site, created = Site.objects.update_or_create(
                     name=data['name'],
@@ -1547,104 +2227,55 @@ class MerakiSyncService:
                         'comments': data.get('comments', ''),
                     }
                 )
+                self.state.add_site(site)
                 logger.info(f"{'Created' if created else 'Updated'} site: {data['name']}")
                 # Apply site tags (only if configured)
                 tag_names = plugin_settings.get_tags_for_object_type('site')
                 if tag_names:
-                    for tag_name in tag_names:
-                        tag, _ = Tag.objects.get_or_create(name=tag_name, defaults={'slug': tag_name.lower().replace(' ', '-')})
-                        site.tags.add(tag)
+                    self.lookups.assign_tags(site, tag_names)
                 
                 # Track synced site ID to prevent cleanup deletion
-                self.synced_object_ids['sites'].add(site.id)
+                self._track_synced('sites', site.id)
                     
             elif item_type == 'device':
                 # Ensure site exists
-                try:
-                    site = Site.objects.get(name=data['site'])
-                except Site.DoesNotExist:
+                site = self.state.get_site(data['site'])
+                if site is None:
                     raise Exception(f"Site '{data['site']}' does not exist. Please ensure sites are created first.")
                 
-                manufacturer, _ = Manufacturer.objects.get_or_create(
-                    name=data.get('manufacturer', 'Cisco Meraki'),
-                    defaults={'slug': 'cisco-meraki'}
-                )
-                
-                # Generate proper slug for device type (handle special characters)
-                import re
-                device_type_slug = re.sub(r'[^a-z0-9-]+', '-', data['model'].lower()).strip('-')
-                if not device_type_slug:
-                    device_type_slug = f"device-{data['serial'].lower()}"
-                
-                device_type, created = DeviceType.objects.get_or_create(
-                    model=data['model'],
-                    manufacturer=manufacturer,
-                    defaults={
-                        'slug': device_type_slug,
-                        'part_number': data['model']  # Use model as part number
-                    }
-                )
-                
-                # Ensure part_number is always set (update existing device types if blank)
-                if not device_type.part_number:
-                    device_type.part_number = data['model']
-                    device_type.save()
-                    logger.info(f"Updated part_number for device type '{data['model']}'")
-
+                # Manufacturer, device type and role are resolved once per run
+                manufacturer = self.lookups.manufacturer(data.get('manufacturer', 'Cisco Meraki'))
+                device_type = self.lookups.device_type(manufacturer, data['model'], data['serial'])
                 
                 # Get or create device role with product-type based defaults
                 product_type = data.get('product_type', '')
                 role_name = data['role']
                 
                 logger.info(f"Device role assignment: product_type='{product_type}', role_name='{role_name}'")
-                
-                # Generate proper slug for device role
-                device_role_slug = re.sub(r'[^a-z0-9-]+', '-', role_name.lower()).strip('-')
-                if not device_role_slug:
-                    device_role_slug = 'unknown-role'
-                
-                # Set color based on product type
-                role_color_map = {
-                    'MX': 'f44336',  # Red for security appliances
-                    'MS': '2196f3',  # Blue for switches
-                    'MR': '4caf50',  # Green for wireless APs
-                    'MG': 'ff9800',  # Orange for cellular gateways
-                    'MV': '9c27b0',  # Purple for cameras
-                    'MT': '00bcd4',  # Cyan for sensors
-                }
-                product_prefix = product_type[:2].upper() if product_type and len(product_type) >= 2 else ''
-                role_color = role_color_map.get(product_prefix, '607d8b')  # Grey for unknown
-                
-                logger.info(f"Creating/getting role '{role_name}' with color '{role_color}' for product prefix '{product_prefix}'")
-                
-                device_role, _ = DeviceRole.objects.get_or_create(
-                    name=role_name,
-                    defaults={
-                        'slug': device_role_slug,
-                        'color': role_color
-                    }
-                )
+                device_role = self.lookups.device_role(role_name, product_type)
                 
                 # Check if we're updating an existing device by serial
-                try:
-                    existing_device = Device.objects.get(serial=data['serial'])
+                existing_device = self.state.get_device(data['serial'])
+                if existing_device:
                     # Device exists with this serial, we'll update it
                     # But check if the new name conflicts with a DIFFERENT device
                     if existing_device.name != data['name']:
                         # Name is changing, check if new name is taken by another device
-                        conflicting_device = Device.objects.filter(
-                            name=data['name'],
-                            site=site
-                        ).exclude(serial=data['serial']).first()
+                        conflicting_device = self.state.get_device_by_name(
+                            data['name'], site, exclude_serial=data['serial']
+                        )
                         
                         if conflicting_device:
                             # Name conflict exists - determine which device to rename
                             current_device_status = data.get('status', 'active')
                             
                             if conflicting_device.status != 'active' and current_device_status == 'active':
-                                # Rename the conflicting device (it's not active)
+                                # Rename the conflicting device (it's not active); the indexed
+                                # instance is shared, so rename a copy
+                                conflicting_device = copy.copy(conflicting_device)
                                 conflicting_device.name = f"{conflicting_device.name}-{conflicting_device.serial[-4:]}"
                                 conflicting_device.save()
+                                self.state.add_device(conflicting_device)
                                 logger.warning(
                                     f"Renamed inactive device {conflicting_device.serial} to '{conflicting_device.name}' "
                                     f"to make room for active device {data['serial']}"
@@ -1665,21 +2296,20 @@ class MerakiSyncService:
                                     f"Name conflict: both devices have same status. "
                                     f"Renamed latest device {data['serial']} to '{data['name']}'"
                                 )
-                except Device.DoesNotExist:
+                else:
                     # New device, check if name is already taken
-                    conflicting_device = Device.objects.filter(
-                        name=data['name'],
-                        site=site
-                    ).first()
+                    conflicting_device = self.state.get_device_by_name(data['name'], site)
                     
                     if conflicting_device:
                         # Name conflict - check statuses
                         current_device_status = data.get('status', 'active')
                         
                         if conflicting_device.status != 'active' and current_device_status == 'active':
-                            # Rename the existing inactive device
+                            # Rename the existing inactive device (a copy of the shared indexed instance)
+                            conflicting_device = copy.copy(conflicting_device)
                             conflicting_device.name = f"{conflicting_device.name}-{conflicting_device.serial[-4:]}"
                             conflicting_device.save()
+                            self.state.add_device(conflicting_device)
                             logger.warning(
                                 f"Renamed existing inactive device {conflicting_device.serial} to '{conflicting_device.name}' "
                                 f"to make room for new active device {data['serial']}"
@@ -1717,35 +2347,32 @@ class MerakiSyncService:
                 if 'custom_field_data' in data and data['custom_field_data']:
                     device.custom_field_data.update(data['custom_field_data'])
                     device.save()
+                self.state.add_device(device, created)
                 
                 logger.info(f"{'Created' if created else 'Updated'} device: {data['name']} (Serial: {data['serial']})") 
                 # Apply device tags (only if configured)
                 tag_names = plugin_settings.get_tags_for_object_type('device')
                 if tag_names:
-                    for tag_name in tag_names:
-                        tag, _ = Tag.objects.get_or_create(name=tag_name, defaults={'slug': tag_name.lower().replace(' ', '-')})
-                        device.tags.add(tag)
+                    self.lookups.assign_tags(device, tag_names)
                 
                 # Track synced device ID to prevent cleanup deletion
-                self.synced_object_ids['devices'].add(device.id)
+                self._track_synced('devices', device.id)
                     
             elif item_type == 'vlan':
-                try:
-                    site = Site.objects.get(name=data['site'])
-                except Site.DoesNotExist:
+                site = self.state.get_site(data['site'])
+                if site is None:
                     raise Exception(f"Site '{data['site']}' does not exist. Please ensure sites are created first.")
                     
                 # Generate proper slug
-                import re
-                vlan_group_slug = re.sub(r'[^a-z0-9-]+', '-', site.name.lower()).strip('-')
-                if not vlan_group_slug:
-                    vlan_group_slug = f"site-{site.id}"
-                vlan_group_slug = f"{vlan_group_slug}-vlans"
+                vlan_group_slug = f"{make_slug(site.name, f'site-{site.id}')}-vlans"
                 
-                vlan_group, _ = VLANGroup.objects.get_or_create(
-                    name=f"{site.name} VLANs",
-                    defaults={'slug': vlan_group_slug}
-                )
+                vlan_group = self.state.get_vlan_group(f"{site.name} VLANs")
+                if vlan_group is None:
+                    vlan_group, _ = VLANGroup.objects.get_or_create(
+                        name=f"{site.name} VLANs",
+                        defaults={'slug': vlan_group_slug}
+                    )
+                    self.state.add_vlan_group(vlan_group)
                 vlan, created = VLAN.objects.update_or_create(
                     vid=data['vid'],
                     group=vlan_group,
@@ -1756,21 +2383,19 @@ class MerakiSyncService:
                         'description': data.get('description', ''),
                     }
                 )
+                self.state.add_vlan(vlan)
                 logger.info(f"{'Created' if created else 'Updated'} VLAN {data['vid']}: {data['name']}")
                 # Apply VLAN tags (only if configured)
                 tag_names = plugin_settings.get_tags_for_object_type('vlan')
                 if tag_names:
-                    for tag_name in tag_names:
-                        tag, _ = Tag.objects.get_or_create(name=tag_name, defaults={'slug': tag_name.lower().replace(' ', '-')})
-                        vlan.tags.add(tag)
+                    self.lookups.assign_tags(vlan, tag_names)
                 
                 # Track synced VLAN ID to prevent cleanup deletion
-                self.synced_object_ids['vlans'].add(vlan.id)
+                self._track_synced('vlans', vlan.id)
                     
             elif item_type == 'prefix':
-                try:
-                    site = Site.objects.get(name=data['site'])
-                except Site.DoesNotExist:
+                site = self.state.get_site(data['site'])
+                if site is None:
                     raise Exception(f"Site '{data['site']}' does not exist. Please ensure sites are created first.")
                 
                 # Try to find VLAN by VID if specified
@@ -1781,19 +2406,21 @@ class MerakiSyncService:
                     if 'VLAN' in vlan_id_str:
                         vlan_id = int(vlan_id_str.split()[-1])
                         # Find VLAN group for this site
-                        vlan_group = VLANGroup.objects.filter(name=f"{site.name} VLANs").first()
+                        vlan_group = self.state.get_vlan_group(f"{site.name} VLANs")
                         if vlan_group:
-                            vlan_obj = VLAN.objects.filter(vid=vlan_id, group=vlan_group).first()
+                            vlan_obj = self.state.get_vlan(vlan_group, vlan_id)
                             if vlan_obj:
                                 logger.debug(f"Found VLAN {vlan_id} for prefix {data['prefix']}")
                             else:
                                 logger.debug(f"VLAN {vlan_id} not found in group {vlan_group.name}")
                     
                 # For NetBox 4.x: Check if prefix exists first
-                existing_prefix = Prefix.objects.filter(prefix=data['prefix']).first()
+                existing_prefix = self.state.get_prefix(data['prefix'])
                 
                 if existing_prefix:
-                    # Update existing prefix
+                    # Update a copy: the indexed instance is shared by all threads and
+                    # must keep its committed values if this savepoint rolls back
+                    existing_prefix = copy.copy(existing_prefix)
                     existing_prefix.status = 'active'
                     existing_prefix.description = data.get('description', '')
                     existing_prefix.vlan = vlan_obj
@@ -1832,24 +2459,23 @@ class MerakiSyncService:
                             site=site
                         )
                     created = True
+                self.state.add_prefix(prefix)
                 
                 logger.info(f"{'Created' if created else 'Updated'} prefix: {data['prefix']} at site {site.name}" + (f" with VLAN {vlan_obj.vid}" if vlan_obj else ""))
                 # Apply prefix tags (only if configured)
                 tag_names = plugin_settings.get_tags_for_object_type('prefix')
                 if tag_names:
-                    for tag_name in tag_names:
-                        tag, _ = Tag.objects.get_or_create(name=tag_name, defaults={'slug': tag_name.lower().replace(' ', '-')})
-                        prefix.tags.add(tag)
+                    self.lookups.assign_tags(prefix, tag_names)
                 
                 # Track synced prefix ID to prevent cleanup deletion
-                self.synced_object_ids['prefixes'].add(prefix.id)
+                self._track_synced('prefixes', prefix.id)
             
             elif item_type == 'interface':
                 # Find device by serial
-                device = Device.objects.get(serial=data.get('device_serial'))
-                interface, _ = Interface.objects.get_or_create(
-                    device=device,
-                    name=data['name'],
+                device = self.state.get_device(data.get('device_serial')) or Device.objects.get(serial=data.get('device_serial'))
+                interface, _ = self.state.get_or_create_interface(
+                    device,
+                    data['name'],
                     defaults={
                         'type': data.get('type', 'other'),
                         'description': data.get('description', ''),
@@ -1860,8 +2486,10 @@ class MerakiSyncService:
             
             elif item_type == 'ip_address':
                 # Find device and interface
-                device = Device.objects.get(serial=data.get('device_serial'))
-                interface = Interface.objects.get(device=device, name=data.get('interface'))
+                device = self.state.get_device(data.get('device_serial')) or Device.objects.get(serial=data.get('device_serial'))
+                interface = self.state.get_interface(device, data.get('interface'))
+                if interface is None:
+                    raise Interface.DoesNotExist(f"Interface {data.get('interface')} not found on device {device.name}")
                 
                 ip_address, _ = IPAddress.objects.get_or_create(
                     address=data['address'],
@@ -1889,75 +2517,121 @@ class MerakiSyncService:
         IMPORTANT: Only cleanup objects within sites that were synced in this run.
         This prevents deleting objects from other networks when doing selective sync.
         
+        Objects synced in this run carry a sync marker with this run's generation;
+        each model is swept with one anti-join query for Meraki-tagged objects
+        in the synced sites without a current marker, then deleted in chunks.
+        
         Order matters: Delete in reverse dependency order to avoid foreign key constraint errors
         1. Prefixes (no dependencies)
         2. VLANs (no dependencies)
         3. Devices (depend on sites)
-        4. Sites (last, depended on by devices)
+        Sites are not swept: only synced sites are in scope, and those are current.
         """
         logger.info("Checking for orphaned objects to clean up...")
-        
-        # Get the sites that were synced in this run
-        synced_sites = Site.objects.filter(id__in=self.synced_object_ids['sites'])
-        
-        if not synced_sites.exists():
+        self._flush_sync_markers()
+        self._prune_stale_markers()
+        
+        # Get the sites that were synced in this run, except those of networks
+        # that failed: objects rolled back with them have no current marker
+        site_content_type = ContentType.objects.get_for_model(Site)
+        synced_site_ids = SyncMarker.objects.filter(
+            content_type=site_content_type,
+            generation=self.sync_log.pk,
+        ).exclude(object_id__in=self._failed_site_ids).values('object_id')
+        if self._failed_site_ids:
+            logger.info(f"Not cleaning up {len(self._failed_site_ids)} site(s) of networks that failed to sync")
+        
+        synced_site_count = synced_site_ids.count()
+        if not synced_site_count:
             logger.info("No sites were synced, skipping orphaned object cleanup")
             return
         
-        logger.info(f"Will only cleanup orphaned objects within {synced_sites.count()} synced site(s)")
+        logger.info(f"Will only cleanup orphaned objects within {synced_site_count} synced site(s)")
         
         # Clean up prefixes first - only within synced sites
-        all_meraki_prefixes = Prefix.objects.filter(tags=meraki_tag)
-        # Filter to only prefixes that belong to synced sites
-        synced_site_prefixes = all_meraki_prefixes.filter(
-            scope_type=ContentType.objects.get_for_model(Site),
-            scope_id__in=[site.id for site in synced_sites]
+        self._sweep_orphans(
+            'prefixes',
+            Prefix.objects.filter(tags=meraki_tag, scope_type=site_content_type, scope_id__in=synced_site_ids),
+            ('prefix',),
+            lambda pk, prefix: f"prefix: {prefix} (ID: {pk})",
         )
-        orphaned_prefixes = synced_site_prefixes.exclude(id__in=self.synced_object_ids['prefixes'])
-        if orphaned_prefixes.exists():
-            count = orphaned_prefixes.count()
-            for prefix in orphaned_prefixes:
-                logger.info(f"Deleting orphaned prefix: {prefix.prefix} (ID: {prefix.id})")
-            orphaned_prefixes.delete()
-            self.stats['deleted_prefixes'] = count
-            logger.info(f"Deleted {count} orphaned prefix(es)")
         
         # Clean up VLANs - only within synced sites
-        all_meraki_vlans = VLAN.objects.filter(tags=meraki_tag)
-        synced_site_vlans = all_meraki_vlans.filter(site__in=synced_sites)
-        orphaned_vlans = synced_site_vlans.exclude(id__in=self.synced_object_ids['vlans'])
-        if orphaned_vlans.exists():
-            count = orphaned_vlans.count()
-            for vlan in orphaned_vlans:
-                logger.info(f"Deleting orphaned VLAN: {vlan.name} (VID: {vlan.vid}, ID: {vlan.id})")
-            orphaned_vlans.delete()
-            self.stats['deleted_vlans'] = count
-            logger.info(f"Deleted {count} orphaned VLAN(s)")
+        self._sweep_orphans(
+            'vlans',
+            VLAN.objects.filter(tags=meraki_tag, site_id__in=synced_site_ids),
+            ('name', 'vid'),
+            lambda pk, name, vid: f"VLAN: {name} (VID: {vid}, ID: {pk})",
+        )
         
         # Clean up devices (before sites, as devices depend on sites) - only within synced sites
-        all_meraki_devices = Device.objects.filter(tags=meraki_tag)
-        synced_site_devices = all_meraki_devices.filter(site__in=synced_sites)
-        orphaned_devices = synced_site_devices.exclude(id__in=self.synced_object_ids['devices'])
-        if orphaned_devices.exists():
-            count = orphaned_devices.count()
-            for device in orphaned_devices:
-                logger.info(f"Deleting orphaned device: {device.name} (Serial: {device.serial}, ID: {device.id})")
-            orphaned_devices.delete()
-            self.stats['deleted_devices'] = count
-            logger.info(f"Deleted {count} orphaned device(s)")
-        
-        # Clean up sites last (depended on by devices) - only sites that were synced
-        all_meraki_sites = Site.objects.filter(tags=meraki_tag)
-        # Only consider sites that were part of this sync run for deletion
-        synced_meraki_sites = all_meraki_sites.filter(id__in=[site.id for site in synced_sites])
-        orphaned_sites = synced_meraki_sites.exclude(id__in=self.synced_object_ids['sites'])
-        if orphaned_sites.exists():
-            count = orphaned_sites.count()
-            for site in orphaned_sites:
-                logger.info(f"Deleting orphaned site: {site.name} (ID: {site.id})")
-            orphaned_sites.delete()
-            self.stats['deleted_sites'] = count
-            logger.info(f"Deleted {count} orphaned site(s)")
+        self._sweep_orphans(
+            'devices',
+            Device.objects.filter(tags=meraki_tag, site_id__in=synced_site_ids),
+            ('name', 'serial'),
+            lambda pk, name, serial: f"device: {name} (Serial: {serial}, ID: {pk})",
+        )
         
         logger.info("Orphaned object cleanup complete")
+    
+    def _prune_stale_markers(self) -> int:
+        """Delete sync markers whose object no longer exists (e.g. deleted in the UI)
+        
+        One anti-join query per marked model, deleted in chunks.
+        
+        Returns:
+            Number of markers deleted
+        """
+        deleted = 0
+        for model in MARKED_MODELS.values():
+            content_type = ContentType.objects.get_for_model(model)
+            stale_ids = list(
+                SyncMarker.objects.filter(content_type=content_type)
+                .filter(~Exists(model.objects.filter(pk=OuterRef('object_id'))))
+                .values_list('pk', flat=True)
+            )
+            for i in range(0, len(stale_ids), CLEANUP_BATCH_SIZE):
+                SyncMarker.objects.filter(pk__in=stale_ids[i:i + CLEANUP_BATCH_SIZE]).delete()
+            deleted += len(stale_ids)
+        
+        if deleted:
+            logger.info(f"Deleted {deleted} sync marker(s) of objects that no longer exist")
+        return deleted
+    
+    def _sweep_orphans(self, object_type: str, queryset, fields: tuple, describe) -> int:
+        """Delete objects in queryset without a sync marker from this run
+        
+        Args:
+            object_type: Key in MARKED_MODELS and the deleted_* stats
+            queryset: Candidate objects (Meraki-tagged, in synced sites)
+            fields: Fields fetched for the log message
+            describe: Builds the log message from the pk and fields
+        
+        Returns:
+            Number of objects deleted
+        """
+        model = MARKED_MODELS[object_type]
+        content_type = ContentType.objects.get_for_model(model)
+        current_marker = SyncMarker.objects.filter(
+            content_type=content_type,
+            object_id=OuterRef('pk'),
+            generation=self.sync_log.pk,
+        )
+        orphans = list(queryset.filter(~Exists(current_marker)).values_list('pk', *fields))
+        if not orphans:
+            return 0
+        
+        for row in orphans:
+            logger.info(f"Deleting orphaned {describe(*row)}")
+        
+        orphan_ids = [row[0] for row in orphans]
+        for i in range(0, len(orphan_ids), CLEANUP_BATCH_SIZE):
+            chunk = orphan_ids[i:i + CLEANUP_BATCH_SIZE]
+            model.objects.filter(pk__in=chunk).delete()
+            SyncMarker.objects.filter(content_type=content_type, object_id__in=chunk).delete()
+        
+        count = len(orphan_ids)
+        self.stats[f'deleted_{object_type}'] = count
+        logger.info(f"Deleted {count} orphaned {object_type}")
+        return count
 
@@ -0,0 +1,118 @@
+from django.test import TestCase
+
+from dcim.models import Device, DeviceRole, DeviceType, Interface, Manufacturer, Site
+from ipam.models import VLAN, VLANGroup
+
+from netbox_meraki.port_sync import PortSpec, SiteVLANs, SwitchPortSync, site_vlans_by_vid
+from netbox_meraki.vlan_ranges import VLANRangeSet
+
+
+def spec(name, mode='access', untagged_vid=None, tagged_vids=None, description='Switch port'):
+    return PortSpec(
+        name=name,
+        type='1000base-t',
+        description=description,
+        enabled=True,
+        mode=mode,
+        untagged_vid=untagged_vid,
+        tagged_vids=VLANRangeSet.parse(tagged_vids) if tagged_vids is not None else None,
+    )
+
+
+class SwitchPortSyncTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(name='Branch', slug='branch')
+        manufacturer = Manufacturer.objects.create(name='Cisco Meraki', slug='cisco-meraki')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='MS120-8', slug='ms120-8')
+        role = DeviceRole.objects.create(name='Meraki Switch', slug='meraki-switch')
+        cls.device = Device.objects.create(name='switch', device_type=device_type, role=role, site=cls.site)
+        
+        group = VLANGroup.objects.create(name='Branch VLANs', slug='branch-vlans')
+        cls.vlans = {
+            vid: VLAN.objects.create(vid=vid, name=f'VLAN {vid}', site=cls.site, group=group)
+            for vid in (10, 20, 30, 40)
+        }
+        # Another site's VLAN with a VID this site also has
+        other_site = Site.objects.create(name='Other', slug='other')
+        VLAN.objects.create(vid=10, name='Other 10', site=other_site)
+    
+    def sync(self, specs):
+        port_sync = SwitchPortSync(self.device, SiteVLANs.load(self.site))
+        interfaces = port_sync.apply(specs)
+        return port_sync, interfaces
+    
+    def tagged_vids(self, name):
+        interface = Interface.objects.get(device=self.device, name=name)
+        return sorted(interface.tagged_vlans.values_list('vid', flat=True))
+    
+    def test_site_vlans_prefer_site_over_group(self):
+        group = VLANGroup.objects.get(name='Branch VLANs')
+        group_only = VLAN.objects.create(vid=50, name='Group only', group=group)
+        shadowed = VLAN.objects.create(vid=10, name='Group 10', group=group)
+        
+        vlans = site_vlans_by_vid(self.site)
+        
+        self.assertEqual(vlans[10], self.vlans[10])
+        self.assertNotEqual(vlans[10], shadowed)
+        self.assertEqual(vlans[50], group_only)
+        self.assertEqual(sorted(vlans), [10, 20, 30, 40, 50])
+    
+    def test_allow_lists_are_resolved_once(self):
+        site_vlans = SiteVLANs.load(self.site)
+        
+        vlan_ids = site_vlans.vlan_ids(VLANRangeSet.parse('1-25'))
+        self.assertEqual(vlan_ids, {self.vlans[10].pk, self.vlans[20].pk})
+        self.assertIs(site_vlans.vlan_ids(VLANRangeSet.parse('1-25')), vlan_ids)
+    
+    def test_creates_ports_with_vlans(self):
+        port_sync, interfaces = self.sync([
+            spec('1', untagged_vid=10),
+            spec('2', mode='tagged', tagged_vids='15-30'),
+            spec('3', mode='tagged-all'),
+            spec('4', mode='tagged', tagged_vids='100-200'),
+        ])
+        
+        self.assertEqual(len(port_sync.created), 4)
+        self.assertEqual(interfaces['1'].untagged_vlan, self.vlans[10])
+        self.assertEqual(self.tagged_vids('2'), [20, 30])
+        self.assertEqual(self.tagged_vids('3'), [])
+        # None of the allowed VLANs exist at the site
+        self.assertEqual(self.tagged_vids('4'), [])
+        self.assertEqual(port_sync.vlan_rows_added, 2)
+    
+    def test_unchanged_ports_are_not_written(self):
+        specs = [spec('1', untagged_vid=10), spec('2', mode='tagged', tagged_vids='10-20')]
+        self.sync(specs)
+        
+        port_sync, _ = self.sync(specs)
+        
+        self.assertEqual((len(port_sync.created), len(port_sync.updated), port_sync.unchanged), (0, 0, 2))
+        self.assertEqual((port_sync.vlan_rows_added, port_sync.vlan_rows_removed), (0, 0))
+    
+    def test_changed_allow_list_only_writes_the_difference(self):
+        self.sync([spec('1', mode='tagged', tagged_vids='10-20')])
+        
+        port_sync, _ = self.sync([spec('1', mode='tagged', tagged_vids='20-30')])
+        
+        self.assertEqual(self.tagged_vids('1'), [20, 30])
+        self.assertEqual((port_sync.vlan_rows_added, port_sync.vlan_rows_removed), (1, 1))
+    
+    def test_leaving_tagged_mode_clears_tagged_vlans(self):
+        self.sync([spec('1', mode='tagged', tagged_vids='10-40')])
+        
+        port_sync, _ = self.sync([spec('1', untagged_vid=20)])
+        
+        self.assertEqual(self.tagged_vids('1'), [])
+        self.assertEqual(port_sync.vlan_rows_removed, 4)
+        self.assertEqual(Interface.objects.get(device=self.device, name='1').mode, 'access')
+    
+    def test_updates_changed_fields(self):
+        self.sync([spec('1', untagged_vid=10)])
+        
+        port_sync, interfaces = self.sync([spec('1', untagged_vid=30, description='Uplink')])
+        
+        self.assertEqual(len(port_sync.updated), 1)
+        interface = Interface.objects.get(pk=interfaces['1'].pk)
+        self.assertEqual((interface.description, interface.untagged_vlan), ('Uplink', self.vlans[30]))
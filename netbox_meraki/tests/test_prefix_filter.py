@@ -0,0 +1,124 @@
+from django.test import SimpleTestCase
+
+from netbox_meraki.models import PrefixFilterRule
+from netbox_meraki.prefix_filter import PrefixFilter, allowed_lengths, length_mask
+
+
+def rule(name, filter_type='exclude', prefix_pattern='', prefix_length_filter='exact',
+         min_prefix_length=None, max_prefix_length=None):
+    return PrefixFilterRule(
+        name=name,
+        filter_type=filter_type,
+        prefix_pattern=prefix_pattern,
+        prefix_length_filter=prefix_length_filter,
+        min_prefix_length=min_prefix_length,
+        max_prefix_length=max_prefix_length,
+        enabled=True,
+    )
+
+
+def legacy_should_sync_prefix(rules, prefix_str):
+    """The rule-by-rule evaluation PrefixFilter replaced (rules in priority order)"""
+    if not rules:
+        return True
+    for r in rules:
+        if r.filter_type == 'exclude' and r.matches(prefix_str):
+            return False
+    include_rules = [r for r in rules if r.filter_type == 'include_only']
+    if include_rules:
+        return any(r.matches(prefix_str) for r in include_rules)
+    return True
+
+
+EXCLUDE_RULES = [
+    rule('No /24 in 192.168', prefix_pattern='192.168.0.0/16', min_prefix_length=24),
+    rule('No host routes', prefix_length_filter='greater', min_prefix_length=30),
+    rule('No 10.1 up to /20', prefix_pattern='10.1.0.0/16', prefix_length_filter='range',
+         min_prefix_length=16, max_prefix_length=20),
+    rule('No short v6', prefix_pattern='2001:db8::/32', prefix_length_filter='less', min_prefix_length=48),
+    rule('Range without a minimum', prefix_pattern='172.16.0.0/12', prefix_length_filter='range',
+         max_prefix_length=20),
+    rule('Unset length', prefix_pattern='100.64.0.0/10', prefix_length_filter='greater'),
+    rule('Invalid pattern', prefix_pattern='not-a-prefix'),
+]
+
+INCLUDE_RULES = [
+    rule('Only 10/8 between /16 and /26', filter_type='include_only', prefix_pattern='10.0.0.0/8',
+         prefix_length_filter='range', min_prefix_length=16, max_prefix_length=26),
+    rule('Only v6 /64', filter_type='include_only', prefix_pattern='2001:db8::/32', min_prefix_length=64),
+    rule('Only 192.168 /24', filter_type='include_only', prefix_pattern='192.168.0.0/16', min_prefix_length=24),
+]
+
+CANDIDATES = [
+    f'{network}/{length}'
+    for network in ('10.0.0.0', '10.1.0.0', '10.1.2.0', '172.16.0.0', '172.31.255.0', '192.168.1.0',
+                    '192.169.0.0', '100.64.0.0', '8.8.8.0', '0.0.0.0')
+    for length in (0, 8, 12, 15, 16, 19, 20, 21, 24, 26, 27, 30, 31, 32)
+] + [
+    f'{network}/{length}'
+    for network in ('2001:db8::', '2001:db8:1::', '2001:db9::', '::')
+    for length in (0, 16, 32, 47, 48, 56, 64, 65, 128)
+] + [
+    '10.1.2.3/24',  # Host bits set
+    'garbage',
+    '',
+]
+
+
+class PrefixFilterTestCase(SimpleTestCase):
+
+    def assertMatchesLegacy(self, rules):
+        prefix_filter = PrefixFilter(rules)
+        for prefix_str in CANDIDATES:
+            with self.subTest(prefix=prefix_str):
+                self.assertEqual(
+                    prefix_filter.should_sync_prefix(prefix_str),
+                    legacy_should_sync_prefix(rules, prefix_str),
+                )
+    
+    def test_no_rules_syncs_everything(self):
+        self.assertMatchesLegacy([])
+        self.assertTrue(PrefixFilter().should_sync_prefix('garbage'))
+    
+    def test_exclude_rules_match_legacy(self):
+        self.assertMatchesLegacy(EXCLUDE_RULES)
+    
+    def test_include_only_rules_match_legacy(self):
+        self.assertMatchesLegacy(INCLUDE_RULES)
+    
+    def test_mixed_rules_match_legacy(self):
+        self.assertMatchesLegacy(EXCLUDE_RULES + INCLUDE_RULES)
+        self.assertMatchesLegacy(INCLUDE_RULES[:1] + EXCLUDE_RULES[:3])
+    
+    def test_invalid_include_only_rule_still_restricts(self):
+        rules = [rule('Broken', filter_type='include_only', prefix_pattern='not-a-prefix')]
+        
+        self.assertFalse(PrefixFilter(rules).should_sync_prefix('10.0.0.0/24'))
+        self.assertMatchesLegacy(rules)
+    
+    def test_exclude_wins_over_include_only(self):
+        prefix_filter = PrefixFilter(EXCLUDE_RULES + INCLUDE_RULES)
+        
+        self.assertFalse(prefix_filter.should_sync_prefix('192.168.1.0/24'))
+        self.assertTrue(prefix_filter.should_sync_prefix('10.2.0.0/24'))
+        self.assertFalse(prefix_filter.should_sync_prefix('10.1.0.0/16'))
+        self.assertFalse(prefix_filter.should_sync_prefix('8.8.8.0/24'))
+    
+    def test_should_sync_prefixes(self):
+        prefix_filter = PrefixFilter(EXCLUDE_RULES)
+        
+        self.assertEqual(
+            prefix_filter.should_sync_prefixes(['192.168.1.0/24', '192.168.0.0/23', '192.168.1.0/24']),
+            {'192.168.1.0/24': False, '192.168.0.0/23': True},
+        )
+    
+    def test_allowed_lengths(self):
+        self.assertEqual(allowed_lengths(rule('a', min_prefix_length=24)), (24, 24))
+        self.assertEqual(allowed_lengths(rule('b', prefix_length_filter='greater', min_prefix_length=24)), (25, 128))
+        self.assertEqual(allowed_lengths(rule('c', prefix_length_filter='less', min_prefix_length=24)), (0, 23))
+        self.assertEqual(allowed_lengths(rule('d', prefix_length_filter='range', max_prefix_length=20)), (0, 20))
+        self.assertEqual(allowed_lengths(rule('e', prefix_length_filter='exact')), (0, 128))
+    
+    def test_length_mask(self):
+        self.assertEqual(length_mask(2, 4), 0b11100)
+        self.assertEqual(length_mask(5, 4), 0)
@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from netbox_meraki.meraki_client import TokenBucket, get_rate_bucket
+
+
+class FakeClock:
+    """Stand-in for time.monotonic() that only moves when told to"""
+    
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class TokenBucketTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch('netbox_meraki.meraki_client.time.monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def drain(self, bucket: TokenBucket, count: int) -> list:
+        """Waits reported by `count` reservations made at the same instant"""
+        return [bucket.reserve() for _ in range(count)]
+    
+    def test_burst_up_to_capacity(self):
+        bucket = TokenBucket(rate=5, capacity=5)
+        
+        self.assertEqual(self.drain(bucket, 5), [0.0] * 5)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+    
+    def test_refills_at_rate(self):
+        bucket = TokenBucket(rate=5, capacity=5)
+        self.drain(bucket, 5)
+        
+        self.clock.advance(0.5)
+        self.assertEqual(self.drain(bucket, 2), [0.0, 0.0])
+        self.assertGreater(bucket.reserve(), 0.0)
+        
+        # Never refills beyond capacity
+        self.clock.advance(60)
+        self.assertEqual(self.drain(bucket, 5), [0.0] * 5)
+        self.assertGreater(bucket.reserve(), 0.0)
+    
+    def test_rate_limited_halves_rate_and_drains_bucket(self):
+        bucket = TokenBucket(rate=10, capacity=10)
+        
+        self.assertEqual(bucket.on_rate_limited(), 5.0)
+        # Every worker sharing the bucket has to wait for the new rate
+        self.assertAlmostEqual(bucket.reserve(), 1 / 5)
+    
+    def test_concurrent_429s_back_off_once(self):
+        bucket = TokenBucket(rate=10, capacity=10)
+        
+        self.assertEqual(bucket.on_rate_limited(), 5.0)
+        self.clock.advance(0.5)
+        self.assertEqual(bucket.on_rate_limited(), 5.0)
+        
+        self.clock.advance(bucket.decrease_cooldown)
+        self.assertEqual(bucket.on_rate_limited(), 2.5)
+    
+    def test_backoff_stops_at_min_rate(self):
+        bucket = TokenBucket(rate=10, capacity=10, min_rate=0.5)
+        
+        for _ in range(20):
+            self.clock.advance(bucket.decrease_cooldown)
+            bucket.on_rate_limited()
+        self.assertEqual(bucket.rate, 0.5)
+    
+    def test_recovers_additively_up_to_max_rate(self):
+        bucket = TokenBucket(rate=10, capacity=10, increase_step=0.05)
+        bucket.on_rate_limited()
+        
+        for _ in range(20):
+            bucket.on_success()
+        self.assertAlmostEqual(bucket.rate, 6.0)
+        
+        for _ in range(200):
+            bucket.on_success()
+        self.assertEqual(bucket.rate, 10.0)
+    
+    def test_configure_caps_current_rate(self):
+        bucket = TokenBucket(rate=10, capacity=10)
+        
+        bucket.configure(2)
+        self.assertEqual((bucket.max_rate, bucket.rate, bucket.capacity), (2.0, 2.0, 2.0))
+        self.assertLessEqual(bucket.tokens, 2.0)
+    
+    def test_buckets_are_shared_per_organization(self):
+        bucket = get_rate_bucket('test-org-1', 5)
+        
+        self.assertIs(get_rate_bucket('test-org-1', 5), bucket)
+        self.assertIsNot(get_rate_bucket('test-org-2', 5), bucket)
+        
+        # A changed setting reconfigures the shared bucket
+        self.assertIs(get_rate_bucket('test-org-1', 8), bucket)
+        self.assertEqual(bucket.max_rate, 8.0)
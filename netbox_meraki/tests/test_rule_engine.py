@@ -0,0 +1,104 @@
+import re
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from netbox_meraki.config_snapshot import ConfigSnapshot
+from netbox_meraki.rule_engine import CompiledSiteRule, SiteRuleEngine
+
+
+def rule(name, regex_pattern, site_name_template):
+    return SimpleNamespace(name=name, regex_pattern=regex_pattern, site_name_template=site_name_template)
+
+
+def legacy_apply(rule, network_name):
+    """SiteNameRule.apply() as it was before the rules were compiled"""
+    try:
+        match = re.match(rule.regex_pattern, network_name)
+        if match:
+            result = rule.site_name_template
+            for name, value in match.groupdict().items():
+                if value:
+                    result = result.replace(f'{{{name}}}', value)
+            for i, group in enumerate(match.groups()):
+                result = result.replace(f'{{{i}}}', group or '')
+            result = result.replace('{network_name}', network_name)
+            return result.strip()
+    except Exception:
+        pass
+    return network_name
+
+
+def legacy_transform(rules, network_name):
+    """First rule (in priority order) that changes the name, as transform_network_name() did"""
+    for r in rules:
+        transformed = legacy_apply(r, network_name)
+        if transformed != network_name:
+            return transformed
+    return None
+
+
+RULES = [
+    rule('Named groups', r'^(?P<site>[A-Z]{3})-(?P<num>\d+)', '{site} Site {num}'),
+    rule('Numbered groups', r'^Branch (\d+)(?: - (.*))?$', 'BR{0} {1}'),
+    rule('Missing named group', r'^(?P<region>\w+)/(?P<city>\w+)?', '{city}{region} [{network_name}]'),
+    rule('Unknown placeholders', r'lab', '{unknown} lab {5}'),
+    rule('No change', r'^(Same)$', '{0}'),
+    rule('Padded', r'^\s*(\w+)\s*$', '  {0}  '),
+]
+
+NETWORK_NAMES = [
+    'NYC-12', 'NYC-', 'nyc-12', 'Branch 7', 'Branch 7 - Main St', 'Branch x',
+    'emea/paris', 'emea/', 'lab-1', 'my lab', 'Same', ' padded ', 'nothing here', '',
+]
+
+
+class SiteRuleEngineTestCase(SimpleTestCase):
+
+    def test_matches_legacy_rules(self):
+        engine = SiteRuleEngine(RULES)
+        for network_name in NETWORK_NAMES:
+            with self.subTest(network_name=network_name):
+                self.assertEqual(engine.match(network_name)[0], legacy_transform(RULES, network_name))
+    
+    def test_each_rule_matches_legacy_apply(self):
+        for r in RULES:
+            compiled = CompiledSiteRule.from_rule(r)
+            for network_name in NETWORK_NAMES:
+                with self.subTest(rule=r.name, network_name=network_name):
+                    result = compiled.apply(network_name)
+                    self.assertEqual(network_name if result is None else result, legacy_apply(r, network_name))
+    
+    def test_priority_order(self):
+        rules = [rule('First', r'^(\w+)-', 'first {0}'), rule('Second', r'^(\w+)', 'second {0}')]
+        
+        self.assertEqual(SiteRuleEngine(rules).match('abc-1'), ('first abc', 'First'))
+        self.assertEqual(SiteRuleEngine(rules[::-1]).match('abc-1'), ('second abc', 'Second'))
+    
+    def test_invalid_regex_is_skipped(self):
+        engine = SiteRuleEngine([rule('Broken', r'(', 'x'), RULES[0]])
+        
+        self.assertEqual(len(engine), 1)
+        self.assertEqual(engine.match('NYC-12'), ('NYC Site 12', 'Named groups'))
+    
+    def test_results_are_memoized(self):
+        engine = SiteRuleEngine(RULES)
+        
+        self.assertEqual(engine.match('NYC-12'), engine.match('NYC-12'))
+        self.assertEqual(engine.match('nothing here'), (None, None))
+        self.assertEqual((engine.memo_hits, engine.memo_misses), (1, 2))
+        
+        engine.clear_memo()
+        self.assertEqual((engine.memo_hits, engine.memo_misses), (0, 0))
+
+
+class ConfigSnapshotSiteRulesTestCase(SimpleTestCase):
+
+    def test_unmatched_sites(self):
+        processed = ConfigSnapshot(SimpleNamespace(process_unmatched_sites=True), RULES)
+        skipped = ConfigSnapshot(SimpleNamespace(process_unmatched_sites=False), RULES)
+        
+        self.assertEqual(processed.transform_network_name('NYC-12'), 'NYC Site 12')
+        self.assertEqual(processed.transform_network_name('nothing here'), 'nothing here')
+        self.assertEqual(skipped.transform_network_name('NYC-12'), 'NYC Site 12')
+        self.assertIsNone(skipped.transform_network_name('nothing here'))
@@ -0,0 +1,189 @@
+import threading
+
+from django.test import SimpleTestCase, TestCase
+
+from netbox_meraki.transactions import NetworkTransaction, PendingKeys, TransactionOverlay, savepoint
+
+
+class Cache(TransactionOverlay):
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.entries = {}
+    
+    def get(self, key):
+        return self._cache_get('entries', key)
+    
+    def put(self, key, value):
+        self._cache_put('entries', key, value)
+
+
+def get_on_other_thread(cache: Cache, key):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(cache.get(key)))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class TransactionOverlayTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.cache = Cache()
+    
+    def test_put_outside_a_layer_is_published(self):
+        self.cache.put('a', 1)
+        
+        self.assertEqual(self.cache.entries, {'a': 1})
+        self.assertEqual(get_on_other_thread(self.cache, 'a'), 1)
+    
+    def test_layer_entries_stay_on_their_thread_until_committed(self):
+        self.cache.begin_overlay()
+        self.cache.put('a', 1)
+        
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(get_on_other_thread(self.cache, 'a'))
+        
+        self.cache.commit_overlay()
+        self.assertEqual(get_on_other_thread(self.cache, 'a'), 1)
+    
+    def test_nested_commit_merges_into_outer_layer(self):
+        self.cache.begin_overlay()
+        self.cache.begin_overlay()
+        self.cache.put('a', 1)
+        self.cache.commit_overlay()
+        
+        # Still unpublished: only the inner savepoint committed
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertEqual(self.cache.entries, {})
+        
+        self.cache.commit_overlay()
+        self.assertEqual(self.cache.entries, {'a': 1})
+    
+    def test_discarding_inner_layer_keeps_outer_entries(self):
+        self.cache.begin_overlay()
+        self.cache.put('a', 1)
+        self.cache.begin_overlay()
+        self.cache.put('a', 2)
+        self.cache.put('b', 2)
+        self.assertEqual((self.cache.get('a'), self.cache.get('b')), (2, 2))
+        
+        self.cache.discard_overlay()
+        self.assertEqual((self.cache.get('a'), self.cache.get('b')), (1, None))
+        
+        self.cache.commit_overlay()
+        self.assertEqual(self.cache.entries, {'a': 1})
+    
+    def test_discarding_outer_layer_drops_committed_inner_entries(self):
+        self.cache.put('a', 0)
+        self.cache.begin_overlay()
+        self.cache.begin_overlay()
+        self.cache.put('a', 1)
+        self.cache.commit_overlay()
+        
+        self.cache.discard_overlay()
+        self.assertEqual(self.cache.get('a'), 0)
+        self.assertEqual(self.cache.entries, {'a': 0})
+    
+    def test_unbalanced_commit_and_discard_are_ignored(self):
+        self.cache.commit_overlay()
+        self.cache.discard_overlay()
+        self.cache.put('a', 1)
+        
+        self.assertEqual(self.cache.entries, {'a': 1})
+
+
+class PendingKeysTestCase(SimpleTestCase):
+
+    def test_keys_are_queued_once_committed(self):
+        pending = PendingKeys()
+        pending.add('outside')
+        pending.begin_overlay()
+        pending.add('committed')
+        pending.begin_overlay()
+        pending.add('rolled back')
+        pending.discard_overlay()
+        
+        self.assertEqual(pending.take(), ['outside'])
+        
+        pending.commit_overlay()
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(pending.take(), ['committed'])
+        self.assertEqual(pending.take(), [])
+
+
+class SavepointTestCase(TestCase):
+
+    def setUp(self):
+        self.cache = Cache()
+        self.pending = PendingKeys()
+    
+    def test_commit_publishes_entries(self):
+        with savepoint(self.cache, self.pending):
+            self.cache.put('a', 1)
+            self.pending.add('a')
+        
+        self.assertEqual(self.cache.entries, {'a': 1})
+        self.assertEqual(self.pending.take(), ['a'])
+    
+    def test_rollback_discards_entries_and_reraises(self):
+        with self.assertRaises(ValueError):
+            with savepoint(self.cache, self.pending):
+                self.cache.put('a', 1)
+                self.pending.add('a')
+                raise ValueError
+        
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.pending.take(), [])
+    
+    def test_failed_inner_savepoint_keeps_outer_entries(self):
+        with savepoint(self.cache):
+            self.cache.put('outer', 1)
+            try:
+                with savepoint(self.cache):
+                    self.cache.put('inner', 2)
+                    raise ValueError
+            except ValueError:
+                pass
+            self.assertIsNone(self.cache.get('inner'))
+        
+        self.assertEqual(self.cache.entries, {'outer': 1})
+
+
+class NetworkTransactionTestCase(TestCase):
+
+    def test_commits_every_batch(self):
+        cache = Cache()
+        flushed = []
+        
+        with NetworkTransaction(2, caches=(cache,), before_commit=lambda: flushed.append(True)) as tx:
+            for i in range(5):
+                cache.put(i, i)
+                tx.object_applied()
+            # The first two batches are published, the last object is not yet
+            self.assertEqual(sorted(cache.entries), [0, 1, 2, 3])
+        
+        self.assertEqual(tx.commits, 3)
+        self.assertEqual(len(flushed), 2)
+        self.assertEqual(sorted(cache.entries), [0, 1, 2, 3, 4])
+    
+    def test_no_commit_from_inside_a_savepoint(self):
+        with NetworkTransaction(1) as tx:
+            with savepoint():
+                tx.object_applied()
+                tx.object_applied()
+        
+        self.assertEqual(tx.commits, 1)
+    
+    def test_rollback_discards_the_open_batch(self):
+        cache = Cache()
+        
+        with self.assertRaises(ValueError):
+            with NetworkTransaction(2, caches=(cache,)) as tx:
+                for i in range(3):
+                    cache.put(i, i)
+                    tx.object_applied()
+                raise ValueError
+        
+        self.assertEqual(sorted(cache.entries), [0, 1])
+        self.assertEqual(tx.commits, 1)
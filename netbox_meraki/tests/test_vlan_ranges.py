@@ -0,0 +1,76 @@
+import random
+
+from django.test import SimpleTestCase
+
+from netbox_meraki.vlan_ranges import MAX_VID, MIN_VID, VLANRangeSet
+
+
+class VLANRangeSetParseTestCase(SimpleTestCase):
+
+    def test_ranges_and_single_vlans(self):
+        vlans = VLANRangeSet.parse('10-20,30, 40-50 ')
+        
+        self.assertEqual(vlans.ranges, ((10, 20), (30, 30), (40, 50)))
+        self.assertEqual(str(vlans), '10-20,30,40-50')
+    
+    def test_all(self):
+        for value in ('all', 'ALL', ' all '):
+            with self.subTest(value=value):
+                self.assertEqual(VLANRangeSet.parse(value), VLANRangeSet([(MIN_VID, MAX_VID)]))
+    
+    def test_int(self):
+        self.assertEqual(VLANRangeSet.parse(42).ranges, ((42, 42),))
+    
+    def test_empty(self):
+        for value in (None, '', ' ', ',', 0):
+            with self.subTest(value=value):
+                self.assertFalse(VLANRangeSet.parse(value))
+    
+    def test_invalid_parts_are_skipped(self):
+        with self.assertLogs('netbox_meraki', level='WARNING'):
+            vlans = VLANRangeSet.parse('10,abc,20-x,1-2-3,30')
+        
+        self.assertEqual(str(vlans), '10,30')
+    
+    def test_overlapping_and_adjacent_ranges_are_merged(self):
+        self.assertEqual(str(VLANRangeSet.parse('30,1-5,4-10,11,20-25,26-26')), '1-11,20-26,30')
+        self.assertEqual(VLANRangeSet([(5, 1)]).ranges, ())
+
+
+class VLANRangeSetOperationsTestCase(SimpleTestCase):
+
+    @staticmethod
+    def random_set(rng: random.Random) -> VLANRangeSet:
+        ranges = []
+        for _ in range(rng.randint(0, 6)):
+            start = rng.randint(1, 100)
+            ranges.append((start, start + rng.randint(0, 15)))
+        return VLANRangeSet(ranges)
+    
+    def test_set_operations_match_python_sets(self):
+        rng = random.Random(4094)
+        for _ in range(300):
+            a, b = self.random_set(rng), self.random_set(rng)
+            with self.subTest(a=str(a), b=str(b)):
+                self.assertEqual(set(a | b), set(a) | set(b))
+                self.assertEqual(set(a & b), set(a) & set(b))
+                self.assertEqual(set(a - b), set(a) - set(b))
+                self.assertEqual(a | b, VLANRangeSet.from_vids(set(a) | set(b)))
+    
+    def test_membership_and_length(self):
+        vlans = VLANRangeSet.parse('10-20,30')
+        
+        self.assertEqual([vid for vid in (9, 10, 15, 20, 21, 30, 31) if vid in vlans], [10, 15, 20, 30])
+        self.assertEqual(len(vlans), 12)
+        self.assertEqual(list(vlans)[:3], [10, 11, 12])
+        self.assertEqual(len(VLANRangeSet.all()), MAX_VID)
+    
+    def test_difference_splits_ranges(self):
+        self.assertEqual(str(VLANRangeSet.all() - VLANRangeSet.parse('1,100-200,4094')), '2-99,201-4093')
+    
+    def test_equal_sets_are_hashable_keys(self):
+        resolved = {VLANRangeSet.parse('10-12'): 'first'}
+        
+        self.assertEqual(resolved[VLANRangeSet.from_vids([12, 10, 11])], 'first')
+        self.assertNotEqual(VLANRangeSet.parse('10-12'), '10-12')
+        self.assertEqual(repr(VLANRangeSet.parse('10-12')), "VLANRangeSet('10-12')")
@@ -0,0 +1,207 @@
+"""
+Per-network transactions for auto sync
+
+In auto mode every save used to run in autocommit, one commit per write.
+NetworkTransaction runs a network's writes in one transaction.atomic() block,
+committed every `max_batch_size` applied objects to bound how long row locks
+are held. Objects are applied inside savepoints, so a failed object is rolled
+back on its own; if the network itself fails, everything since the last
+commit is rolled back.
+
+In-memory caches (the NetBox state index and the lookup resolver) must not
+hand out objects that were created in a transaction that has not committed
+yet: other worker threads cannot see them, and they are gone after a rollback.
+TransactionOverlay keeps entries added inside a transaction on the adding
+thread only, and publishes them once the transaction commits. savepoint()
+does the same for a per-object savepoint, so entries added by a savepoint
+that rolls back are dropped with it.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.db import DatabaseError, connection, transaction
+
+
+logger = logging.getLogger('netbox_meraki')
+
+DEFAULT_TRANSACTION_BATCH_SIZE = 500
+
+_MISSING = object()
+
+
+class TransactionOverlay:
+    """Mixin for caches of database objects used inside network transactions
+    
+    Subclasses keep their entries in dict attributes and go through
+    _cache_get()/_cache_put(). Each begin_overlay() pushes a layer on this
+    thread's stack (one per transaction or savepoint); entries added while a
+    layer is open stay in it. commit_overlay() merges the top layer into the
+    one below it, or publishes it to all threads once no layer is left;
+    discard_overlay() drops it.
+    """
+    
+    @property
+    def _overlay_local(self) -> threading.local:
+        local = self.__dict__.get('_overlay_thread_local')
+        if local is None:
+            local = self.__dict__.setdefault('_overlay_thread_local', threading.local())
+        return local
+    
+    def _overlay_layers(self) -> list:
+        layers = getattr(self._overlay_local, 'layers', None)
+        if layers is None:
+            layers = self._overlay_local.layers = []
+        return layers
+    
+    def begin_overlay(self):
+        """Start a layer collecting entries added on this thread"""
+        self._overlay_layers().append({})
+    
+    def commit_overlay(self):
+        """Merge the top layer into the one below, or publish it to all threads"""
+        layers = self._overlay_layers()
+        if not layers:
+            return
+        entries = layers.pop()
+        if layers:
+            layers[-1].update(entries)
+            return
+        with self._lock:
+            for (name, key), value in entries.items():
+                getattr(self, name)[key] = value
+    
+    def discard_overlay(self):
+        """Drop the top layer (its transaction or savepoint was rolled back)"""
+        layers = self._overlay_layers()
+        if layers:
+            layers.pop()
+    
+    def _cache_get(self, name: str, key, default=None):
+        for entries in reversed(self._overlay_layers()):
+            value = entries.get((name, key), _MISSING)
+            if value is not _MISSING:
+                return value
+        return getattr(self, name).get(key, default)
+    
+    def _cache_put(self, name: str, key, value):
+        layers = self._overlay_layers()
+        if layers:
+            layers[-1][(name, key)] = value
+        else:
+            with self._lock:
+                getattr(self, name)[key] = value
+
+
+class PendingKeys(TransactionOverlay):
+    """Keys queued for a later write, layered like the caches
+    
+    Keys added inside a transaction or savepoint are only queued once it
+    commits, and are dropped if it rolls back.
+    """
+    
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.keys = {}
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def add(self, key):
+        self._cache_put('keys', key, True)
+    
+    def take(self) -> list:
+        """Remove and return all queued keys"""
+        with self._lock:
+            keys, self.keys = self.keys, {}
+        return list(keys)
+
+
+@contextmanager
+def savepoint(*caches: TransactionOverlay):
+    """transaction.atomic() that also scopes cache entries to it
+    
+    Entries added to the caches inside the block are dropped if it rolls
+    back, so nothing later in the network is handed a row that no longer
+    exists.
+    """
+    for cache in caches:
+        cache.begin_overlay()
+    try:
+        with transaction.atomic():
+            yield
+    except BaseException:
+        for cache in caches:
+            cache.discard_overlay()
+        raise
+    for cache in caches:
+        cache.commit_overlay()
+
+
+class NetworkTransaction:
+    """transaction.atomic() for one network, committed every max_batch_size objects
+    
+    Args:
+        max_batch_size: Objects applied per commit; 0 or None for one commit per network
+        caches: TransactionOverlay caches to publish on commit and discard on rollback
+        before_commit: Called before each batch commit to write anything buffered
+    """
+    
+    def __init__(self, max_batch_size=DEFAULT_TRANSACTION_BATCH_SIZE, caches=(), before_commit=None):
+        self.max_batch_size = max_batch_size or 0
+        self.caches = caches
+        self.before_commit = before_commit
+        self.applied = 0
+        self.commits = 0
+        self._atomic = None
+        self._depth = 0
+    
+    def __enter__(self):
+        self._begin()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._end(exc_type, exc_value, traceback)
+        return False
+    
+    def _begin(self):
+        self._atomic = transaction.atomic()
+        self._atomic.__enter__()
+        self._depth = len(connection.atomic_blocks)
+        self.applied = 0
+        for cache in self.caches:
+            cache.begin_overlay()
+    
+    def _end(self, exc_type=None, exc_value=None, traceback=None):
+        atomic, self._atomic = self._atomic, None
+        if atomic is None:
+            # An earlier batch commit failed; the rest ran in autocommit
+            return
+        try:
+            atomic.__exit__(exc_type, exc_value, traceback)
+        except DatabaseError:
+            # The commit itself failed (e.g. a deferred constraint), nothing was written
+            for cache in self.caches:
+                cache.discard_overlay()
+            raise
+        for cache in self.caches:
+            if exc_type is None:
+                cache.commit_overlay()
+            else:
+                cache.discard_overlay()
+        if exc_type is None:
+            self.commits += 1
+    
+    def object_applied(self):
+        """Count an applied object and commit once the batch is full
+        
+        Only commits from the network's own block, never from inside a savepoint.
+        """
+        self.applied += 1
+        if (self.max_batch_size and self.applied >= self.max_batch_size
+                and len(connection.atomic_blocks) == self._depth):
+            logger.debug(f"Committing {self.applied} objects")
+            if self.before_commit is not None:
+                self.before_commit()
+            self._end()
+            self._begin()
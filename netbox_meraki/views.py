@@ -579,11 +579,19 @@ class SyncProgressAPIView(LoginRequiredMixin, View):
     def get(self, request, pk):
         sync_log = get_object_or_404(SyncLog, pk=pk)
         
+        # Only entries after the client's cursor are returned
+        try:
+            after = int(request.GET.get('after') or 0)
+        except ValueError:
+            after = 0
+        progress_logs = sync_log.get_progress_logs(after=after)
+        
         data = {
             'status': sync_log.status,
             'progress_percent': sync_log.progress_percent or 0,
             'current_operation': sync_log.current_operation or '',
-            'progress_logs': sync_log.progress_logs or [],
+            'progress_logs': progress_logs,
+            'cursor': progress_logs[-1].get('id', after) if progress_logs else after,
         }
         
         return JsonResponse(data)
@@ -672,8 +680,12 @@ def get_sync_progress(request, pk):
         
         sync_log = get_object_or_404(SyncLog, pk=pk)
         
-        # Get recent progress logs (last 10 entries)
-        recent_logs = sync_log.progress_logs[-10:] if sync_log.progress_logs else []
+        # Get progress logs after the client's cursor, or the last 10 entries
+        try:
+            after = int(request.GET.get('after') or 0)
+        except ValueError:
+            after = 0
+        recent_logs = sync_log.get_progress_logs(after=after) if after else sync_log.get_progress_logs(limit=10)
         
         response_data = {
             'id': sync_log.pk,
@@ -686,6 +698,7 @@ def get_sync_progress(request, pk):
             'networks_synced': sync_log.networks_synced,
             'organizations_synced': sync_log.organizations_synced,
             'recent_logs': recent_logs,
+            'cursor': recent_logs[-1].get('id', after) if recent_logs else after,
             'is_running': sync_log.status == 'running',
             'cancel_requested': sync_log.cancel_requested,
         }
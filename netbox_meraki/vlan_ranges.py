@@ -0,0 +1,156 @@
+"""
+Interval sets of VLAN IDs
+
+Meraki reports trunk allow-lists as strings like "1-4094" or "10-20,30".
+_parse_vlan_list() expanded them into lists of up to 4094 ints per port.
+VLANRangeSet keeps them as sorted, merged (start, end) ranges instead:
+membership is a binary search, and union, intersection and difference work
+on the ranges. Sets are immutable and hashable, so identical allow-lists can
+share cached results.
+"""
+import logging
+from bisect import bisect_right
+from typing import Iterable, Iterator, List, Tuple, Union
+
+
+logger = logging.getLogger('netbox_meraki')
+
+MIN_VID = 1
+MAX_VID = 4094
+
+
+class VLANRangeSet:
+    """Immutable set of VLAN IDs stored as inclusive ranges
+    
+    Args:
+        ranges: (start, end) pairs, in any order; overlapping and adjacent
+            ranges are merged
+    """
+    
+    __slots__ = ('_ranges', '_starts')
+    
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()):
+        merged: List[Tuple[int, int]] = []
+        for start, end in sorted((int(start), int(end)) for start, end in ranges):
+            if start > end:
+                continue
+            if merged and start <= merged[-1][1] + 1:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        self._ranges = tuple(merged)
+        self._starts = tuple(start for start, _ in merged)
+    
+    @classmethod
+    def parse(cls, value: Union[str, int, None]) -> 'VLANRangeSet':
+        """Parse a Meraki VLAN list like '10-20,30,40-50' ('all' is every VLAN)
+        
+        A single VLAN may come as an int. Parts that are not numbers or ranges
+        are skipped with a warning.
+        """
+        if not value:
+            return cls()
+        value = str(value).strip()
+        if not value:
+            return cls()
+        if value.lower() == 'all':
+            return cls.all()
+        
+        ranges = []
+        for part in value.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                if '-' in part:
+                    # Range like "10-20"
+                    start, end = part.split('-')
+                    ranges.append((int(start), int(end)))
+                else:
+                    # Single VLAN
+                    ranges.append((int(part), int(part)))
+            except ValueError:
+                logger.warning(f"Could not parse VLAN list part '{part}' in '{value}'")
+        return cls(ranges)
+    
+    @classmethod
+    def all(cls) -> 'VLANRangeSet':
+        return cls([(MIN_VID, MAX_VID)])
+    
+    @classmethod
+    def from_vids(cls, vids: Iterable[int]) -> 'VLANRangeSet':
+        return cls((vid, vid) for vid in vids)
+    
+    @property
+    def ranges(self) -> Tuple[Tuple[int, int], ...]:
+        return self._ranges
+    
+    def __contains__(self, vid) -> bool:
+        index = bisect_right(self._starts, vid) - 1
+        return index >= 0 and vid <= self._ranges[index][1]
+    
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self._ranges:
+            yield from range(start, end + 1)
+    
+    def __len__(self) -> int:
+        return sum(end - start + 1 for start, end in self._ranges)
+    
+    def __bool__(self) -> bool:
+        return bool(self._ranges)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, VLANRangeSet):
+            return NotImplemented
+        return self._ranges == other._ranges
+    
+    def __hash__(self) -> int:
+        return hash(self._ranges)
+    
+    def __str__(self) -> str:
+        """Meraki format, e.g. '10-20,30'"""
+        return ','.join(str(start) if start == end else f'{start}-{end}' for start, end in self._ranges)
+    
+    def __repr__(self) -> str:
+        return f"VLANRangeSet('{self}')"
+    
+    def union(self, other: 'VLANRangeSet') -> 'VLANRangeSet':
+        return VLANRangeSet(self._ranges + other._ranges)
+    
+    def intersection(self, other: 'VLANRangeSet') -> 'VLANRangeSet':
+        result = []
+        i = j = 0
+        while i < len(self._ranges) and j < len(other._ranges):
+            start = max(self._ranges[i][0], other._ranges[j][0])
+            end = min(self._ranges[i][1], other._ranges[j][1])
+            if start <= end:
+                result.append((start, end))
+            # Advance whichever range ends first
+            if self._ranges[i][1] < other._ranges[j][1]:
+                i += 1
+            else:
+                j += 1
+        return VLANRangeSet(result)
+    
+    def difference(self, other: 'VLANRangeSet') -> 'VLANRangeSet':
+        result = []
+        j = 0
+        for start, end in self._ranges:
+            # Skip other's ranges that end before this one starts
+            while j < len(other._ranges) and other._ranges[j][1] < start:
+                j += 1
+            k = j
+            while k < len(other._ranges) and other._ranges[k][0] <= end:
+                cut_start, cut_end = other._ranges[k]
+                if cut_start > start:
+                    result.append((start, cut_start - 1))
+                start = max(start, cut_end + 1)
+                k += 1
+            if start <= end:
+                result.append((start, end))
+        return VLANRangeSet(result)
+    
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference